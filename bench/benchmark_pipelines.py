@@ -0,0 +1,288 @@
+"""
+End-to-end benchmark of the COVID pipelines against a local GCS stand-in.
+
+Synthetic RAW files (counties x days) are landed through the ingest
+exporter, then the silver and gold pipelines run block by block, exactly
+as their metadata.yaml wires them. Every block is timed and reported with
+its peak RSS and rows/sec.
+
+Usage:
+    python bench/benchmark_pipelines.py --scales 300x100,1000x500,3342x1143
+    python bench/benchmark_pipelines.py --scales 1000x500 --var handoff=arrow
+"""
+import argparse
+import inspect
+import json
+import logging
+import os
+import runpy
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PROJECT_DIR = REPO_ROOT / "mage_gcp_covid"
+sys.path.insert(0, str(REPO_ROOT))
+
+from mage_gcp_covid.utils.gcs import clear_storage_clients  # noqa: E402
+from mage_gcp_covid.utils.instrumentation import RUN_LEDGER_ENV  # noqa: E402
+from mage_gcp_covid.utils.local_gcs import LOCAL_GCS_ROOT_ENV  # noqa: E402
+from mage_gcp_covid.utils.profiling import count_rows, track_resources  # noqa: E402
+from mage_gcp_covid.utils.synthetic_covid import write_raw_archive  # noqa: E402
+
+
+PIPELINES: list = [
+    "ingest_covid_data_to_landing_zone",
+    "bronze_to_silver_standardize_covid_data",
+    "bronze_to_silver_all_covid_data",
+    "silver_to_gold_covid_metrics",
+    "gold_covid_rollups",
+]
+
+BLOCK_DIRS: dict = {
+    "data_loader": "data_loaders",
+    "transformer": "transformers",
+    "data_exporter": "data_exporters",
+}
+
+DEFAULT_SCALES: str = "300x100,1000x500,3342x1143"
+
+
+def load_block(block: dict) -> dict:
+    """
+    Execute a block file with recording decorators in place of Mage's.
+
+    Returns:
+        dict: {"block": decorated block function, "tests": [test functions]}
+    """
+    registry: dict = {"block": None, "tests": []}
+
+    def record(function):
+        registry["block"] = function
+        return function
+
+    def record_test(function):
+        registry["tests"].append(function)
+        return function
+
+    decorators: dict = {name: record for name in ("data_loader", "transformer", "data_exporter", "custom")}
+    decorators["test"] = record_test
+
+    file_path = (block.get("configuration") or {}).get("file_path") or \
+        f"{BLOCK_DIRS[block['type']]}/{block['uuid']}.py"
+    runpy.run_path(str(PROJECT_DIR / file_path), init_globals=decorators)
+    return registry
+
+
+def topological_order(blocks: list) -> list:
+    # blocks sorted so every block comes after its upstream blocks
+    by_uuid: dict = {block["uuid"]: block for block in blocks}
+    ordered: list = []
+    visited: set = set()
+
+    def visit(uuid: str) -> None:
+        if uuid in visited:
+            return
+        visited.add(uuid)
+        for upstream in by_uuid[uuid].get("upstream_blocks") or []:
+            visit(upstream)
+        ordered.append(by_uuid[uuid])
+
+    for block in blocks:
+        visit(block["uuid"])
+    return ordered
+
+
+def run_block(block: dict, args: list, kwargs: dict):
+    # one run of a block file; module level so worker processes can run it
+    return load_block(block)["block"](*args, **kwargs)
+
+
+def run_pipeline(
+    name: str,
+    overrides: dict,
+    logger: logging.Logger,
+    run_tests: bool = True,
+    max_workers: int = None,
+    variables: dict = None,
+) -> list:
+    """
+    Run a pipeline's blocks in dependency order with its variables.
+
+    Upstream outputs are passed positionally like Mage does (tuples are
+    spread as multiple outputs). `overrides` maps a block uuid to a
+    function producing its output, for blocks that need the network.
+    `variables` override the pipeline's own.
+
+    Dynamic blocks fan out like in Mage: their downstream blocks run once
+    per item, concurrently in up to `max_workers` processes (the
+    pipeline's executor_count by default), until a block with
+    `reduce_output` collects the runs into one list.
+
+    Returns:
+        list: one measurement dict per block (fanned-out runs are measured
+        together)
+    """
+    metadata: dict = yaml.safe_load((PROJECT_DIR / "pipelines" / name / "metadata.yaml").read_text())
+    variables = {**(metadata.get("variables") or {}), **(variables or {})}
+    max_workers = max_workers or int(metadata.get("executor_count") or 1)
+
+    outputs: dict = {}
+    # uuid -> per-item values of dynamic blocks and of their non-reduced children
+    fanned: dict = {}
+    measurements: list = []
+    for block in topological_order(metadata["blocks"]):
+        uuid: str = block["uuid"]
+        configuration: dict = block.get("configuration") or {}
+        upstreams: list = block.get("upstream_blocks") or []
+        kwargs: dict = {**variables, "logger": logger, "pipeline_uuid": name}
+
+        n_runs: int = max((len(fanned[upstream]) for upstream in upstreams if upstream in fanned), default=0)
+        runs_args: list = []
+        for i in range(max(n_runs, 1)):
+            args: list = []
+            for upstream in upstreams:
+                output = fanned[upstream][i] if upstream in fanned else outputs[upstream]
+                args.extend(output if isinstance(output, tuple) else [output])
+            runs_args.append(args)
+
+        if uuid in overrides:
+            function, tests = overrides[uuid], []
+        else:
+            registry: dict = load_block(block)
+            function, tests = registry["block"], registry["tests"]
+
+        with track_resources() as stats:
+            if n_runs and max_workers > 1 and uuid not in overrides:
+                with ProcessPoolExecutor(max_workers=min(max_workers, n_runs)) as executor:
+                    run_outputs: list = list(executor.map(
+                        run_block, [block] * n_runs, runs_args, [kwargs] * n_runs
+                    ))
+            else:
+                run_outputs = [function(*args, **kwargs) for args in runs_args]
+
+        for output in run_outputs:
+            for test in tests if run_tests else []:
+                accepts_kwargs: bool = any(
+                    parameter.kind == parameter.VAR_KEYWORD for parameter in inspect.signature(test).parameters.values()
+                )
+                test(*(output if isinstance(output, tuple) else (output,)), **(kwargs if accepts_kwargs else {}))
+
+        if configuration.get("dynamic"):
+            outputs[uuid] = run_outputs[0]
+            fanned[uuid] = run_outputs[0][0]
+        elif n_runs and not configuration.get("reduce_output"):
+            fanned[uuid] = run_outputs
+        else:
+            outputs[uuid] = run_outputs if n_runs else run_outputs[0]
+
+        # exporters return nothing: count the rows they were given
+        rows: int = count_rows(run_outputs) or count_rows(tuple(arg for args in runs_args for arg in args))
+        measurements.append({
+            "pipeline": name,
+            "block": uuid if not n_runs else f"{uuid}[x{n_runs}]",
+            "rows": rows,
+            "rows_per_sec": rows / stats["seconds"] if stats["seconds"] else 0.0,
+            **stats,
+        })
+    return measurements
+
+
+def run_scale(
+    n_counties: int,
+    n_days: int,
+    logger: logging.Logger,
+    pipelines: list = PIPELINES,
+    ledger_dir: str = None,
+    variables: dict = None,
+) -> list:
+    """
+    Generate a fresh local lake for one scale and run the pipelines on it,
+    with `variables` overriding the pipelines' own. The blocks' run ledger
+    goes to `ledger_dir`, or is discarded with the lake.
+    """
+    with tempfile.TemporaryDirectory(prefix="covid-bench-") as work_dir:
+        os.environ[LOCAL_GCS_ROOT_ENV] = str(Path(work_dir) / "gcs")
+        os.environ[RUN_LEDGER_ENV] = ledger_dir or str(Path(work_dir) / "ledger")
+        clear_storage_clients()
+
+        archive_path: str = str(Path(work_dir) / "covid19-data-from-john-hopkins-university.zip")
+        write_raw_archive(archive_path, n_counties, n_days)
+
+        # the Kaggle download is replaced by the synthetic archive
+        overrides: dict = {
+            "import_covid_data": lambda **kwargs: {
+                "version": {"dataset": "synthetic", "version": 1, "last_updated": f"{n_counties}x{n_days}"},
+                "changed": True,
+                "archive": archive_path,
+            },
+        }
+
+        # the silver pipelines read what the ingest landed
+        if PIPELINES[0] not in pipelines:
+            pipelines = [PIPELINES[0]] + list(pipelines)
+
+        measurements: list = []
+        for name in pipelines:
+            for measurement in run_pipeline(name, overrides, logger, variables=variables):
+                measurements.append({"counties": n_counties, "days": n_days, **measurement})
+
+        clear_storage_clients()
+        return measurements
+
+
+def format_report(measurements: list) -> str:
+    header = f"{'scale':>11} {'pipeline':<40} {'block':<36} {'wall s':>8} {'cpu s':>8} {'peak MB':>9} {'rows':>11} {'rows/s':>12}"
+    lines: list = [header, "-" * len(header)]
+    for m in measurements:
+        lines.append(
+            f"{m['counties']:>5}x{m['days']:<5} {m['pipeline']:<40} {m['block']:<36} "
+            f"{m['seconds']:>8.2f} {m['cpu_seconds']:>8.2f} {m['peak_rss_mb']:>9.1f} "
+            f"{m['rows']:>11,} {m['rows_per_sec']:>12,.0f}"
+        )
+    return "\n".join(lines)
+
+
+def parse_scales(scales: str) -> list:
+    # '300x100,1000x500' -> [(300, 100), (1000, 500)]
+    return [tuple(int(part) for part in scale.lower().split("x")) for scale in scales.split(",") if scale]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help="comma separated COUNTIESxDAYS")
+    parser.add_argument("--pipelines", default=",".join(PIPELINES), help="comma separated pipeline uuids")
+    parser.add_argument("--output", help="also write the measurements as JSON lines to this file")
+    parser.add_argument("--ledger-dir", help="keep the blocks' run ledger in this directory")
+    parser.add_argument(
+        "--var", action="append", default=[], metavar="KEY=VALUE",
+        help="override a pipeline variable, e.g. --var handoff=arrow (repeatable)",
+    )
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level, format="%(asctime)s %(levelname)s %(message)s")
+    logger = logging.getLogger("bench")
+
+    # values are parsed like metadata.yaml values
+    variables: dict = {key: yaml.safe_load(value) for key, value in (var.split("=", 1) for var in args.var)}
+
+    measurements: list = []
+    for n_counties, n_days in parse_scales(args.scales):
+        measurements.extend(
+            run_scale(n_counties, n_days, logger, args.pipelines.split(","), args.ledger_dir, variables)
+        )
+
+    print(format_report(measurements))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            for measurement in measurements:
+                file.write(json.dumps(measurement) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,5 @@
-from mage_ai.settings.repo import get_repo_path
-from mage_ai.io.config import ConfigFileLoader
-from mage_ai.io.google_cloud_storage import GoogleCloudStorage
-from os import path
+from mage_gcp_covid.utils.gcs import load_csv
+
 if 'data_loader' not in globals():
     from mage_ai.data_preparation.decorators import data_loader
 if 'test' not in globals():
@@ -19,15 +17,15 @@ def load_from_google_cloud_storage(*args, **kwargs):
     # set block logger
     logger = kwargs.get("logger")
 
-    config_path = path.join(get_repo_path(), 'io_config.yaml')
     config_profile = 'dev'
 
     bucket_name = 'covid-medallion-lake'
     object_key = '01_bronze_landing/covid/RAW_us_confirmed_cases.csv'
 
-    return GoogleCloudStorage.with_config(ConfigFileLoader(config_path, config_profile)).load(
+    return load_csv(
         bucket_name,
         object_key,
+        config_profile,
     )
 
 
@@ -0,0 +1,48 @@
+from mage_gcp_covid.utils.lake_query import get_query_service
+
+if 'data_loader' not in globals():
+    from mage_ai.data_preparation.decorators import data_loader
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+
+@data_loader
+def query_lake(*args, **kwargs):
+    """
+    Template for querying the silver and gold datasets with SQL.
+
+    Runs on an embedded DuckDB over a local copy of the bucket (GCS_LOCAL_ROOT
+    or the `lake_root` variable), reading only the columns, partitions and
+    row groups the query needs. Views: silver_covid_us, silver_covid_all,
+    silver_fact_covid_daily, silver_dim_location, silver_covid_weather,
+    gold_covid_daily_metrics, gold_covid_state_day, gold_covid_state_week,
+    gold_covid_country_day, gold_covid_country_week.
+    """
+    # set block logger
+    logger = kwargs.get("logger")
+
+    sql = kwargs.get("sql")
+    params = kwargs.get("params")
+
+    # default: one county's time series (the default uid only goes with it)
+    if not sql:
+        sql = """
+            SELECT date, confirmed_cases
+            FROM silver_covid_us
+            WHERE uid = ?
+            ORDER BY date
+        """
+        params = params or ['84036061']
+
+    service = get_query_service(kwargs.get("lake_root"))
+    logger.info(f"Querying views {sorted(service.views)}")
+
+    return service.query(sql, params)
+
+
+@test
+def test_output(output, *args) -> None:
+    """
+    Template code for testing the output of the block.
+    """
+    assert output is not None, 'The output is undefined'
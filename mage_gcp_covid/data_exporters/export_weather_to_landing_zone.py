@@ -0,0 +1,100 @@
+from pandas import DataFrame
+
+from mage_gcp_covid.utils.gcs import get_storage_client
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.partitioned_parquet import (
+    BRONZE_WEATHER_DATASET,
+    WEATHER_KEY_COLS,
+    WEATHER_PARTITION_COLS,
+    add_year_month,
+    merge_partitioned,
+    write_partitioned,
+)
+from mage_gcp_covid.utils.sharding import combine_shard_outputs
+from mage_gcp_covid.utils.weather_cache import CACHE_DIR, CACHE_MAX_BYTES, WeatherCache
+
+if 'data_exporter' not in globals():
+    from mage_ai.data_preparation.decorators import data_exporter
+
+
+# rows per flushed batch; each batch is one object per month it covers
+WEATHER_FLUSH_ROWS: int = 500_000
+
+
+@data_exporter
+@instrument
+def export_data_to_google_cloud_storage(df: DataFrame, **kwargs) -> None:
+    """
+    Export the daily weather per grid cell to the landing zone as Parquet
+    partitioned by month, all cells of a month together (sorted by cell
+    and date, so readers skip row groups by cell_id).
+
+    write_mode:
+        'merge' (default): every touched month is compacted into one
+        object, new rows win on (cell_id, date), so backfills replace
+        idempotently
+        'append': the rows are flushed in batches of flush_rows, one object
+        per batch and month, named by the run's date range and the batch
+        number, so re-running the same range overwrites them
+
+    Docs: https://docs.mage.ai/design/data-loading#googlecloudstorage
+    """
+    # set block logger
+    logger = kwargs.get("logger")
+
+    # cell shards: the loader's reduced outputs, one per shard; combined so
+    # each month partition is written by this block only, and once
+    if isinstance(df, list):
+        df = combine_shard_outputs(df)
+
+        # the shards have all read the weather cache: evict once, here
+        evicted: list = WeatherCache(
+            kwargs.get("weather_cache_dir", CACHE_DIR),
+            int(kwargs.get("weather_cache_max_bytes", CACHE_MAX_BYTES))
+        ).evict()
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} cell files from the weather cache")
+
+    if df.empty:
+        logger.info("No weather rows to export")
+        return
+
+    config_profile = 'dev'
+
+    bucket_name = 'covid-medallion-lake'
+
+    client = get_storage_client(config_profile)
+    bucket = client.bucket(bucket_name)
+
+    write_mode: str = kwargs.get("write_mode", "merge")
+    flush_rows: int = int(kwargs.get("flush_rows", WEATHER_FLUSH_ROWS))
+
+    first_date, last_date = df["date"].min(), df["date"].max()
+    df = add_year_month(df).sort_values(["year_month"] + WEATHER_KEY_COLS, kind="stable").reset_index(drop=True)
+
+    if write_mode == "merge":
+        written: list = merge_partitioned(
+            df,
+            bucket=bucket,
+            prefix=BRONZE_WEATHER_DATASET,
+            partition_cols=WEATHER_PARTITION_COLS,
+            part_name="part-0.parquet",
+            key_cols=WEATHER_KEY_COLS,
+            logger=logger
+        )
+    else:
+        written = []
+        for batch, start in enumerate(range(0, len(df), flush_rows)):
+            written += write_partitioned(
+                df.iloc[start:start + flush_rows],
+                bucket=bucket,
+                prefix=BRONZE_WEATHER_DATASET,
+                partition_cols=WEATHER_PARTITION_COLS,
+                part_name=f"part-{first_date:%Y%m%d}-{last_date:%Y%m%d}-{batch:04d}.parquet",
+                logger=logger
+            )
+
+    logger.info(
+        f"Exported {len(df)} weather rows ({first_date:%Y-%m-%d} to {last_date:%Y-%m-%d}) "
+        f"as {len(written)} objects under {BRONZE_WEATHER_DATASET}"
+    )
@@ -0,0 +1,70 @@
+from mage_gcp_covid.utils.gcs import get_bucket
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.partitioned_parquet import add_year_month, merge_partitioned, write_partitioned
+from mage_gcp_covid.utils.rollups import ROLLUP_MANIFEST_KEY, ROLLUPS, rollup_key_cols, rollup_prefix
+from mage_gcp_covid.utils.silver_manifest import commit_part, read_manifest
+
+if 'data_exporter' not in globals():
+    from mage_ai.data_preparation.decorators import data_exporter
+
+
+@data_exporter
+@instrument
+def export_data_to_google_cloud_storage(*cubes, **kwargs) -> None:
+    """
+    Export the rollup cubes as month-partitioned gold datasets.
+
+    A full run replaces every cube. An incremental run upserts the new
+    cells on the cube keys, so only the month partitions holding changed
+    dates or weeks are rewritten.
+
+    Docs: https://docs.mage.ai/design/data-loading#googlecloudstorage
+    """
+    # set block logger
+    logger = kwargs.get("logger")
+
+    config_profile = 'dev'
+
+    bucket_name = 'covid-medallion-lake'
+
+    df_state_day = cubes[0]
+    if df_state_day.empty:
+        logger.info("No new silver dates since the last rollup, nothing to export")
+        return
+
+    first_date, last_date = df_state_day["date"].min(), df_state_day["date"].max()
+    part_name = f"part-{first_date:%Y%m%d}-{last_date:%Y%m%d}.parquet"
+
+    bucket = get_bucket(bucket_name, config_profile)
+
+    is_incremental: bool = kwargs.get("rollup_mode", "incremental") == "incremental"
+    manifest: dict = read_manifest(bucket, ROLLUP_MANIFEST_KEY) if is_incremental else {"parts": []}
+
+    for name, df_cube in zip(ROLLUPS, cubes):
+        period_col: str = ROLLUPS[name][1]
+        df_cube = add_year_month(df_cube, date_col=period_col)
+
+        if is_incremental:
+            merge_partitioned(
+                df_cube,
+                bucket=bucket,
+                prefix=rollup_prefix(name),
+                partition_cols=["year_month"],
+                part_name="part-0.parquet",
+                key_cols=rollup_key_cols(name),
+                logger=logger
+            )
+        else:
+            write_partitioned(
+                df_cube,
+                bucket=bucket,
+                prefix=rollup_prefix(name),
+                partition_cols=["year_month"],
+                part_name=part_name,
+                replace=True,
+                logger=logger
+            )
+
+    # the watermark is advanced only once every cube is written
+    commit_part(bucket, manifest, part_name, last_date, len(df_state_day), ROLLUP_MANIFEST_KEY)
+    logger.info(f"Rollups committed up to {last_date:%Y-%m-%d}")
@@ -1,30 +1,117 @@
-from mage_ai.settings.repo import get_repo_path
-from mage_ai.io.config import ConfigFileLoader
-from mage_ai.io.google_cloud_storage import GoogleCloudStorage
+from io import BytesIO
+
+import pandas as pd
 from pandas import DataFrame
-from os import path
+
+from mage_gcp_covid.utils.arrow_handoff import read_handoff, release_handoff
+from mage_gcp_covid.utils.covid_model import (
+    SILVER_DIM_LOCATION_KEY,
+    SILVER_FACT_DATASET,
+    SILVER_FACT_PARTITION_COLS,
+)
+from mage_gcp_covid.utils.gcs import export_parquet, get_bucket
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.partitioned_parquet import (
+    SILVER_COVID_DATASET,
+    SILVER_PARTITION_COLS,
+    add_year_month,
+    write_partitioned,
+)
+from mage_gcp_covid.utils.sharding import combine_shard_outputs
+from mage_gcp_covid.utils.silver_manifest import commit_part, get_watermark, read_manifest, silver_manifest_key
 
 if 'data_exporter' not in globals():
     from mage_ai.data_preparation.decorators import data_exporter
 
 
 @data_exporter
-def export_data_to_google_cloud_storage(df: DataFrame, **kwargs) -> None:
+@instrument
+def export_data_to_google_cloud_storage(df: DataFrame, *args, **kwargs) -> None:
     """
     Template for exporting data to a Google Cloud Storage bucket.
     Specify your configuration settings in 'io_config.yaml'.
 
     Docs: https://docs.mage.ai/design/data-loading#googlecloudstorage
     """
-    config_path = path.join(get_repo_path(), 'io_config.yaml')
+    # set block logger
+    logger = kwargs.get("logger")
+
+    # Arrow handoff: references to the transformer's IPC files, mapped
+    # without deserializing; released once the silver data is written
+    upstream = df
+
+    # state shards: the transformer's reduced outputs, one per shard
+    if isinstance(df, list):
+        df = combine_shard_outputs([read_handoff(output) for output in df])
+    else:
+        df = read_handoff(df)
+
+    # streaming mode already wrote the silver object batch by batch
+    if isinstance(df, dict):
+        logger.info(f"Silver written in streaming mode, nothing to export: {df}")
+        return
+
     config_profile = 'dev'
 
     bucket_name = 'covid-medallion-lake'
     object_key = '02_silver_standardize/covid/covid_us.parquet'
 
-    GoogleCloudStorage.with_config(ConfigFileLoader(config_path, config_profile)).export(
-        data=df,
-        bucket_name=bucket_name,
-        object_key=object_key,
-        format="Parquet"
+    # star model: the transformer outputs (fact_covid_daily, dim_location)
+    is_star: bool = kwargs.get("silver_model") == "star"
+    if is_star:
+        df, df_dim_location = df if isinstance(df, (list, tuple)) else (df, args[0])
+
+    # silver layout: 'partitioned' (Hive dataset) or 'single' (one object)
+    silver_layout: str = kwargs.get("silver_layout", "partitioned")
+    silver_mode: str = kwargs.get("silver_mode", "full")
+
+    bucket = get_bucket(bucket_name, config_profile)
+
+    # incremental runs append to the manifest of this silver target, full
+    # runs replace the target
+    is_incremental: bool = silver_mode == "incremental"
+    manifest_key: str = silver_manifest_key(**kwargs)
+    manifest: dict = read_manifest(bucket, manifest_key) if is_incremental else {"parts": []}
+
+    if df.empty:
+        logger.info("No new dates since the last silver commit, nothing to export")
+        release_handoff(upstream)
+        return
+
+    # one part per run, named by its date range so re-runs overwrite it
+    first_date, last_date = df["date"].min(), df["date"].max()
+    part_name = f"part-{first_date:%Y%m%d}-{last_date:%Y%m%d}.parquet"
+
+    if silver_layout == "single":
+        # a Parquet object cannot be appended to: an incremental run rewrites
+        # it with the committed rows followed by the new dates
+        watermark = get_watermark(manifest)
+        blob = bucket.blob(object_key)
+        if is_incremental and watermark is not None and blob.exists():
+            df_committed = pd.read_parquet(BytesIO(blob.download_as_bytes()))
+            df = combine_shard_outputs([df_committed[df_committed["date"] <= watermark], df])
+
+        export_parquet(df, bucket_name, object_key, config_profile)
+        commit_part(bucket, manifest, object_key, last_date, len(df), manifest_key)
+        release_handoff(upstream)
+
+        logger.info(f"Wrote {len(df)} rows to {object_key}, watermark now {last_date:%Y-%m-%d}")
+        return
+
+    # the location dimension is small and always rewritten in full
+    if is_star:
+        export_parquet(df_dim_location, bucket_name, SILVER_DIM_LOCATION_KEY, config_profile)
+
+    write_partitioned(
+        add_year_month(df),
+        bucket=bucket,
+        prefix=SILVER_FACT_DATASET if is_star else SILVER_COVID_DATASET,
+        partition_cols=SILVER_FACT_PARTITION_COLS if is_star else SILVER_PARTITION_COLS,
+        part_name=part_name,
+        replace=not is_incremental,
+        logger=logger
     )
+    commit_part(bucket, manifest, part_name, last_date, len(df), manifest_key)
+    release_handoff(upstream)
+
+    logger.info(f"Committed {len(df)} rows as {part_name}, watermark now {last_date:%Y-%m-%d}")
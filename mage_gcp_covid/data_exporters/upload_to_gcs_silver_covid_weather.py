@@ -0,0 +1,39 @@
+from pandas import DataFrame
+
+from mage_gcp_covid.utils.gcs import get_storage_client
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.partitioned_parquet import SILVER_COVID_WEATHER_DATASET, add_year_month, write_partitioned
+
+if 'data_exporter' not in globals():
+    from mage_ai.data_preparation.decorators import data_exporter
+
+
+@data_exporter
+@instrument
+def export_data_to_google_cloud_storage(df: DataFrame, **kwargs) -> None:
+    """
+    Export the weather-enriched COVID rows as a month-partitioned silver dataset.
+
+    Docs: https://docs.mage.ai/design/data-loading#googlecloudstorage
+    """
+    # set block logger
+    logger = kwargs.get("logger")
+
+    config_profile = 'dev'
+
+    bucket_name = 'covid-medallion-lake'
+
+    first_date, last_date = df["date"].min(), df["date"].max()
+    part_name = f"part-{first_date:%Y%m%d}-{last_date:%Y%m%d}.parquet"
+
+    client = get_storage_client(config_profile)
+
+    write_partitioned(
+        add_year_month(df),
+        bucket=client.bucket(bucket_name),
+        prefix=SILVER_COVID_WEATHER_DATASET,
+        partition_cols=["year_month"],
+        part_name=part_name,
+        replace=True,
+        logger=logger
+    )
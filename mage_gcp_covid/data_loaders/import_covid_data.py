@@ -1,9 +1,12 @@
 import kaggle
 from kaggle.api.kaggle_api_extended import KaggleApi
 
-import pandas as pd
 from pathlib import Path
+import zipfile
 
+from mage_gcp_covid.utils.gcs import get_bucket
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.kaggle_ingest import RAW_FILES, get_dataset_version, is_landed
 
 if 'data_loader' not in globals():
     from mage_ai.data_preparation.decorators import data_loader
@@ -11,30 +14,43 @@ if 'test' not in globals():
     from mage_ai.data_preparation.decorators import test
 
 @data_loader
+@instrument
 def load_data(*args, **kwargs):
     """
-    Template code for loading data from any source.
+    Download the Kaggle dataset archive when its version is not landed yet.
+
+    The archive is kept zipped; `upload_to_gcs` streams the needed members
+    from it into the landing zone.
 
     Returns:
-        Anything (e.g. data frame, dictionary, array, int, str, etc.)
+        dict: dataset version, whether it changed and the local archive path
+        (None when the landing zone is up to date)
     """
     # set block logger
     logger = kwargs.get("logger")
 
-    # set Kaggle dataset path and download
+    # set Kaggle dataset path
     api = KaggleApi()
     api.authenticate()
 
     dataset_path: str = kwargs["dataset_ep"]
     dump_path: str = kwargs["dump_dir"]
-    logger.debug("Path to dataset files:", dataset_path)
+    logger.debug(f"Path to dataset files: {dataset_path}")
 
-    # download to local
-    Path(dump_path).mkdir(parents=True, exist_ok=True)
-    api.dataset_download_files(dataset_path, path=dump_path, unzip=True)
+    # skip the download when this version is already in the landing zone
+    version: dict = get_dataset_version(api, dataset_path)
+    bucket_name = 'covid-medallion-lake'
+    if not kwargs.get("force_download") and is_landed(get_bucket(bucket_name), version):
+        logger.info(f"{dataset_path} version {version['version']} ({version['last_updated']}) already landed")
+        return {"version": version, "changed": False, "archive": None}
 
+    # download the archive only, no unzip
+    Path(dump_path).mkdir(parents=True, exist_ok=True)
+    api.dataset_download_files(dataset_path, path=dump_path, unzip=False, force=True, quiet=True)
+    archive_path: str = str(Path(dump_path) / f"{dataset_path.split('/')[-1]}.zip")
+    logger.info(f"Downloaded {dataset_path} version {version['version']} to {archive_path}")
 
-    return {}
+    return {"version": version, "changed": True, "archive": archive_path}
 
 
 @test
@@ -42,38 +58,28 @@ def test_output(output, *args, **kwargs) -> None:
     """
     Template code for testing the output of the block.
     """
-    dump_path: str = kwargs["dump_dir"]
-    file_list: list = [
-        "CONVENIENT_global_confirmed_cases.csv",
-        "CONVENIENT_global_deaths.csv",
-        "CONVENIENT_global_metadata.csv",
-        "CONVENIENT_us_confirmed_cases.csv",
-        "CONVENIENT_us_deaths.csv",
-        "CONVENIENT_us_metadata.csv",
-        "RAW_global_confirmed_cases.csv",
-        "RAW_global_deaths.csv",
-        "RAW_us_confirmed_cases.csv",
-        "RAW_us_deaths.csv",
-    ]
-
-    # check existence of all files in dump folder
-    dict_dump: dict = check_files_exist(dump_dir=dump_path, file_list=file_list)
-
-    # assert output is not None, 'The output is undefined'
+    assert output is not None, 'The output is undefined'
+    if not output["changed"]:
+        return
+
+    # check existence of the needed files in the archive
+    dict_dump: dict = check_members_exist(archive_path=output["archive"], file_list=RAW_FILES)
+
     assert len(dict_dump["list_missing"]) == 0, f"Expected dataset files are missing: {dict_dump['list_missing']}"
 
 
-def check_files_exist(dump_dir: str, file_list: list) -> dict:
+def check_members_exist(archive_path: str, file_list: list) -> dict:
 
-    # creact dict with filename and existence status
-    dict_results: dict = {file: Path(f"{dump_dir}/{file}").is_file() for file in file_list}
+    # create dict with member name and existence status
+    with zipfile.ZipFile(archive_path) as archive:
+        names: set = set(archive.namelist())
+    dict_results: dict = {file: file in names for file in file_list}
 
-    list_exists: list = [file for file in file_list if Path(f"{dump_dir}/{file}").is_file()]
-    list_missing: list = [file for file in file_list if not Path(f"{dump_dir}/{file}").is_file()]
+    list_exists: list = [file for file in file_list if dict_results[file]]
+    list_missing: list = [file for file in file_list if not dict_results[file]]
 
     return {
         "dict_results": dict_results,
         "list_exists": list_exists,
         "list_missing": list_missing
     }
-
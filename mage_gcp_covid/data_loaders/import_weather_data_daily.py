@@ -1,9 +1,18 @@
-import io
-import openmeteo_requests
+from pandas import DataFrame
 
-import requests_cache
-import pandas as pd
-from retry_requests import retry
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.openmeteo import (
+    ARCHIVE_URL,
+    BATCH_SIZE,
+    DAILY_VARIABLES,
+    MAX_WORKERS,
+    REQUESTS_PER_SECOND,
+    decode_responses,
+    decoded_to_frame,
+    fetch_weather,
+)
+from mage_gcp_covid.utils.weather_cache import CACHE_DIR, CACHE_MAX_BYTES, WeatherCache, group_cells_by_gaps
+from mage_gcp_covid.utils.weather_grid import unique_cells
 
 if 'data_loader' not in globals():
     from mage_ai.data_preparation.decorators import data_loader
@@ -12,75 +21,77 @@ if 'test' not in globals():
 
 
 @data_loader
+@instrument
 def load_data_from_api(data, *args, **kwargs):
+    """
+    Fetch daily archive weather once per grid cell from
+    `snap_coordinates_to_grid`, or from one shard of `shard_grid_cells`.
+
+    Returns:
+        DataFrame: one row per (cell_id, date) with the requested daily
+        variables; fan out to locations with `fan_out_to_locations`
+    """
+    # set block logger
+    logger = kwargs.get("logger")
+
+    # shards run concurrently and share the API rate limit
+    shard_count: int = 1
+    if isinstance(data, dict):
+        shard_count = int(data["shard_count"])
+        data = DataFrame(data["locations"])
+
+    # store grid cell data
+    df_cells = unique_cells(data)
+    logger.info(f"Fetching weather for {len(df_cells)} grid cells covering {len(data)} locations")
+
+    start_date: str = kwargs.get("start_date", "2025-03-27")
+    end_date: str = kwargs.get("end_date", "2025-04-10")
+
+    # only request the (cell, date range, variables) gaps that are not cached yet
+    cache = WeatherCache(
+        kwargs.get("weather_cache_dir", CACHE_DIR),
+        int(kwargs.get("weather_cache_max_bytes", CACHE_MAX_BYTES))
+    )
+    gaps: dict = group_cells_by_gaps(cache, df_cells["cell_id"], DAILY_VARIABLES, start_date, end_date)
+    logger.info(f"{sum(len(cells) for cells in gaps.values())} cell ranges missing from the cache")
+
+    for (gap_start, gap_end, gap_variables), gap_cells in gaps.items():
+        df_gap_cells = df_cells[df_cells["cell_id"].isin(gap_cells)]
+        gap_variables = list(gap_variables)
+
+        # Make sure all required weather variables are listed here
+        # The order of variables in hourly or daily is important to assign them correctly below
+        params = {
+            "start_date": gap_start,
+            "end_date": gap_end,
+            "daily": gap_variables,
+        }
+        responses = fetch_weather(
+            df_gap_cells,
+            params,
+            url=ARCHIVE_URL,
+            batch_size=int(kwargs.get("batch_size", BATCH_SIZE)),
+            max_workers=int(kwargs.get("max_workers", MAX_WORKERS)),
+            requests_per_second=float(kwargs.get("requests_per_second", REQUESTS_PER_SECOND)) / shard_count,
+            logger=logger
+        )
+
+        # Process daily data for every cell in one block
+        decoded: tuple = decode_responses(responses, gap_variables, kind="daily")
+        cache.put(decoded_to_frame(decoded, gap_variables, df_gap_cells["cell_id"].to_numpy()))
+        logger.info(f"Fetched {gap_variables} from {gap_start} to {gap_end} for {len(gap_cells)} cells")
+
+    df_weather = cache.get(df_cells["cell_id"], DAILY_VARIABLES, start_date, end_date)
+
+    # shards share the cache: the exporter evicts once they are all reduced
+    if shard_count == 1:
+        evicted: list = cache.evict()
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} cell files from the weather cache")
+
+    logger.info(f"Weather df shape: {df_weather.shape}")
 
-    # store coordinate data
-    df_coordinates = data
-
-    # Setup the Open-Meteo API client with cache and retry on error
-    cache_session = requests_cache.CachedSession('.cache', expire_after = -1)
-    retry_session = retry(cache_session, retries = 5, backoff_factor = 0.2)
-    openmeteo = openmeteo_requests.Client(session = retry_session)
-
-    # Make sure all required weather variables are listed here
-    # The order of variables in hourly or daily is important to assign them correctly below
-    url = "https://archive-api.open-meteo.com/v1/archive"
-    params = {
-        "latitude": 52.52,
-        "longitude": 13.41,
-        "start_date": "2025-03-27",
-        "end_date": "2025-04-10",
-        "daily": ["weather_code", "precipitation_sum", "temperature_2m_mean", "temperature_2m_max", "temperature_2m_min", "daylight_duration", "snowfall_sum", "rain_sum", "precipitation_hours", "apparent_temperature_mean", "apparent_temperature_max", "apparent_temperature_min"],
-        "hourly": "temperature_2m"
-    }
-    responses = openmeteo.weather_api(url, params=params)
-
-    # Process first location. Add a for-loop for multiple locations or weather models
-    response = responses[0]
-    print(f"Coordinates {response.Latitude()}°N {response.Longitude()}°E")
-    print(f"Elevation {response.Elevation()} m asl")
-    print(f"Timezone {response.Timezone()}{response.TimezoneAbbreviation()}")
-    print(f"Timezone difference to GMT+0 {response.UtcOffsetSeconds()} s")
-
-    # Process daily data. The order of variables needs to be the same as requested.
-    daily = response.Daily()
-    daily_weather_code = daily.Variables(0).ValuesAsNumpy()
-    daily_precipitation_sum = daily.Variables(1).ValuesAsNumpy()
-    daily_temperature_2m_mean = daily.Variables(2).ValuesAsNumpy()
-    daily_temperature_2m_max = daily.Variables(3).ValuesAsNumpy()
-    daily_temperature_2m_min = daily.Variables(4).ValuesAsNumpy()
-    daily_daylight_duration = daily.Variables(5).ValuesAsNumpy()
-    daily_snowfall_sum = daily.Variables(6).ValuesAsNumpy()
-    daily_rain_sum = daily.Variables(7).ValuesAsNumpy()
-    daily_precipitation_hours = daily.Variables(8).ValuesAsNumpy()
-    daily_apparent_temperature_mean = daily.Variables(9).ValuesAsNumpy()
-    daily_apparent_temperature_max = daily.Variables(10).ValuesAsNumpy()
-    daily_apparent_temperature_min = daily.Variables(11).ValuesAsNumpy()
-
-    daily_data = {"date": pd.date_range(
-        start = pd.to_datetime(daily.Time(), unit = "s", utc = True),
-        end = pd.to_datetime(daily.TimeEnd(), unit = "s", utc = True),
-        freq = pd.Timedelta(seconds = daily.Interval()),
-        inclusive = "left"
-    )}
-
-    daily_data["weather_code"] = daily_weather_code
-    daily_data["precipitation_sum"] = daily_precipitation_sum
-    daily_data["temperature_2m_mean"] = daily_temperature_2m_mean
-    daily_data["temperature_2m_max"] = daily_temperature_2m_max
-    daily_data["temperature_2m_min"] = daily_temperature_2m_min
-    daily_data["daylight_duration"] = daily_daylight_duration
-    daily_data["snowfall_sum"] = daily_snowfall_sum
-    daily_data["rain_sum"] = daily_rain_sum
-    daily_data["precipitation_hours"] = daily_precipitation_hours
-    daily_data["apparent_temperature_mean"] = daily_apparent_temperature_mean
-    daily_data["apparent_temperature_max"] = daily_apparent_temperature_max
-    daily_data["apparent_temperature_min"] = daily_apparent_temperature_min
-
-    daily_dataframe = pd.DataFrame(data = daily_data)
-
-    # return daily_dataframe
-    return data
+    return df_weather
 
 
 @test
@@ -0,0 +1,52 @@
+from mage_gcp_covid.utils.covid_sources import RAW_DATASETS, process_all_raw_datasets
+from mage_gcp_covid.utils.instrumentation import instrument
+
+if 'data_loader' not in globals():
+    from mage_ai.data_preparation.decorators import data_loader
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+
+@data_loader
+@instrument
+def load_data(*args, **kwargs):
+    """
+    Load and standardize all four RAW COVID files.
+
+    Every file is downloaded, parsed and harmonized to the US meta layout
+    in its own worker process. Back in this process, the confirmed cases
+    and deaths of each scope (US, global) are aligned on the location key
+    in wide form and melted once into one fact keyed by location and date.
+
+    Returns:
+        DataFrame: location columns, date, confirmed_cases, deaths
+    """
+    # set block logger
+    logger = kwargs.get("logger")
+
+    bucket_name = 'covid-medallion-lake'
+    config_profile = 'dev'
+
+    datasets: list = kwargs.get("datasets") or list(RAW_DATASETS)
+    max_workers = kwargs.get("max_workers")
+
+    df_fact = process_all_raw_datasets(
+        bucket_name,
+        names=datasets,
+        config_profile=config_profile,
+        max_workers=int(max_workers) if max_workers else None,
+        logger=logger
+    )
+    logger.info(f"Unified COVID fact shape: {df_fact.shape}")
+
+    return df_fact
+
+
+@test
+def test_output(output, *args) -> None:
+    """
+    Template code for testing the output of the block.
+    """
+    assert output is not None, 'The output is undefined'
+    assert len(output) > 0, 'Unified fact has no rows'
+    assert output['date'].isna().sum() == 0, 'There are missing dates after transformation'
@@ -1,7 +1,7 @@
-from mage_ai.settings.repo import get_repo_path
-from mage_ai.io.config import ConfigFileLoader
-from mage_ai.io.google_cloud_storage import GoogleCloudStorage
-from os import path
+from mage_gcp_covid.utils.covid_stream import RAW_US_CSV_TYPES, RAW_US_LOCATION_COLS
+from mage_gcp_covid.utils.gcs import load_csv_arrow
+from mage_gcp_covid.utils.instrumentation import instrument
+
 if 'data_loader' not in globals():
     from mage_ai.data_preparation.decorators import data_loader
 if 'test' not in globals():
@@ -9,6 +9,7 @@ if 'test' not in globals():
 
 
 @data_loader
+@instrument
 def load_from_google_cloud_storage(*args, **kwargs):
     """
     Template for loading data from a Google Cloud Storage bucket.
@@ -19,15 +20,18 @@ def load_from_google_cloud_storage(*args, **kwargs):
     # set block logger
     logger = kwargs.get("logger")
 
-    config_path = path.join(get_repo_path(), 'io_config.yaml')
     config_profile = 'dev'
 
     bucket_name = 'covid-medallion-lake'
     object_key = '01_bronze_landing/covid/RAW_us_confirmed_cases.csv'
 
-    return GoogleCloudStorage.with_config(ConfigFileLoader(config_path, config_profile)).load(
+    # only the location columns are parsed, the ~1100 date columns are skipped
+    return load_csv_arrow(
         bucket_name,
         object_key,
+        config_profile,
+        columns=RAW_US_LOCATION_COLS,
+        column_types=RAW_US_CSV_TYPES,
     )
 
 
@@ -1,7 +1,9 @@
-from mage_ai.settings.repo import get_repo_path
-from mage_ai.io.config import ConfigFileLoader
-from mage_ai.io.google_cloud_storage import GoogleCloudStorage
-from os import path
+from mage_gcp_covid.utils.arrow_handoff import read_handoff, release_handoff, use_arrow_handoff, write_handoff
+from mage_gcp_covid.utils.covid_stream import RAW_US_CSV_TYPES
+from mage_gcp_covid.utils.gcs import get_bucket, load_csv_arrow
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.silver_manifest import raw_columns_to_load
+
 if 'data_loader' not in globals():
     from mage_ai.data_preparation.decorators import data_loader
 if 'test' not in globals():
@@ -9,27 +11,71 @@ if 'test' not in globals():
 
 
 @data_loader
+@instrument
 def load_from_google_cloud_storage(*args, **kwargs):
     """
     Template for loading data from a Google Cloud Storage bucket.
     Specify your configuration settings in 'io_config.yaml'.
 
+    Downstream of `shard_covid_states` the block receives one shard: the
+    sharder parsed the object once and wrote the shard's rows as an Arrow
+    IPC file, which is mapped here instead of reading the CSV again. With
+    `handoff: arrow` the frame is written as an Arrow IPC file and only
+    its reference is returned.
+
     Docs: https://docs.mage.ai/design/data-loading#googlecloudstorage
     """
     # set block logger
     logger = kwargs.get("logger")
 
-    config_path = path.join(get_repo_path(), 'io_config.yaml')
+    shard: dict = args[0] if args and isinstance(args[0], dict) else {}
+
     config_profile = 'dev'
 
     bucket_name = 'covid-medallion-lake'
     object_key = '01_bronze_landing/covid/RAW_us_confirmed_cases.csv'
 
-    return GoogleCloudStorage.with_config(ConfigFileLoader(config_path, config_profile)).load(
+    # in streaming mode the transformer reads the object in record batches
+    if kwargs.get("silver_mode") == "stream":
+        return {"bucket_name": bucket_name, "object_key": object_key}
+
+    # state shard: the rows were already parsed (and the incremental date
+    # columns selected) by the sharder
+    if shard.get("rows") is not None:
+        logger.info(
+            f"Shard {shard['shard']}/{shard['shard_count']}: "
+            f"{shard['rows']['rows_out']} rows of {len(shard['states'])} states"
+        )
+
+        # Arrow handoff: pass the shard file on to the transformer as is
+        if use_arrow_handoff(**kwargs):
+            return shard["rows"]
+
+        df = read_handoff(shard["rows"])
+        release_handoff(shard["rows"])
+        return df
+
+    # the object is parsed by the multithreaded Arrow CSV reader; 'pyarrow'
+    # returns Arrow-backed columns without a conversion copy
+    dtype_backend: str = kwargs.get("dtype_backend", "pyarrow")
+
+    # in incremental mode only parse the date columns after the silver watermark
+    df = load_csv_arrow(
         bucket_name,
         object_key,
+        config_profile,
+        columns=raw_columns_to_load(get_bucket(bucket_name, config_profile), **kwargs),
+        column_types=RAW_US_CSV_TYPES,
+        dtype_backend=dtype_backend,
     )
 
+    # Arrow handoff: the transformer maps the file instead of Mage
+    # serializing the wide frame to its variable store
+    if use_arrow_handoff(**kwargs):
+        return write_handoff(df, "load_covid_raw", **kwargs)
+
+    return df
+
 
 @test
 def test_output(output, *args) -> None:
@@ -0,0 +1,74 @@
+import pandas as pd
+
+from mage_gcp_covid.utils.gcs import get_storage_client
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.partitioned_parquet import SILVER_COVID_DATASET, read_partitioned
+
+if 'data_loader' not in globals():
+    from mage_ai.data_preparation.decorators import data_loader
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+
+def build_silver_filters(**kwargs) -> dict:
+    """
+    Translate the block variables into partition and row filters.
+
+    - country_region / province_state: a name or a list of names
+    - date_from / date_to: inclusive date range ('YYYY-MM-DD')
+    """
+    filters: dict = {}
+
+    for col in ["country_region", "province_state"]:
+        if kwargs.get(col):
+            filters[col] = kwargs[col]
+
+    date_from = pd.Timestamp(kwargs["date_from"]) if kwargs.get("date_from") else None
+    date_to = pd.Timestamp(kwargs["date_to"]) if kwargs.get("date_to") else None
+    if date_from is not None or date_to is not None:
+        # prune month partitions, then filter rows inside the boundary months
+        filters["year_month"] = (
+            date_from.strftime("%Y-%m") if date_from is not None else None,
+            date_to.strftime("%Y-%m") if date_to is not None else None,
+        )
+        filters["date"] = (date_from, date_to)
+
+    return filters
+
+
+@data_loader
+@instrument
+def load_from_google_cloud_storage(*args, **kwargs):
+    """
+    Load the partitioned silver COVID dataset, fetching only the partitions
+    and columns that match the block variables.
+
+    Docs: https://docs.mage.ai/design/data-loading#googlecloudstorage
+    """
+    # set block logger
+    logger = kwargs.get("logger")
+
+    config_profile = 'dev'
+
+    bucket_name = 'covid-medallion-lake'
+
+    filters: dict = build_silver_filters(**kwargs)
+    columns = kwargs.get("columns")
+    logger.info(f"Silver filters: {filters}, columns: {columns}")
+
+    client = get_storage_client(config_profile)
+
+    return read_partitioned(
+        client.bucket(bucket_name),
+        prefix=SILVER_COVID_DATASET,
+        filters=filters,
+        columns=columns,
+    )
+
+
+@test
+def test_output(output, *args) -> None:
+    """
+    Template code for testing the output of the block.
+    """
+    assert output is not None, 'The output is undefined'
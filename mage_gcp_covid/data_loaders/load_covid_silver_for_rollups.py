@@ -0,0 +1,62 @@
+from pandas import DataFrame
+
+from mage_gcp_covid.utils.gcs import get_bucket
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.partitioned_parquet import read_partitioned
+from mage_gcp_covid.utils.rollups import ROLLUP_MANIFEST_KEY, ROLLUP_SOURCES, STATE_COLS, rollup_start_date
+from mage_gcp_covid.utils.silver_manifest import get_watermark, read_manifest
+
+if 'data_loader' not in globals():
+    from mage_ai.data_preparation.decorators import data_loader
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+
+@data_loader
+@instrument
+def load_from_google_cloud_storage(*args, **kwargs) -> DataFrame:
+    """
+    Load the silver rows the rollup cubes are built from.
+
+    Block variables:
+        rollup_source: 'covid_us' (default) or 'covid_all'
+        rollup_mode: 'full' reads every date; 'incremental' (default) reads
+            only the weeks after the last rolled-up date
+
+    Docs: https://docs.mage.ai/design/data-loading#googlecloudstorage
+    """
+    # set block logger
+    logger = kwargs.get("logger")
+
+    config_profile = 'dev'
+
+    bucket_name = 'covid-medallion-lake'
+
+    source: dict = ROLLUP_SOURCES[kwargs.get("rollup_source", "covid_us")]
+    bucket = get_bucket(bucket_name, config_profile)
+
+    filters: dict = {}
+    watermark = None
+    if kwargs.get("rollup_mode", "incremental") == "incremental":
+        watermark = get_watermark(read_manifest(bucket, ROLLUP_MANIFEST_KEY))
+    if watermark is not None:
+        start_date = rollup_start_date(watermark)
+        filters = {"year_month": (start_date.strftime("%Y-%m"), None), "date": (start_date, None)}
+
+    df = read_partitioned(
+        bucket,
+        prefix=source["prefix"],
+        filters=filters,
+        columns=STATE_COLS + ["date"] + source["measures"],
+    )
+    logger.info(f"Rollup input from {source['prefix']} after watermark {watermark}: {len(df)} rows")
+
+    return df
+
+
+@test
+def test_output(output, *args) -> None:
+    """
+    Template code for testing the output of the block.
+    """
+    assert output is not None, 'The output is undefined'
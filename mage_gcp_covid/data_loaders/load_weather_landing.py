@@ -0,0 +1,52 @@
+import pandas as pd
+
+from mage_gcp_covid.utils.gcs import get_storage_client
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.partitioned_parquet import BRONZE_WEATHER_DATASET, read_partitioned
+
+if 'data_loader' not in globals():
+    from mage_ai.data_preparation.decorators import data_loader
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+
+@data_loader
+@instrument
+def load_from_google_cloud_storage(*args, **kwargs):
+    """
+    Load the daily weather per grid cell from the landing zone, fetching
+    only the month partitions between date_from and date_to.
+
+    Docs: https://docs.mage.ai/design/data-loading#googlecloudstorage
+    """
+    # set block logger
+    logger = kwargs.get("logger")
+
+    config_profile = 'dev'
+
+    bucket_name = 'covid-medallion-lake'
+
+    # weather dates are stored in UTC
+    filters: dict = {}
+    date_from = pd.Timestamp(kwargs["date_from"], tz="UTC") if kwargs.get("date_from") else None
+    date_to = pd.Timestamp(kwargs["date_to"], tz="UTC") if kwargs.get("date_to") else None
+    if date_from is not None or date_to is not None:
+        filters["year_month"] = (
+            date_from.strftime("%Y-%m") if date_from is not None else None,
+            date_to.strftime("%Y-%m") if date_to is not None else None,
+        )
+        filters["date"] = (date_from, date_to)
+    logger.info(f"Weather filters: {filters}")
+
+    client = get_storage_client(config_profile)
+
+    df = read_partitioned(client.bucket(bucket_name), prefix=BRONZE_WEATHER_DATASET, filters=filters)
+    return df.drop(columns="year_month", errors="ignore")
+
+
+@test
+def test_output(output, *args) -> None:
+    """
+    Template code for testing the output of the block.
+    """
+    assert output is not None, 'The output is undefined'
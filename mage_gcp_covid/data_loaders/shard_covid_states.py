@@ -0,0 +1,76 @@
+from mage_gcp_covid.utils.covid_stream import RAW_US_CSV_TYPES
+from mage_gcp_covid.utils.arrow_handoff import write_handoff
+from mage_gcp_covid.utils.gcs import get_bucket, load_csv_arrow
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.sharding import balance_by_key, dynamic_output, get_shard_count
+from mage_gcp_covid.utils.silver_manifest import raw_columns_to_load
+
+if 'data_loader' not in globals():
+    from mage_ai.data_preparation.decorators import data_loader
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+
+@data_loader
+@instrument
+def load_data(*args, **kwargs):
+    """
+    Split the RAW US file into state shards of about the same row count.
+
+    Dynamic block: Mage runs the downstream blocks once per shard, in
+    parallel up to the pipeline's executor count; the transformer's
+    `reduce_output` collects the shards again for the exporter.
+
+    The object is downloaded and parsed here once (only the new date
+    columns in incremental mode). Each shard's rows are written as an
+    Arrow IPC file on the local disk the executors share, which the
+    shard's `load_covid_raw` maps without copying.
+
+    Returns:
+        list: [shards, metadata], a shard being {"shard": i, "shard_count": n,
+        "states": [Province_State, ...], "rows": Arrow handoff reference}
+    """
+    # set block logger
+    logger = kwargs.get("logger")
+
+    config_profile = 'dev'
+
+    bucket_name = 'covid-medallion-lake'
+    object_key = '01_bronze_landing/covid/RAW_us_confirmed_cases.csv'
+
+    # streaming mode writes one silver object, so it runs as one shard
+    if kwargs.get("silver_mode") == "stream":
+        return dynamic_output([{"shard": 0, "shard_count": 1, "states": None}], "states")
+
+    df = load_csv_arrow(
+        bucket_name,
+        object_key,
+        config_profile,
+        columns=raw_columns_to_load(get_bucket(bucket_name, config_profile), **kwargs),
+        column_types=RAW_US_CSV_TYPES,
+        dtype_backend=kwargs.get("dtype_backend", "pyarrow"),
+    )
+    # rows without a Province_State are a shard key of their own (None)
+    shards: list = balance_by_key(df, "Province_State", get_shard_count(**kwargs))
+    items: list = []
+    for i, (states, df_shard) in enumerate(shards):
+        items.append({
+            "shard": i,
+            "shard_count": len(shards),
+            "states": states,
+            "rows": write_handoff(df_shard, f"shard_covid_states_{i}", **kwargs),
+        })
+        logger.info(f"Shard {i}: {len(states)} states, {len(df_shard)} rows")
+
+    return dynamic_output(items, "states")
+
+
+@test
+def test_output(output, *args) -> None:
+    """
+    Template code for testing the output of the block.
+    """
+    assert output is not None, 'The output is undefined'
+    items, metadata = output
+    assert len(items) > 0, 'There are no shards'
+    assert len(items) == len(metadata), 'Every shard needs its metadata'
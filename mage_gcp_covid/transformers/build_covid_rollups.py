@@ -0,0 +1,58 @@
+import time
+
+from mage_gcp_covid.utils.covid_sources import MEASURES
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.rollups import ROLLUPS, build_rollups
+
+if 'transformer' not in globals():
+    from mage_ai.data_preparation.decorators import transformer
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+
+@transformer
+@instrument
+def transform(data, *args, **kwargs):
+    """
+    Roll the silver counts up to state and country, by day and by week.
+
+    Args:
+        data: silver rows from `load_covid_silver_for_rollups`
+
+    Returns:
+        tuple: (state_day, state_week, country_day, country_week) cubes;
+        Mage passes them to the exporter as separate outputs
+    """
+    # set block logger
+    logger = kwargs.get("logger")
+
+    measures: list = [measure for measure in MEASURES if measure in data.columns]
+
+    start_time = time.perf_counter()
+    cubes: dict = build_rollups(data, measures)
+    elapsed: float = time.perf_counter() - start_time
+
+    logger.info(
+        f"Rolled up {len(data)} rows in {elapsed:.2f}s: "
+        + ", ".join(f"{name} {len(df_cube)}" for name, df_cube in cubes.items())
+    )
+
+    return tuple(cubes[name] for name in ROLLUPS)
+
+
+@test
+def test_output(state_day, state_week, country_day, country_week, *args) -> None:
+    """
+    Template code for testing the output of the block.
+    """
+    assert state_day is not None, 'The output is undefined'
+    if len(state_day) == 0:
+        return
+
+    # every level must account for the same rows
+    assert state_day['n_locations'].sum() == country_day['n_locations'].sum(), 'State and country cubes disagree'
+    for measure in MEASURES:
+        if measure in state_day.columns:
+            assert state_day[measure].sum() == country_day[measure].sum(), f'{measure} totals disagree'
+    assert state_week['n_days'].sum() == len(state_day), 'Week cubes do not cover the day cells'
+    assert country_week['n_days'].sum() == len(country_day), 'Week cubes do not cover the day cells'
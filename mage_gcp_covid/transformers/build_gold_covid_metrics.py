@@ -0,0 +1,64 @@
+import time
+
+from mage_gcp_covid.utils.covid_sources import MEASURES
+from mage_gcp_covid.utils.gold_metrics import GROWTH_PERIOD, ROLLING_WINDOWS, build_daily_metrics
+from mage_gcp_covid.utils.instrumentation import instrument
+
+if 'transformer' not in globals():
+    from mage_ai.data_preparation.decorators import transformer
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+
+@transformer
+@instrument
+def transform(data, *args, **kwargs):
+    """
+    Derive the gold daily metrics from the cumulative silver COVID counts.
+
+    Args:
+        data: silver COVID rows from `load_covid_silver` (uid, date, confirmed_cases, ...)
+
+    Block variables:
+        rolling_windows: trailing windows in days, e.g. [7, 14]
+        growth_period: days between the averages compared by the growth rate
+
+    Returns:
+        DataFrame: one row per location and day with new counts, repaired
+        cumulative counts, rolling averages and growth rates
+    """
+    # set block logger
+    logger = kwargs.get("logger")
+
+    measures: list = [measure for measure in MEASURES if measure in data.columns]
+    windows: list = [int(window) for window in kwargs.get("rolling_windows") or ROLLING_WINDOWS]
+
+    start_time = time.perf_counter()
+
+    df_gold = build_daily_metrics(
+        data,
+        measures,
+        windows=windows,
+        growth_period=int(kwargs.get("growth_period", GROWTH_PERIOD))
+    )
+
+    elapsed: float = time.perf_counter() - start_time
+    logger.info(
+        f"Gold metrics for {measures}, windows {windows}: {len(df_gold)} rows, "
+        f"{df_gold['uid'].nunique()} locations in {elapsed:.2f}s"
+    )
+
+    return df_gold
+
+
+@test
+def test_output(output, *args) -> None:
+    """
+    Template code for testing the output of the block.
+    """
+    assert output is not None, 'The output is undefined'
+    assert len(output) > 0, 'Gold metrics have no rows'
+
+    for col in output.columns:
+        if col.startswith('new_') and col.endswith('_repaired'):
+            assert not (output[col] < 0).any(), f'{col} has negative values'
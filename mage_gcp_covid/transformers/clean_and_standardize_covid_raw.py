@@ -1,65 +1,50 @@
 import pandas as pd
 import gc                   # garbage collection
+import time
 import warnings
 
+from mage_gcp_covid.utils.arrow_handoff import (
+    is_handoff,
+    read_handoff,
+    release_handoff,
+    use_arrow_handoff,
+    write_handoff,
+)
+from mage_gcp_covid.utils.covid_model import build_dim_location, build_fact_daily
+from mage_gcp_covid.utils.covid_stream import STREAM_BLOCK_SIZE, stream_raw_to_parquet
+from mage_gcp_covid.utils.gcs import get_storage_client
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.silver_manifest import (
+    commit_part,
+    get_watermark,
+    read_manifest,
+    select_new_date_cols,
+    silver_manifest_key,
+)
+from mage_gcp_covid.utils.silver_validation import SilverValidator, drop_duplicate_keys, validate_frame
+from mage_gcp_covid.utils.covid_reshape import (
+    DTYPE_PROFILES,
+    META_COLS,
+    SILVER_DATA_TYPES,
+    apply_dtype_profile,
+    estimate_melted_memory_mb,
+    get_date_cols,
+    memory_usage_mb,
+    melt_wide_to_long,
+    standardize_column_names,
+)
+
 if 'transformer' not in globals():
     from mage_ai.data_preparation.decorators import transformer
 if 'test' not in globals():
     from mage_ai.data_preparation.decorators import test
 
-# helper and utility functions
-def contains_chars(string: str, chars_to_check) -> bool:
-    # checks if input string contains any of the chars in 'chars_to_check'
-    return any(char in string for char in chars_to_check)
-
 
-# Main Decorator blocks
-@transformer
-def transform(data, *args, **kwargs):
+def melt_in_chunks(df: pd.DataFrame, meta_cols: list, date_cols: list, chunk_size: int, logger) -> pd.DataFrame:
     """
-    Template code for a transformer block.
-
-    Add more parameters to this function if this block has multiple parent blocks.
-    There should be one parameter for each output variable from each parent block.
-
-    Args:
-        data: The output from the upstream parent block
-        args: The output from any additional upstream blocks (if applicable)
-
-    Returns:
-        Anything (e.g. data frame, dictionary, array, int, str, etc.)
+    Original melt path: unpivot the frame in chunks of `chunk_size` rows.
+    Kept as a reference to compare against the vectorized engine.
     """
-    logger = kwargs["logger"]
-
-    # Specify your transformation logic here
-    df = data
-    logger.info(f"US cases df shape: {df.shape}")
-    logger.info(f"Columns: {df.columns}")
-    # debug
-    # for col in df.columns:
-    #     print(col)
-
-    # define all column groups
-    meta_cols = [
-        "Province_State",
-        "Admin2",
-        "UID",
-        "iso2",
-        "iso3",
-        "code3",
-        "FIPS",
-        "Country_Region",
-        "Lat",
-        "Long_",
-        "Combined_Key"        
-    ]
-
-    date_cols = [col for col in df.columns if contains_chars(col, "/")]
-
-    logger.debug(f"Date Columns: {date_cols}")
-
-    # process dataframe in chunks to optimize memory usage
-    chunk_size: int = 500
     all_chunks: list = []
 
     total_rows: int = len(df)
@@ -86,34 +71,10 @@ def transform(data, *args, **kwargs):
         logger.info(f"Chunk shape (melted): {df_chunk_date_melted.shape}")
 
         # standardize column names
-        df_chunk_date_melted.columns = (df_chunk_date_melted.columns
-            .str.lower()                                        # lowercase
-            .str.replace(' ', '_')                              # spaces to underscore
-            .str.replace('#', 'nr')                             # pound sign signifies 'number'
-            .str.replace(r'[\(\)\{\}\[\]<>]', '', regex=True)   # remove brackets/parentheses
-            .str.replace(r'[^a-z0-9_]', '', regex=True)         # remove any other special chars
-            .str.replace(r'_{2,}', '_', regex=True)             # replace multiple underscores with single
-            .str.strip('_')                                     # remove leading/trailing underscores
-        )
+        df_chunk_date_melted.columns = standardize_column_names(df_chunk_date_melted.columns)
 
         # standardize data types
-
-        # standard columns
-        data_types: dict = {
-            "province_state" :  "string",
-            "admin2" :          "string",
-            "uid" :             "string",
-            "iso2" :            "string",
-            "iso3" :            "string",
-            "code3" :           "string",
-            "fips" :            "string",
-            "country_region" :  "string",
-            "lat" :             "float64",
-            "long" :            "float64",
-            "combined_key" :    "string",
-            "confirmed_cases" : "int64"
-        }
-        df_chunk_date_melted = df_chunk_date_melted.astype(data_types)
+        df_chunk_date_melted = df_chunk_date_melted.astype(SILVER_DATA_TYPES)
 
         # date columns
         df_chunk_date_melted["date"] = pd.to_datetime(
@@ -129,17 +90,162 @@ def transform(data, *args, **kwargs):
         del df_chunk_date_melted
         gc.collect()
 
-    # release original dataframe
-    del df
-    gc.collect()
-
     # combine all chunks
     df_date_melted = pd.concat(all_chunks, ignore_index=True)
     del all_chunks
     gc.collect()
 
-    # basic cleaning
-    df_date_melted = df_date_melted.drop_duplicates()
+    return df_date_melted
+
+
+def stream_to_silver(source_ref: dict, **kwargs) -> dict:
+    """
+    Streaming mode: read the bronze CSV in record batches and append each
+    melted batch to the silver Parquet object as a row group.
+    """
+    logger = kwargs["logger"]
+    silver_object_key = '02_silver_standardize/covid/covid_us.parquet'
+    block_size: int = int(kwargs.get("stream_block_size", STREAM_BLOCK_SIZE))
+
+    bucket = get_storage_client().bucket(source_ref["bucket_name"])
+    source_blob = bucket.blob(source_ref["object_key"])
+    silver_blob = bucket.blob(silver_object_key)
+
+    start_time = time.perf_counter()
+
+    # batches are validated as they are written, not re-read afterwards
+    validator = SilverValidator()
+
+    with source_blob.open("rb") as source, silver_blob.open("wb", ignore_flush=True) as sink:
+        summary: dict = stream_raw_to_parquet(
+            source, sink, block_size=block_size, validator=validator, logger=logger
+        )
+
+    elapsed: float = time.perf_counter() - start_time
+    logger.info(
+        f"Streamed {summary['rows_out']} rows in {summary['batches']} batches to "
+        f"gs://{bucket.name}/{silver_object_key} in {elapsed:.2f}s "
+        f"({summary['rows_out'] / max(elapsed, 1e-9):,.0f} rows/sec)"
+    )
+
+    # the stream rewrote the whole object: its watermark is the last date written
+    last_date = summary["validation"]["last_date"]
+    if last_date is not None:
+        commit_part(
+            bucket, {"parts": []}, silver_object_key, pd.Timestamp(last_date), summary["rows_out"],
+            silver_manifest_key(**kwargs)
+        )
+
+    summary["object_key"] = silver_object_key
+    return summary
+
+
+# Main Decorator blocks
+@transformer
+@instrument
+def transform(data, *args, **kwargs):
+    """
+    Template code for a transformer block.
+
+    Add more parameters to this function if this block has multiple parent blocks.
+    There should be one parameter for each output variable from each parent block.
+
+    Args:
+        data: The output from the upstream parent block
+        args: The output from any additional upstream blocks (if applicable)
+
+    Returns:
+        Anything (e.g. data frame, dictionary, array, int, str, etc.)
+    """
+    logger = kwargs["logger"]
+
+    # streaming mode: upstream passes a reference to the bronze object
+    if kwargs.get("silver_mode") == "stream":
+        return stream_to_silver(data, **kwargs)
+
+    # Specify your transformation logic here
+    # Arrow handoff: upstream returned a reference, map the file it points to
+    df = read_handoff(data)
+    logger.info(f"US cases df shape: {df.shape}")
+    logger.info(f"Columns: {df.columns}")
+    # debug
+    # for col in df.columns:
+    #     print(col)
+
+    # define all column groups
+    meta_cols = META_COLS
+
+    date_cols = get_date_cols(df.columns)
+
+    # incremental mode: only melt the dates after the last committed date
+    if kwargs.get("silver_mode") == "incremental":
+        bucket_name = 'covid-medallion-lake'
+        watermark = get_watermark(read_manifest(get_storage_client().bucket(bucket_name), silver_manifest_key(**kwargs)))
+        date_cols = select_new_date_cols(date_cols, watermark)
+        logger.info(f"Incremental run: {len(date_cols)} new date columns after {watermark}")
+
+    logger.debug(f"Date Columns: {date_cols}")
+
+    # melt engine: 'vectorized' (single pass) or 'chunked' (original path)
+    melt_engine: str = kwargs.get("melt_engine", "vectorized")
+
+    # dtype profile: 'standard' (string/int64/float64) or 'compact'
+    dtype_profile: str = kwargs.get("dtype_profile", "standard")
+    data_types: dict = DTYPE_PROFILES[dtype_profile]
+
+    # silver model: 'wide' (meta columns on every row) or 'star'
+    # (dim_location + narrow fact_covid_daily)
+    silver_model: str = kwargs.get("silver_model", "wide")
+
+    report_memory: bool = dtype_profile != "standard" or silver_model == "star"
+    if report_memory:
+        standard_mb: float = estimate_melted_memory_mb(df, meta_cols, len(date_cols), SILVER_DATA_TYPES)
+
+    # chunk size of the original path; the vectorized engine reuses it as
+    # row block so both engines return rows in the same order
+    chunk_size: int = 500
+
+    start_time = time.perf_counter()
+
+    if silver_model == "star":
+        df_dim_location = build_dim_location(df, data_types, meta_cols)
+        df_date_melted = build_fact_daily(df, date_cols, data_types, row_block=chunk_size)
+    elif melt_engine == "chunked":
+        df_date_melted = melt_in_chunks(df, meta_cols, date_cols, chunk_size, logger)
+        # chunks are concatenated as standard types; categories must be global
+        df_date_melted = apply_dtype_profile(df_date_melted, data_types)
+    else:
+        df_date_melted = melt_wide_to_long(
+            df,
+            id_cols=meta_cols,
+            value_cols=date_cols,
+            var_name="date",
+            value_name="confirmed_cases",
+            data_types=data_types,
+            row_block=chunk_size
+        )
+
+    elapsed: float = time.perf_counter() - start_time
+    logger.info(
+        f"Melt engine '{melt_engine}': {len(df_date_melted)} rows in {elapsed:.2f}s "
+        f"({len(df_date_melted) / max(elapsed, 1e-9):,.0f} rows/sec)"
+    )
+
+    if report_memory:
+        output_mb: float = memory_usage_mb(df_date_melted)
+        if silver_model == "star":
+            output_mb += memory_usage_mb(df_dim_location)
+        logger.info(
+            f"Silver model '{silver_model}', dtype profile '{dtype_profile}': "
+            f"{standard_mb:,.1f} MB (wide, standard) -> {output_mb:,.1f} MB"
+        )
+
+    # release original dataframe
+    del df
+    gc.collect()
+
+    # basic cleaning: one row per (uid, date), hashing only the key columns
+    df_date_melted = drop_duplicate_keys(df_date_melted)
 
     logger.info(f"US cases df_melted shape: {df_date_melted.shape}")
 
@@ -152,7 +258,21 @@ def transform(data, *args, **kwargs):
     #     logger.info(f"Sample negative cases:\n f{df_negative_cases.head(5)}")
 
     gc.collect()
-    return df_date_melted
+
+    # star model: Mage passes both outputs to the exporter
+    if silver_model == "star":
+        logger.info(f"dim_location shape: {df_dim_location.shape}")
+        output = (df_date_melted, df_dim_location)
+    else:
+        output = df_date_melted
+
+    # Arrow handoff: the exporter maps the melted frame; the raw file is
+    # consumed and can go
+    if use_arrow_handoff(**kwargs):
+        release_handoff(data)
+        return write_handoff(output, "clean_and_standardize_covid_raw", **kwargs)
+
+    return output
 
 
 @test
@@ -164,22 +284,49 @@ def test_output(output, *args, **kwargs) -> None:
 
     # Basic data validation
     assert output is not None, 'The output is undefined'
+
+    # Arrow handoff: validate the mapped frames the reference points to
+    if is_handoff(output):
+        frames = read_handoff(output)
+        output, *args = frames if isinstance(frames, tuple) else (frames,)
+
+    # streaming mode returns a summary of the rows written
+    if isinstance(output, dict):
+        assert output["rows_out"] > 0, 'Streamed data has no rows'
+        if "validation" in output:
+            check_validation(output["validation"], logger)
+        return
+
+    # an incremental run with no new dates is a valid no-op
+    if kwargs.get("silver_mode") == "incremental" and len(output) == 0:
+        logger.info('No new dates since the last silver commit')
+        return
+
     assert len(output) > 0, 'Transformed data has no rows'
     
     # Data type validation
     assert pd.api.types.is_datetime64_dtype(output['date']), 'Date column is not datetime type'
     assert pd.api.types.is_numeric_dtype(output['confirmed_cases']), 'Confirmed cases is not numeric'
     
-    # Data quality validation
-    assert output['date'].isna().sum() == 0, 'There are missing dates after transformation'
-    assert output.duplicated().sum() == 0, 'There are duplicate rows in the output'
+    # star model: the second output is the location dimension
+    if args:
+        df_dim_location = args[0]
+        assert df_dim_location['uid'].is_unique, 'dim_location has duplicate uids'
+
+    # Data quality and business validation in one pass over the output
+    check_validation(validate_frame(output), logger)
+
+
+def check_validation(stats: dict, logger) -> None:
+    # assertions on the statistics collected by `SilverValidator`
+    assert stats["null_counts"].get('date', 0) == 0, 'There are missing dates after transformation'
+    assert stats["duplicate_keys"] == 0, 'There are duplicate (uid, date) rows in the output'
     # assert (output['confirmed_cases'] < 0).any() == False, 'There are negative case counts'
-    negative_case_counts = (output['confirmed_cases'] < 0).sum()
+    negative_case_counts = stats["negative_counts"].get('confirmed_cases', 0)
     if negative_case_counts > 0:
        logger.warning(f'There are {negative_case_counts} negative case counts in the output')
-    
+
     # Business validation
-    min_date = output['date'].min()
-    max_date = output['date'].max()
-    assert min_date >= pd.Timestamp('2020-01-01'), 'Data contains dates before expected range'
-    assert max_date <= pd.Timestamp.now(), 'Data contains future dates'
+    assert stats["dates_out_of_range"] == 0, (
+        f'Data contains dates outside 2020-01-01..today ({stats["first_date"]} to {stats["last_date"]})'
+    )
@@ -1,5 +1,8 @@
 import pandas as pd
 
+from mage_gcp_covid.utils.covid_stream import RAW_US_LOCATION_COLS
+from mage_gcp_covid.utils.instrumentation import instrument
+
 if 'transformer' not in globals():
     from mage_ai.data_preparation.decorators import transformer
 if 'test' not in globals():
@@ -7,6 +10,7 @@ if 'test' not in globals():
 
 
 @transformer
+@instrument
 def transform(data, *args, **kwargs):
     """
     Template code for a transformer block.
@@ -25,8 +29,7 @@ def transform(data, *args, **kwargs):
     df = data
 
     # Keep location info and keys
-    location_cols: list = ['Combined_Key', 'Province_State', 'Admin2', 'UID', 'Lat', 'Long_']
-    df_locations = df[location_cols]
+    df_locations = df[RAW_US_LOCATION_COLS]
 
     return df_locations
 
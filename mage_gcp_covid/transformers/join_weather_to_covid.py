@@ -0,0 +1,55 @@
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.openmeteo import DAILY_VARIABLES
+from mage_gcp_covid.utils.weather_join import join_weather
+
+if 'transformer' not in globals():
+    from mage_ai.data_preparation.decorators import transformer
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+
+@transformer
+@instrument
+def transform(data, data_2, *args, **kwargs):
+    """
+    Join the daily weather of each location's grid cell onto the silver
+    COVID rows.
+
+    Args:
+        data: silver COVID rows from `load_covid_silver` (uid, lat, long, date, ...)
+        data_2: daily weather per grid cell from `load_weather_landing`
+
+    Block variables:
+        weather_lags: list of day lags, e.g. [1, 7], adds `<variable>_lag<n>`
+        tolerance_days: use the latest weather up to n days back when a day is missing
+
+    Returns:
+        DataFrame: the COVID rows with cell_id and the weather columns
+    """
+    # set block logger
+    logger = kwargs.get("logger")
+
+    variables: list = [variable for variable in DAILY_VARIABLES if variable in data_2.columns]
+    lags: list = [int(lag) for lag in kwargs.get("weather_lags") or []]
+
+    df_enriched = join_weather(
+        data,
+        data_2,
+        variables,
+        lags=lags,
+        tolerance_days=int(kwargs.get("tolerance_days", 0))
+    )
+
+    matched = df_enriched[variables[0]].notna().mean() if variables else 0.0
+    logger.info(f"Enriched {len(df_enriched)} rows with {len(variables)} variables, lags {lags}: {matched:.1%} matched")
+
+    return df_enriched
+
+
+@test
+def test_output(output, *args) -> None:
+    """
+    Template code for testing the output of the block.
+    """
+    assert output is not None, 'The output is undefined'
+    assert 'cell_id' in output.columns, 'The weather columns were not joined'
@@ -0,0 +1,52 @@
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.sharding import dynamic_output, get_shard_count, split_by_key
+
+if 'transformer' not in globals():
+    from mage_ai.data_preparation.decorators import transformer
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+
+@transformer
+@instrument
+def transform(data, *args, **kwargs):
+    """
+    Split the located grid cells into shards of about the same number of
+    cells.
+
+    Dynamic block: Mage fetches the weather of each shard in its own block
+    run, in parallel up to the pipeline's executor count. The fetches are
+    reduced before the export, since every shard covers the same months
+    and one exporter has to write each month partition.
+
+    Args:
+        data: UID, cell_id and cell center per location from `snap_coordinates_to_grid`
+
+    Returns:
+        list: [shards, metadata], a shard being
+        {"shard": i, "shard_count": n, "locations": [records of `data`]}
+    """
+    # set block logger
+    logger = kwargs.get("logger")
+
+    parts: list = split_by_key(data, "cell_id", get_shard_count(**kwargs))
+    items: list = [
+        {"shard": i, "shard_count": len(parts), "locations": df_part.to_dict("records")}
+        for i, df_part in enumerate(parts)
+    ]
+    logger.info(
+        f"{data['cell_id'].nunique()} grid cells in {len(items)} shards of "
+        f"{[df_part['cell_id'].nunique() for df_part in parts]} cells"
+    )
+
+    return dynamic_output(items, "cells")
+
+
+@test
+def test_output(output, *args) -> None:
+    """
+    Template code for testing the output of the block.
+    """
+    assert output is not None, 'The output is undefined'
+    items, metadata = output
+    assert len(items) == len(metadata), 'Every shard needs its metadata'
@@ -0,0 +1,43 @@
+from mage_gcp_covid.utils.instrumentation import instrument
+from mage_gcp_covid.utils.weather_grid import GRID_RESOLUTION, build_cell_index
+
+if 'transformer' not in globals():
+    from mage_ai.data_preparation.decorators import transformer
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+
+@transformer
+@instrument
+def transform(data, *args, **kwargs):
+    """
+    Snap every location's centroid to the weather grid.
+
+    Args:
+        data: location columns from `extract_coordinates` (UID, Lat, Long_, ...)
+
+    Returns:
+        DataFrame: UID, cell_id and the cell center coordinates; locations
+        with invalid coordinates are dropped
+    """
+    # set block logger
+    logger = kwargs.get("logger")
+
+    resolution: float = float(kwargs.get("grid_resolution", GRID_RESOLUTION))
+    df_cell_index = build_cell_index(data, resolution=resolution)
+
+    logger.info(
+        f"{len(data)} locations -> {len(df_cell_index)} valid -> "
+        f"{df_cell_index['cell_id'].nunique()} grid cells ({resolution}°)"
+    )
+
+    return df_cell_index
+
+
+@test
+def test_output(output, *args) -> None:
+    """
+    Template code for testing the output of the block.
+    """
+    assert output is not None, 'The output is undefined'
+    assert output['cell_id'].notna().all(), 'There are locations without a grid cell'
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import uuid
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+from pandas import DataFrame
+
+
+# local directory the Arrow IPC block outputs are written to;
+# ARROW_HANDOFF_DIR overrides the location
+ARROW_HANDOFF_ENV: str = "ARROW_HANDOFF_DIR"
+DEFAULT_ARROW_HANDOFF_DIR: str = str(Path(tempfile.gettempdir()) / "mage_arrow_handoff")
+
+# key marking a block output as a reference to Arrow IPC files
+HANDOFF_KEY: str = "arrow_handoff"
+
+
+def use_arrow_handoff(**kwargs) -> bool:
+    # pipeline variable `handoff`: 'mage' (default, Mage variable store) or 'arrow'
+    return kwargs.get("handoff", "mage") == "arrow"
+
+
+def handoff_directory(**kwargs) -> Path:
+    root = Path(os.environ.get(ARROW_HANDOFF_ENV) or DEFAULT_ARROW_HANDOFF_DIR)
+    return root / str(kwargs.get("pipeline_uuid") or "default")
+
+
+def is_handoff(output) -> bool:
+    return isinstance(output, dict) and HANDOFF_KEY in output
+
+
+def write_handoff(output, name: str, **kwargs) -> dict:
+    """
+    Write a block output (a frame or a tuple of frames) as uncompressed
+    Arrow IPC files, so the downstream block can memory-map it instead of
+    Mage serializing and re-reading it. Each file is written under a
+    temporary name and renamed once complete.
+
+    Returns:
+        dict: the reference Mage stores in place of the output
+        (`arrow_handoff`: one path per frame, `rows_out`: total rows)
+    """
+    frames: tuple = output if isinstance(output, tuple) else (output,)
+    directory = handoff_directory(**kwargs)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    paths: list = []
+    for i, df in enumerate(frames):
+        path = directory / f"{name}-{uuid.uuid4().hex[:12]}-{i}.arrow"
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(f"{path}.tmp", "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(f"{path}.tmp", path)
+        paths.append(str(path))
+
+    return {
+        HANDOFF_KEY: paths,
+        "tuple": isinstance(output, tuple),
+        "rows_out": sum(len(df) for df in frames),
+    }
+
+
+def map_frame(path: str) -> DataFrame:
+    """
+    Map one Arrow IPC file as a frame without copying its buffers: numeric
+    and datetime columns are read-only views of the mapped pages, string
+    columns stay Arrow-backed. `split_blocks` keeps pandas from
+    consolidating (and so copying) columns of the same dtype.
+    """
+    if not Path(path).is_file():
+        raise FileNotFoundError(f"Arrow handoff file {path} no longer exists, re-run the upstream block")
+    table = ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def read_handoff(output):
+    """
+    Resolve an upstream output: a handoff reference is mapped back to its
+    frame (or tuple of frames), anything else is returned as is
+    """
+    if not is_handoff(output):
+        return output
+    frames: list = [map_frame(path) for path in output[HANDOFF_KEY]]
+    return tuple(frames) if output["tuple"] else frames[0]
+
+
+def release_handoff(output) -> None:
+    # delete the files of consumed references (one or a list of reduced
+    # outputs); frames already mapped from them stay valid
+    for reference in output if isinstance(output, list) else [output]:
+        if is_handoff(reference):
+            for path in reference[HANDOFF_KEY]:
+                Path(path).unlink(missing_ok=True)
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from mage_gcp_covid.utils.covid_reshape import (
+    META_COLS,
+    cast_column,
+    melt_wide_to_long,
+    standardize_column_names,
+)
+
+
+# star layout of the silver COVID data
+SILVER_DIM_LOCATION_KEY: str = '02_silver_standardize/covid/dim_location.parquet'
+SILVER_FACT_DATASET: str = '02_silver_standardize/covid/fact_covid_daily/'
+SILVER_FACT_PARTITION_COLS: list = ["year_month"]
+
+LOCATION_KEY: str = "uid"
+
+
+def build_dim_location(df: DataFrame, data_types: dict, meta_cols: list = META_COLS) -> DataFrame:
+    """
+    One row per location (UID) with the standardized meta columns of a wide
+    JHU frame
+    """
+    names = standardize_column_names(meta_cols)
+    df_dim = DataFrame({
+        name: cast_column(df[src_col], data_types[name]) if name in data_types else df[src_col]
+        for src_col, name in zip(meta_cols, names)
+    })
+    df_dim = df_dim.drop_duplicates(subset=[LOCATION_KEY]).reset_index(drop=True)
+
+    # the dimension is small; keep the join key as plain strings
+    df_dim[LOCATION_KEY] = df_dim[LOCATION_KEY].astype("string")
+    return df_dim
+
+
+def build_fact_daily(
+        df: DataFrame,
+        date_cols: list,
+        data_types: dict,
+        value_name: str = "confirmed_cases",
+        row_block: int = None
+    ) -> DataFrame:
+    """
+    Narrow daily fact `(uid, date, <value_name>)` melted straight from the
+    wide frame; the location attributes live in the dimension
+    """
+    return melt_wide_to_long(
+        df,
+        id_cols=["UID"],
+        value_cols=date_cols,
+        var_name="date",
+        value_name=value_name,
+        data_types=data_types,
+        row_block=row_block
+    )
+
+
+def join_location(fact: DataFrame, dim: DataFrame, columns: list = None) -> DataFrame:
+    """
+    Attach location attributes to fact rows.
+
+    The dimension is indexed once by uid and every fact row is resolved with
+    a single positional lookup, so no hash-merge of the (large) fact frame
+    is built. Fact rows without a matching location get missing values.
+    """
+    columns = [col for col in (columns or dim.columns) if col != LOCATION_KEY]
+
+    dim_index = pd.Index(dim[LOCATION_KEY].astype("string"))
+    keys = fact[LOCATION_KEY]
+
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        # resolve each category once; code -1 (missing) picks the trailing -1
+        lookup = dim_index.get_indexer(keys.cat.categories.astype("string"))
+        positions = np.append(lookup, -1)[keys.cat.codes.to_numpy()]
+    else:
+        positions = dim_index.get_indexer(keys.astype("string"))
+    missing = positions < 0
+
+    df_joined = fact.copy()
+    for col in columns:
+        values = dim[col].take(positions.clip(min=0)).reset_index(drop=True)
+        if missing.any():
+            values = values.mask(missing)
+        df_joined[col] = values.set_axis(fact.index)
+
+    return df_joined
@@ -0,0 +1,222 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+# column layout of the JHU RAW_us_* files
+META_COLS: list = [
+    "Province_State",
+    "Admin2",
+    "UID",
+    "iso2",
+    "iso3",
+    "code3",
+    "FIPS",
+    "Country_Region",
+    "Lat",
+    "Long_",
+    "Combined_Key"
+]
+
+# standard silver columns
+SILVER_DATA_TYPES: dict = {
+    "province_state" :  "string",
+    "admin2" :          "string",
+    "uid" :             "string",
+    "iso2" :            "string",
+    "iso3" :            "string",
+    "code3" :           "string",
+    "fips" :            "string",
+    "country_region" :  "string",
+    "lat" :             "float64",
+    "long" :            "float64",
+    "combined_key" :    "string",
+    "confirmed_cases" : "int64"
+}
+
+# compact silver columns: the string columns repeat the same few thousand
+# values on every date row, so they are dictionary encoded; counts get one
+# fixed width, int32 (cumulative counts stay far below 2**31), so every
+# shard, batch and file has the same schema; float32 keeps coordinates to ~1 m
+COMPACT_DATA_TYPES: dict = {
+    "province_state" :  "category",
+    "admin2" :          "category",
+    "uid" :             "category",
+    "iso2" :            "category",
+    "iso3" :            "category",
+    "code3" :           "category",
+    "fips" :            "category",
+    "country_region" :  "category",
+    "lat" :             "float32",
+    "long" :            "float32",
+    "combined_key" :    "category",
+    "confirmed_cases" : "int32"
+}
+
+DTYPE_PROFILES: dict = {
+    "standard": SILVER_DATA_TYPES,
+    "compact": COMPACT_DATA_TYPES,
+}
+
+DATE_HEADER_FORMAT: str = "%m/%d/%y"
+
+
+def contains_chars(string: str, chars_to_check) -> bool:
+    # checks if input string contains any of the chars in 'chars_to_check'
+    return any(char in string for char in chars_to_check)
+
+
+def get_date_cols(columns) -> list:
+    # date columns are the only headers containing a slash (e.g. 1/22/20)
+    return [col for col in columns if contains_chars(col, "/")]
+
+
+def standardize_column_names(columns) -> pd.Index:
+    """
+    Lowercase the column names and strip special characters so they are
+    safe to use as silver column names.
+    """
+    return (pd.Index(columns)
+        .str.lower()                                        # lowercase
+        .str.replace(' ', '_')                              # spaces to underscore
+        .str.replace('#', 'nr')                             # pound sign signifies 'number'
+        .str.replace(r'[\(\)\{\}\[\]<>]', '', regex=True)   # remove brackets/parentheses
+        .str.replace(r'[^a-z0-9_]', '', regex=True)         # remove any other special chars
+        .str.replace(r'_{2,}', '_', regex=True)             # replace multiple underscores with single
+        .str.strip('_')                                     # remove leading/trailing underscores
+    )
+
+
+def fits_int_dtype(values, dtype) -> bool:
+    """
+    True when every value in `values` is within the range of integer `dtype`
+    """
+    # size, not len: a block with no date columns is (n_rows, 0)
+    if np.size(values) == 0 or np.can_cast(values.dtype, dtype):
+        return True
+
+    info = np.iinfo(dtype)
+    return bool(info.min <= np.nanmin(values) and np.nanmax(values) <= info.max)
+
+
+def cast_values(values: np.ndarray, dtype) -> np.ndarray:
+    # counts outside a narrow profile width must fail, not wrap around
+    dtype = pd.api.types.pandas_dtype(dtype)
+    if isinstance(dtype, np.dtype) and dtype.kind == "i" and not fits_int_dtype(values, dtype):
+        raise ValueError(f"Values out of the {dtype} range of the dtype profile")
+    return values.astype(dtype)
+
+
+def cast_column(col: pd.Series, dtype) -> pd.Series:
+    # categories are built over the standard string values, so a compact
+    # 'uid' holds the same labels as a standard one
+    if dtype == "category":
+        return col.astype("string").astype("category")
+    return col.astype(dtype)
+
+
+def apply_dtype_profile(df: DataFrame, data_types: dict) -> DataFrame:
+    """
+    Cast an already-melted silver frame to a dtype profile
+    """
+    data_types = {col: dtype for col, dtype in data_types.items() if col in df.columns}
+    for col, dtype in data_types.items():
+        df[col] = cast_column(df[col], dtype)
+    return df
+
+
+def memory_usage_mb(df: DataFrame) -> float:
+    # deep memory usage, including the string payloads
+    return df.memory_usage(deep=True, index=False).sum() / 2**20
+
+
+def estimate_melted_memory_mb(df: DataFrame, id_cols: list, n_dates: int, data_types: dict) -> float:
+    """
+    Estimate the size of the melted frame under `data_types` from the wide
+    frame, without materializing it: every id value is repeated once per
+    date, plus one date and one count per row.
+    """
+    id_names = standardize_column_names(id_cols)
+    total_bytes: int = 0
+    for src_col, name in zip(id_cols, id_names):
+        col = df[src_col]
+        if name in data_types:
+            col = cast_column(col, data_types[name])
+        total_bytes += col.memory_usage(deep=True, index=False) * n_dates
+
+    total_bytes += 2 * 8 * len(df) * n_dates
+    return total_bytes / 2**20
+
+
+def parse_date_headers(date_cols: list, date_format: str = DATE_HEADER_FORMAT) -> pd.Series:
+    # parse each date header once instead of once per melted row
+    return pd.to_datetime(pd.Series(date_cols, dtype="object"), format=date_format, errors="coerce")
+
+
+def melt_indexer(n_rows: int, n_cols: int, row_block: int = None) -> tuple:
+    """
+    Build the (row, column) positions of every cell of a wide block in
+    `pd.melt` order: column-major within each block of `row_block` rows.
+    Without a block size the whole frame is a single block.
+    """
+    if not row_block or row_block >= n_rows:
+        row_idx = np.tile(np.arange(n_rows), n_cols)
+        col_idx = np.repeat(np.arange(n_cols), n_rows)
+        return row_idx, col_idx
+
+    row_parts: list = []
+    col_parts: list = []
+    for start in range(0, n_rows, row_block):
+        end: int = min(start + row_block, n_rows)
+        row_parts.append(np.tile(np.arange(start, end), n_cols))
+        col_parts.append(np.repeat(np.arange(n_cols), end - start))
+
+    return np.concatenate(row_parts), np.concatenate(col_parts)
+
+
+def melt_wide_to_long(
+        df: DataFrame,
+        id_cols: list,
+        value_cols: list,
+        var_name: str = "date",
+        value_name: str = "confirmed_cases",
+        data_types: dict = None,
+        date_format: str = DATE_HEADER_FORMAT,
+        row_block: int = None
+    ) -> DataFrame:
+    """
+    Unpivot the date columns of a wide JHU frame into the standardized long
+    silver layout in a single pass.
+
+    Column names are standardized and `data_types` are applied on the wide
+    frame (one value per source row), the date headers are parsed once, and
+    the long frame is gathered straight from the numeric block with
+    repeat/tile indexes. The output matches `pd.melt` followed by the same
+    renaming, casting and date parsing; pass `row_block` to reproduce the row
+    order of a melt done in chunks of that many rows.
+    """
+    data_types = data_types or {}
+
+    n_rows: int = len(df)
+    n_cols: int = len(value_cols)
+    row_idx, col_idx = melt_indexer(n_rows, n_cols, row_block)
+
+    out_names = standardize_column_names(list(id_cols) + [var_name, value_name])
+    id_names, (date_name, cases_name) = out_names[:-2], out_names[-2:]
+
+    columns: dict = {}
+    for src_col, name in zip(id_cols, id_names):
+        col = df[src_col]
+        if name in data_types:
+            col = cast_column(col, data_types[name])
+        columns[name] = col.take(row_idx).reset_index(drop=True)
+
+    dates = parse_date_headers(value_cols, date_format)
+    columns[date_name] = dates.take(col_idx).reset_index(drop=True)
+
+    values = df[value_cols].to_numpy()
+    if cases_name in data_types:
+        values = cast_values(values, data_types[cases_name])
+    columns[cases_name] = values[row_idx, col_idx]
+
+    return DataFrame(columns)
@@ -0,0 +1,216 @@
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from mage_gcp_covid.utils.covid_reshape import (
+    META_COLS,
+    SILVER_DATA_TYPES,
+    cast_column,
+    get_date_cols,
+    melt_indexer,
+    parse_date_headers,
+    standardize_column_names,
+)
+from mage_gcp_covid.utils.silver_validation import key_codes
+
+
+BRONZE_COVID_PREFIX: str = '01_bronze_landing/covid/'
+
+# the four RAW files landed by `upload_to_gcs`
+RAW_DATASETS: dict = {
+    "us_confirmed": {
+        "object_key": BRONZE_COVID_PREFIX + "RAW_us_confirmed_cases.csv",
+        "scope": "us",
+        "measure": "confirmed_cases",
+    },
+    "us_deaths": {
+        "object_key": BRONZE_COVID_PREFIX + "RAW_us_deaths.csv",
+        "scope": "us",
+        "measure": "deaths",
+    },
+    "global_confirmed": {
+        "object_key": BRONZE_COVID_PREFIX + "RAW_global_confirmed_cases.csv",
+        "scope": "global",
+        "measure": "confirmed_cases",
+    },
+    "global_deaths": {
+        "object_key": BRONZE_COVID_PREFIX + "RAW_global_deaths.csv",
+        "scope": "global",
+        "measure": "deaths",
+    },
+}
+
+# global headers mapped onto the US meta columns
+GLOBAL_COLUMN_MAP: dict = {
+    "Province/State": "Province_State",
+    "Country/Region": "Country_Region",
+    "Long": "Long_",
+}
+
+MEASURES: list = ["confirmed_cases", "deaths"]
+
+# columns the measure files of a scope are aligned on: US rows carry a UID,
+# global rows are identified by province and country
+SCOPE_KEY_COLS: dict = {
+    "us": ["UID"],
+    "global": ["Province_State", "Country_Region"],
+}
+
+# location columns of the unified fact (standardized names)
+LOCATION_COLS: list = [
+    "scope",
+    "province_state",
+    "admin2",
+    "uid",
+    "iso2",
+    "iso3",
+    "code3",
+    "fips",
+    "country_region",
+    "lat",
+    "long",
+    "combined_key",
+]
+
+
+def harmonize_raw_columns(df: DataFrame, scope: str) -> DataFrame:
+    """
+    Map a RAW global/US wide frame onto the US meta column layout.
+
+    Global files only carry province, country and coordinates: the other meta
+    columns are added empty and `Combined_Key` is built the JHU way
+    ('Province, Country' or just 'Country'). Extra US columns such as
+    `Population` in the deaths file are dropped.
+    """
+    df = df.rename(columns=GLOBAL_COLUMN_MAP)
+
+    if scope == "global":
+        province = df["Province_State"].astype("string")
+        country = df["Country_Region"].astype("string")
+        df["Combined_Key"] = (province + ", " + country).fillna(country)
+        for col in META_COLS:
+            if col not in df.columns:
+                df[col] = pd.NA
+
+    date_cols: list = get_date_cols(df.columns)
+    return df[META_COLS + date_cols]
+
+
+def load_raw_dataset(name: str, bucket_name: str, config_profile: str = "dev") -> DataFrame:
+    """
+    Pool worker: download one RAW file from the landing zone and harmonize
+    it to the US meta layout.
+
+    Each worker opens its own storage client, so only the harmonized wide
+    frame is sent back: one row per location, a fraction of the size of
+    the melted frame.
+    """
+    from mage_gcp_covid.utils.gcs import get_storage_client
+
+    dataset: dict = RAW_DATASETS[name]
+    blob = get_storage_client(config_profile).bucket(bucket_name).blob(dataset["object_key"])
+    df = pd.read_csv(BytesIO(blob.download_as_bytes()))
+
+    return harmonize_raw_columns(df, dataset["scope"])
+
+
+def align_measures(frames: dict, key_cols: list) -> tuple:
+    """
+    Align the wide frames of one scope's measures on the location key.
+
+    The locations are the union of the files' keys (meta columns taken
+    from the first file listing a location), the dates the union of their
+    date headers in date order.
+
+    Returns:
+        tuple: (location meta frame, date headers, {measure: float
+        array of locations x dates, NaN where a file has no value})
+    """
+    keys = pd.concat([df[key_cols] for df in frames.values()], ignore_index=True)
+    location_ids = pd.factorize(key_codes(keys, key_cols))[0]
+    _, first_row = np.unique(location_ids, return_index=True)
+    df_meta = pd.concat([df[META_COLS] for df in frames.values()], ignore_index=True).take(first_row)
+
+    all_dates: list = list(dict.fromkeys(col for df in frames.values() for col in get_date_cols(df.columns)))
+    date_cols: list = [all_dates[i] for i in np.argsort(parse_date_headers(all_dates).to_numpy(), kind="stable")]
+    date_index = pd.Index(date_cols)
+
+    grids: dict = {}
+    offset: int = 0
+    for measure, df in frames.items():
+        rows = location_ids[offset:offset + len(df)]
+        df_date_cols: list = get_date_cols(df.columns)
+        grid = np.full((len(df_meta), len(date_cols)), np.nan)
+        grid[np.ix_(rows, date_index.get_indexer(df_date_cols))] = df[df_date_cols].to_numpy(dtype="float64")
+        grids[measure] = grid
+        offset += len(df)
+
+    return df_meta.reset_index(drop=True), date_cols, grids
+
+
+def melt_measures(df_meta: DataFrame, date_cols: list, grids: dict, scope: str) -> DataFrame:
+    """
+    Melt the aligned measures of one scope in a single pass: the location
+    and date columns are gathered once, every measure in the same cell
+    order. Missing values become nulls (nullable Int64).
+    """
+    row_idx, col_idx = melt_indexer(len(df_meta), len(date_cols))
+
+    columns: dict = {"scope": pd.array(np.full(len(row_idx), scope, dtype=object), dtype="string")}
+    for src_col, name in zip(META_COLS, standardize_column_names(META_COLS)):
+        col = df_meta[src_col]
+        if name in SILVER_DATA_TYPES:
+            col = cast_column(col, SILVER_DATA_TYPES[name])
+        columns[name] = col.take(row_idx).reset_index(drop=True)
+
+    columns["date"] = parse_date_headers(date_cols).take(col_idx).reset_index(drop=True)
+
+    for measure in MEASURES:
+        values = grids[measure][row_idx, col_idx] if measure in grids else np.full(len(row_idx), np.nan)
+        columns[measure] = pd.array(values, dtype="Int64")
+
+    return DataFrame(columns)[LOCATION_COLS + ["date"] + MEASURES]
+
+
+def process_all_raw_datasets(
+        bucket_name: str,
+        names: list = None,
+        config_profile: str = "dev",
+        max_workers: int = None,
+        logger: Any = None
+    ) -> DataFrame:
+    """
+    Load the RAW datasets in parallel (one process per file) and merge them
+    into a single confirmed/deaths fact: the measures of each scope are
+    aligned on the location key in wide form and melted once.
+    """
+    names = names or list(RAW_DATASETS)
+    max_workers = max_workers or len(names)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures: dict = {
+            name: executor.submit(load_raw_dataset, name, bucket_name, config_profile)
+            for name in names
+        }
+        # {scope: {measure: wide frame}}
+        by_scope: dict = {}
+        for name, future in futures.items():
+            dataset: dict = RAW_DATASETS[name]
+            df = future.result()
+            by_scope.setdefault(dataset["scope"], {})[dataset["measure"]] = df
+            if logger:
+                logger.info(f"Loaded {name}: {df.shape}")
+
+    facts: list = []
+    for scope, frames in by_scope.items():
+        df_meta, date_cols, grids = align_measures(frames, SCOPE_KEY_COLS[scope])
+        facts.append(melt_measures(df_meta, date_cols, grids, scope))
+        del grids
+        if logger:
+            logger.info(f"Aligned {scope}: {len(df_meta)} locations x {len(date_cols)} dates")
+
+    return pd.concat(facts, ignore_index=True)
@@ -0,0 +1,111 @@
+from typing import Any, BinaryIO
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from mage_gcp_covid.utils.covid_reshape import (
+    META_COLS,
+    SILVER_DATA_TYPES,
+    get_date_cols,
+    melt_wide_to_long,
+)
+
+
+# CSV column types matching what pandas infers for the RAW_us_* meta columns,
+# so the streamed silver output is typed exactly like the batch output.
+# Date columns are left to inference (int64 counts).
+RAW_US_CSV_TYPES: dict = {
+    "UID":              pa.int64(),
+    "iso2":             pa.string(),
+    "iso3":             pa.string(),
+    "code3":            pa.int64(),
+    "FIPS":             pa.float64(),
+    "Admin2":           pa.string(),
+    "Province_State":   pa.string(),
+    "Country_Region":   pa.string(),
+    "Lat":              pa.float64(),
+    "Long_":            pa.float64(),
+    "Combined_Key":     pa.string(),
+}
+
+# location columns of RAW_us_* used by the weather pipeline
+RAW_US_LOCATION_COLS: list = ["Combined_Key", "Province_State", "Admin2", "UID", "Lat", "Long_"]
+
+# bytes of CSV text per record batch; each batch holds complete rows
+STREAM_BLOCK_SIZE: int = 4 << 20
+
+
+def stream_raw_to_parquet(
+        source: BinaryIO,
+        sink: BinaryIO,
+        block_size: int = STREAM_BLOCK_SIZE,
+        validator: Any = None,
+        logger: Any = None
+    ) -> dict:
+    """
+    Stream a wide RAW_us_* CSV into the long silver layout.
+
+    The CSV is read in record batches; each batch is melted and typed with
+    the vectorized engine and appended to the Parquet sink as a row group, so
+    peak memory depends on `block_size`, not on the number of days. A
+    `SilverValidator` passed as `validator` is updated with every batch.
+    """
+    reader = pa_csv.open_csv(
+        source,
+        read_options=pa_csv.ReadOptions(block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=RAW_US_CSV_TYPES,
+            strings_can_be_null=True
+        )
+    )
+
+    date_cols: list = get_date_cols(reader.schema.names)
+
+    writer = None
+    n_batches: int = 0
+    n_rows_in: int = 0
+    n_rows_out: int = 0
+
+    try:
+        for batch in reader:
+            df_batch = batch.to_pandas()
+
+            df_long = melt_wide_to_long(
+                df_batch,
+                id_cols=META_COLS,
+                value_cols=date_cols,
+                data_types=SILVER_DATA_TYPES
+            )
+            if validator is not None:
+                validator.update(df_long)
+            table = pa.Table.from_pandas(df_long, preserve_index=False)
+
+            if writer is None:
+                writer = pq.ParquetWriter(sink, table.schema)
+            elif not table.schema.equals(writer.schema, check_metadata=False):
+                table = table.cast(writer.schema)
+
+            writer.write_table(table)
+
+            n_batches += 1
+            n_rows_in += batch.num_rows
+            n_rows_out += table.num_rows
+
+            if logger:
+                logger.info(f"Streamed batch {n_batches}: {batch.num_rows} rows -> {table.num_rows} rows")
+
+            del df_batch, df_long, table
+    finally:
+        if writer is not None:
+            writer.close()
+
+    summary: dict = {
+        "batches": n_batches,
+        "rows_in": n_rows_in,
+        "rows_out": n_rows_out,
+        "date_cols": len(date_cols),
+    }
+    if validator is not None:
+        summary["validation"] = validator.summary()
+    return summary
@@ -0,0 +1,229 @@
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud.storage import Bucket, Client
+from google.oauth2 import service_account
+from io import BytesIO, StringIO
+from os import environ, getpid, path
+from requests.adapters import HTTPAdapter
+from typing import BinaryIO, Callable, Union
+import csv
+import threading
+
+import pandas as pd
+import pyarrow.csv as pa_csv
+from pandas import DataFrame
+import yaml
+
+from mage_gcp_covid.utils.local_gcs import LOCAL_GCS_ROOT_ENV, LocalClient
+from mage_gcp_covid.utils.profiling import add_gcs_bytes
+
+
+GCS_SCOPES: list = ['https://www.googleapis.com/auth/devstorage.full_control']
+
+# connections kept alive per client; matches the widest thread pool using it
+HTTP_POOL_SIZE: int = 32
+
+# bytes of CSV text parsed per Arrow block; blocks are parsed on all cores
+CSV_BLOCK_SIZE: int = 16 << 20
+
+# process-wide clients keyed by (pid, profile), created on first use
+_clients: dict = {}
+_clients_lock = threading.Lock()
+
+
+def get_gcp_sa_key_config(yaml_path: str, config_profile: str = "default") -> dict:
+    """
+    Get the service account settings (key file path or inline key) of a
+    profile from the config yaml file
+    """
+    with open(yaml_path, 'r') as file:
+        try:
+            # Load the YAML contents
+            yaml_data = yaml.safe_load(file)
+        except yaml.YAMLError as e:
+            print(f"Error reading YAML file: {e}")
+            raise
+
+    try:
+        yaml_profile = yaml_data[config_profile]
+    except KeyError:
+        print(f"Profile {config_profile} not found...")
+        raise
+
+    sa_config: dict = {
+        key: yaml_profile[key]
+        for key in ["GOOGLE_SERVICE_ACC_KEY_FILEPATH", "GOOGLE_SERVICE_ACC_KEY"]
+        if yaml_profile.get(key)
+    }
+    if not sa_config:
+        raise KeyError(f"No relevant Service Account found in profile {config_profile}.")
+    return sa_config
+
+
+def load_credentials(config_profile: str = "dev") -> service_account.Credentials:
+    """
+    Service account credentials with GCS scope for an io_config.yaml profile
+    """
+    # imported here so the lake helpers also run outside a Mage project (local stand-in)
+    from mage_ai.settings.repo import get_repo_path
+
+    config_path = path.join(get_repo_path(), 'io_config.yaml')
+    sa_config: dict = get_gcp_sa_key_config(config_path, config_profile)
+
+    if "GOOGLE_SERVICE_ACC_KEY_FILEPATH" in sa_config:
+        return service_account.Credentials.from_service_account_file(
+            sa_config["GOOGLE_SERVICE_ACC_KEY_FILEPATH"],
+            scopes=GCS_SCOPES
+        )
+    return service_account.Credentials.from_service_account_info(
+        sa_config["GOOGLE_SERVICE_ACC_KEY"],
+        scopes=GCS_SCOPES
+    )
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """
+    Pooled adapter that adds request and response body sizes to the
+    process-wide GCS byte counters (see `utils.profiling`)
+    """
+
+    def send(self, request, **kwargs):
+        body = request.body
+        sent: int = len(body) if isinstance(body, (bytes, str)) else 0
+        response = super().send(request, **kwargs)
+        add_gcs_bytes(sent=sent, received=int(response.headers.get("Content-Length") or 0))
+        return response
+
+
+def build_storage_client(config_profile: str = "dev", pool_size: int = HTTP_POOL_SIZE) -> Client:
+    """
+    New client over one authorized session with a pooled HTTP adapter, so
+    threads share keep-alive connections and the OAuth token
+    """
+    credentials = load_credentials(config_profile)
+
+    session = AuthorizedSession(credentials)
+    adapter = CountingHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    project = environ.get("GCP_PROJECT_NAME") or credentials.project_id
+    return Client(project=project, credentials=credentials, _http=session)
+
+
+def get_storage_client(config_profile: str = "dev") -> Client:
+    """
+    Get the shared `google.cloud.storage.Client` for an io_config.yaml profile.
+
+    Credentials are loaded on first use, not at import. The client is
+    reused by every block running in this process; forked worker processes
+    build their own, since HTTP connections cannot be shared across a fork.
+
+    With GCS_LOCAL_ROOT set, a filesystem stand-in rooted there is returned
+    instead (benchmarks, offline runs).
+    """
+    key: tuple = (getpid(), config_profile)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                local_root = environ.get(LOCAL_GCS_ROOT_ENV)
+                if local_root:
+                    client = _clients[key] = LocalClient(local_root)
+                else:
+                    client = _clients[key] = build_storage_client(config_profile)
+    return client
+
+
+def get_bucket(bucket_name: str, config_profile: str = "dev") -> Bucket:
+    return get_storage_client(config_profile).bucket(bucket_name)
+
+
+def clear_storage_clients() -> None:
+    # drop all cached clients, e.g. after rotating a service account key
+    with _clients_lock:
+        _clients.clear()
+
+
+def load_csv(bucket_name: str, object_key: str, config_profile: str = "dev", **kwargs) -> DataFrame:
+    """
+    Read a CSV object into a DataFrame; kwargs are passed to `pd.read_csv`
+    """
+    blob = get_bucket(bucket_name, config_profile).blob(object_key)
+    return pd.read_csv(BytesIO(blob.download_as_bytes()), **kwargs)
+
+
+def read_csv_arrow(
+        source: BinaryIO,
+        columns: list = None,
+        column_types: dict = None,
+        block_size: int = CSV_BLOCK_SIZE,
+        dtype_backend: str = "pyarrow"
+    ) -> DataFrame:
+    """
+    Parse a CSV stream with the multithreaded Arrow reader.
+
+    Only `columns` are converted (all when None; an empty selection reads
+    nothing and gives an empty frame). With the 'pyarrow' backend the frame
+    wraps the Arrow columns (`pd.ArrowDtype`) without a copy;
+    'numpy_nullable'/'numpy' convert to the usual pandas dtypes.
+    """
+    # Arrow reads every column when include_columns is empty
+    if columns is not None and len(columns) == 0:
+        return DataFrame()
+
+    table = pa_csv.read_csv(
+        source,
+        read_options=pa_csv.ReadOptions(use_threads=True, block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=columns if columns is not None else [],
+            column_types=column_types or {},
+            strings_can_be_null=True
+        )
+    )
+    if dtype_backend == "pyarrow":
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    if dtype_backend == "numpy_nullable":
+        return table.to_pandas().convert_dtypes()
+    return table.to_pandas()
+
+
+def read_csv_header(bucket_name: str, object_key: str, config_profile: str = "dev", max_bytes: int = 1 << 20) -> list:
+    # column names from the first line, fetched with a ranged download
+    head: bytes = get_bucket(bucket_name, config_profile).blob(object_key).download_as_bytes(start=0, end=max_bytes - 1)
+    return next(csv.reader(StringIO(head.split(b"\n", 1)[0].decode("utf-8-sig"))))
+
+
+def load_csv_arrow(
+        bucket_name: str,
+        object_key: str,
+        config_profile: str = "dev",
+        columns: Union[list, Callable] = None,
+        column_types: dict = None,
+        dtype_backend: str = "pyarrow"
+    ) -> DataFrame:
+    """
+    Stream a CSV object into `read_csv_arrow`.
+
+    `columns` is a list of names or a predicate on the name (like pandas
+    `usecols`); a predicate is resolved against the header first, so
+    unselected columns are never converted.
+    """
+    if callable(columns):
+        columns = [col for col in read_csv_header(bucket_name, object_key, config_profile) if columns(col)]
+
+    blob = get_bucket(bucket_name, config_profile).blob(object_key)
+    with blob.open("rb") as source:
+        return read_csv_arrow(source, columns=columns, column_types=column_types, dtype_backend=dtype_backend)
+
+
+def export_parquet(df: DataFrame, bucket_name: str, object_key: str, config_profile: str = "dev") -> None:
+    """
+    Write a DataFrame to one Parquet object
+    """
+    buffer = BytesIO()
+    df.to_parquet(buffer, index=False)
+    buffer.seek(0)
+    get_bucket(bucket_name, config_profile).blob(object_key).upload_from_file(
+        buffer, content_type="application/octet-stream"
+    )
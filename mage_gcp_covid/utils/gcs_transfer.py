@@ -0,0 +1,152 @@
+import base64
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO
+
+import google_crc32c
+from google.cloud.storage import Bucket
+
+
+# sources at least this large are uploaded in larger resumable chunks
+LARGE_UPLOAD_THRESHOLD: int = 64 << 20
+UPLOAD_CHUNK_SIZE: int = 8 << 20
+LARGE_UPLOAD_CHUNK_SIZE: int = 32 << 20
+
+MAX_THREAD_WORKERS: int = 16
+HASH_BLOCK_SIZE: int = 8 << 20
+
+# blob metadata field holding the checksum of the source an object was
+# uploaded from, so unchanged sources are skipped without reading them
+SOURCE_CHECKSUM_METADATA: str = "source_checksum"
+
+
+def stream_checksums(stream: BinaryIO) -> tuple:
+    """
+    Base64 CRC32C and MD5 of a stream in one pass, in the format GCS
+    reports them in the blob metadata
+    """
+    crc32c = google_crc32c.Checksum()
+    md5 = hashlib.md5()
+    for block in iter(lambda: stream.read(HASH_BLOCK_SIZE), b""):
+        crc32c.update(block)
+        md5.update(block)
+
+    return (
+        base64.b64encode(crc32c.digest()).decode("utf-8"),
+        base64.b64encode(md5.digest()).decode("utf-8"),
+    )
+
+
+def is_unchanged(bucket: Bucket, source: dict) -> bool:
+    """
+    True when the blob exists with the same size and content as the source.
+
+    The source checksum recorded at upload is compared first; otherwise the
+    source is hashed and compared with the blob's CRC32C (or MD5, for
+    blobs without one).
+    """
+    blob = bucket.get_blob(source["blob_name"])
+    if blob is None or blob.size != source["size"]:
+        return False
+
+    recorded = (getattr(blob, "metadata", None) or {}).get(SOURCE_CHECKSUM_METADATA)
+    if recorded is not None and source.get("checksum") is not None:
+        return recorded == source["checksum"]
+
+    with source["open"]() as stream:
+        crc32c, md5 = stream_checksums(stream)
+    if blob.crc32c:
+        return blob.crc32c == crc32c
+    return blob.md5_hash == md5
+
+
+def choose_chunk_size(size: int) -> int:
+    # fewer, larger resumable requests for large sources
+    return LARGE_UPLOAD_CHUNK_SIZE if size >= LARGE_UPLOAD_THRESHOLD else UPLOAD_CHUNK_SIZE
+
+
+def choose_workers(sources: list) -> int:
+    """
+    Upload threads: one per source, at most MAX_THREAD_WORKERS. Reading,
+    decompressing and checksumming the sources happen in C code that
+    releases the GIL, so threads keep every upload busy.
+    """
+    return max(1, min(len(sources), MAX_THREAD_WORKERS))
+
+
+def upload_streams(
+        bucket: Bucket,
+        sources: list,
+        skip_unchanged: bool = True,
+        content_type: str = "application/octet-stream",
+        logger: Any = None
+    ) -> dict:
+    """
+    Upload streamed sources to `bucket` concurrently, skipping sources that
+    are already there.
+
+    A source is a dict with `name`, `blob_name`, `size`, `open` (a callable
+    returning a context manager over a binary stream) and optionally
+    `checksum` (recorded on the blob for the next run's skip check). Each
+    source is uploaded as a chunked resumable upload, so nothing is staged
+    on disk.
+
+    Returns:
+        dict: totals (uploaded, skipped, failed, bytes, seconds,
+        bytes_per_sec) and one entry per source under "files" with its
+        status, size, seconds, bytes_per_sec and error (if any)
+    """
+    started: float = time.perf_counter()
+
+    def upload(source: dict) -> dict:
+        name, blob_name, size = source["name"], source["blob_name"], source["size"]
+        result: dict = {"name": name, "blob_name": blob_name, "status": "uploaded", "bytes": size,
+                        "seconds": 0.0, "bytes_per_sec": 0.0, "error": None}
+        file_started: float = time.perf_counter()
+        try:
+            if skip_unchanged and is_unchanged(bucket, source):
+                result["status"] = "skipped"
+                return result
+
+            blob = bucket.blob(blob_name, chunk_size=choose_chunk_size(size))
+            if source.get("checksum") is not None:
+                blob.metadata = {SOURCE_CHECKSUM_METADATA: source["checksum"]}
+            with source["open"]() as stream:
+                blob.upload_from_file(stream, content_type=content_type)
+
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = repr(e)
+            if logger:
+                logger.error(f"Failed to upload {name} to {blob_name}: {e!r}")
+            return result
+
+        result["seconds"] = time.perf_counter() - file_started
+        result["bytes_per_sec"] = size / result["seconds"] if result["seconds"] else 0.0
+        if logger:
+            logger.info(f"Uploaded {name} to {bucket.name}/{blob_name}: "
+                        f"{size / 2**20:.1f} MiB at {result['bytes_per_sec'] / 2**20:.1f} MiB/s")
+        return result
+
+    with ThreadPoolExecutor(max_workers=choose_workers(sources)) as executor:
+        files: list = list(executor.map(upload, sources))
+
+    seconds: float = time.perf_counter() - started
+    uploaded_bytes: int = sum(file["bytes"] for file in files if file["status"] == "uploaded")
+    summary: dict = {
+        "uploaded": sum(file["status"] == "uploaded" for file in files),
+        "skipped": sum(file["status"] == "skipped" for file in files),
+        "failed": sum(file["status"] == "failed" for file in files),
+        "bytes": uploaded_bytes,
+        "seconds": seconds,
+        "bytes_per_sec": uploaded_bytes / seconds if seconds else 0.0,
+        "files": files,
+    }
+
+    if logger:
+        logger.info(
+            f"{summary['uploaded']} uploaded, {summary['skipped']} unchanged, {summary['failed']} failed; "
+            f"{uploaded_bytes / 2**20:.1f} MiB in {seconds:.1f}s"
+        )
+    return summary
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+# rolling windows (days) of the daily new counts
+ROLLING_WINDOWS: list = [7, 14]
+
+# days between the averages compared by the growth rate
+GROWTH_PERIOD: int = 7
+
+# location columns carried into the gold metrics when present
+GOLD_ID_COLS: list = ["uid", "scope", "province_state", "country_region"]
+
+
+def sort_by_location(df: DataFrame, key_col: str = "uid", date_col: str = "date") -> tuple:
+    """
+    Sort the rows once by (key, date) and mark where each location starts.
+
+    Returns:
+        tuple: (sorted frame, int64 index of the first row of each row's
+        location, one entry per row)
+    """
+    codes, _ = pd.factorize(df[key_col], sort=True, use_na_sentinel=True)
+    dates = df[date_col].to_numpy(dtype="datetime64[ns]").view("int64")
+
+    order: np.ndarray = np.lexsort((dates, codes))
+    df_sorted = df.take(order).reset_index(drop=True)
+
+    codes = codes[order]
+    is_start = np.ones(len(codes), dtype=bool)
+    is_start[1:] = codes[1:] != codes[:-1]
+    segment_start: np.ndarray = np.maximum.accumulate(np.where(is_start, np.arange(len(codes)), 0))
+    return df_sorted, segment_start
+
+
+def segmented_diff(values: np.ndarray, segment_start: np.ndarray, periods: int = 1) -> np.ndarray:
+    """
+    values[i] - values[i - periods] within each segment; the first
+    `periods` rows of a segment keep their value
+    """
+    index = np.arange(len(values))
+    previous = index - periods
+    out = values.astype("float64", copy=True)
+    has_previous = previous >= segment_start
+    out[has_previous] -= values[previous[has_previous]]
+    return out
+
+
+def segmented_shift(values: np.ndarray, segment_start: np.ndarray, periods: int) -> np.ndarray:
+    # values[i - periods] within each segment, NaN before the segment
+    index = np.arange(len(values))
+    previous = index - periods
+    out = np.full(len(values), np.nan)
+    has_previous = previous >= segment_start
+    out[has_previous] = values[previous[has_previous]]
+    return out
+
+
+def segmented_rolling_mean(values: np.ndarray, segment_start: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing `window`-row mean within each segment, from two prefix sums.
+    NaN until the window is full or while it holds a missing value, like
+    `groupby(...).rolling(window).mean()`.
+    """
+    missing = np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values))))
+    n_missing = np.concatenate(([0], np.cumsum(missing)))
+
+    index = np.arange(len(values))
+    lower = index + 1 - window
+    full = lower >= segment_start
+    lower = np.maximum(lower, 0)
+
+    out = (sums[index + 1] - sums[lower]) / window
+    out[~full | (n_missing[index + 1] - n_missing[lower] > 0)] = np.nan
+    return out
+
+
+def repair_cumulative(values: np.ndarray, segment_start: np.ndarray) -> np.ndarray:
+    """
+    Make each segment's cumulative series non-negative and non-decreasing
+    by capping every value with the smallest value reported after it, so a
+    downward correction revises the earlier over-counts instead of
+    producing negative new counts. Missing values stay missing.
+    """
+    missing = np.isnan(values)
+    if missing.all():
+        return values.astype("float64")
+    low, high = np.nanmin(values), np.nanmax(values)
+    span: float = high - low + 1
+
+    # segment rank offsets keep the reversed running minimum from crossing
+    # into the next segment
+    segment_id = np.cumsum(segment_start == np.arange(len(values))) - 1
+    offset = (segment_id.max() - segment_id) * span
+
+    shifted = np.where(missing, np.nan, values - low) - offset
+    repaired = np.fmin.accumulate(shifted[::-1])[::-1] + offset + low
+    repaired[missing] = np.nan
+    return np.maximum(repaired, 0.0)
+
+
+def growth_rate(average: np.ndarray, segment_start: np.ndarray, periods: int = GROWTH_PERIOD) -> np.ndarray:
+    # relative change of a rolling average over `periods` days; NaN from zero
+    previous = segmented_shift(average, segment_start, periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = average / previous - 1.0
+    rate[~np.isfinite(rate)] = np.nan
+    return rate
+
+
+def build_daily_metrics(
+        df: DataFrame,
+        measures: list,
+        key_col: str = "uid",
+        date_col: str = "date",
+        windows: list = ROLLING_WINDOWS,
+        growth_period: int = GROWTH_PERIOD
+    ) -> DataFrame:
+    """
+    Derived daily metrics of cumulative silver counts, one row per
+    location and day.
+
+    The frame is sorted once by (location, date); every metric is then a
+    segmented array operation over all locations at once. Per measure:
+
+    - new_<measure>: day-over-day change of the reported cumulative count
+    - <measure>_repaired: non-decreasing cumulative count
+    - new_<measure>_repaired: daily change of the repaired series (>= 0)
+    - new_<measure>_<w>d_avg: trailing mean of the repaired daily counts
+    - new_<measure>_growth: change of the first average over `growth_period` days
+
+    Rows are assumed to be consecutive days per location, as the silver
+    layer holds one row per location and date column.
+    """
+    df_sorted, segment_start = sort_by_location(df, key_col, date_col)
+
+    id_cols: list = [col for col in GOLD_ID_COLS if col in df_sorted.columns and col != key_col]
+    df_gold = df_sorted[[key_col] + id_cols + [date_col]].copy()
+
+    for measure in measures:
+        cumulative = df_sorted[measure].to_numpy(dtype="float64", na_value=np.nan)
+        repaired = repair_cumulative(cumulative, segment_start)
+        new_repaired = segmented_diff(repaired, segment_start)
+
+        df_gold[f"new_{measure}"] = segmented_diff(cumulative, segment_start)
+        df_gold[f"{measure}_repaired"] = repaired
+        df_gold[f"new_{measure}_repaired"] = new_repaired
+
+        for window in windows:
+            df_gold[f"new_{measure}_{window}d_avg"] = segmented_rolling_mean(new_repaired, segment_start, window)
+
+        df_gold[f"new_{measure}_growth"] = growth_rate(
+            df_gold[f"new_{measure}_{windows[0]}d_avg"].to_numpy(), segment_start, growth_period
+        )
+
+    return df_gold
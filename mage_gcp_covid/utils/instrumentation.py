@@ -0,0 +1,160 @@
+import functools
+import os
+import socket
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pandas import DataFrame
+
+from mage_gcp_covid.utils.profiling import count_rows, track_resources
+
+
+# local Parquet dataset the block measurements are appended to;
+# RUN_LEDGER_DIR overrides the location
+RUN_LEDGER_ENV: str = "RUN_LEDGER_DIR"
+DEFAULT_RUN_LEDGER_DIR: str = ".run_ledger"
+
+# one id per process unless Mage passes the pipeline run id
+PROCESS_RUN_ID: str = uuid.uuid4().hex[:12]
+
+# one explicit schema for every ledger file: a field that is null in one
+# record (e.g. `error` of a successful run) keeps its type, so files of
+# successful and failed blocks read back as one dataset
+LEDGER_SCHEMA = pa.schema([
+    ("run_id", pa.string()),
+    ("pipeline", pa.string()),
+    ("block", pa.string()),
+    ("started_at", pa.timestamp("us", tz="UTC")),
+    ("status", pa.string()),
+    ("error", pa.string()),
+    ("seconds", pa.float64()),
+    ("cpu_seconds", pa.float64()),
+    ("peak_rss_mb", pa.float64()),
+    ("rss_start_mb", pa.float64()),
+    ("children_peak_rss_mb", pa.float64()),
+    ("rows_in", pa.int64()),
+    ("rows_out", pa.int64()),
+    ("gcs_bytes_sent", pa.int64()),
+    ("gcs_bytes_received", pa.int64()),
+    ("host", pa.string()),
+    ("pid", pa.int64()),
+])
+
+LEDGER_COLUMNS: list = LEDGER_SCHEMA.names
+
+# `run_date=YYYY-MM-DD` directories the ledger files are grouped in
+LEDGER_PARTITIONING = ds.partitioning(pa.schema([("run_date", pa.string())]), flavor="hive")
+
+
+def ledger_directory(ledger_dir: str = None) -> str:
+    return ledger_dir or os.environ.get(RUN_LEDGER_ENV) or DEFAULT_RUN_LEDGER_DIR
+
+
+def append_to_ledger(record: dict, ledger_dir: str = None) -> str:
+    """
+    Append one measurement to the ledger as its own Parquet file under a
+    `run_date=YYYY-MM-DD` partition, so concurrent blocks never rewrite a
+    shared file and the whole ledger reads back as one dataset
+    """
+    run_date: str = record["started_at"].strftime("%Y-%m-%d")
+    directory = Path(ledger_directory(ledger_dir)) / f"run_date={run_date}"
+    directory.mkdir(parents=True, exist_ok=True)
+
+    file_path = directory / f"{record['started_at']:%H%M%S%f}-{record['block']}-{record['pid']}.parquet"
+    record = {col: record.get(col) for col in LEDGER_COLUMNS}
+    pq.write_table(pa.Table.from_pylist([record], schema=LEDGER_SCHEMA), file_path)
+    return str(file_path)
+
+
+def read_ledger(ledger_dir: str = None, block: str = None, pipeline: str = None) -> DataFrame:
+    """
+    All ledger records (optionally of one block / pipeline), oldest first
+    """
+    ledger_dir = ledger_directory(ledger_dir)
+    if not Path(ledger_dir).exists():
+        return DataFrame(columns=LEDGER_COLUMNS)
+
+    condition = None
+    for col, value in [("block", block), ("pipeline", pipeline)]:
+        if value:
+            condition = ds.field(col) == value if condition is None else condition & (ds.field(col) == value)
+
+    # files are read with the ledger schema, also ones written before it was fixed
+    dataset = ds.dataset(
+        ledger_dir,
+        format="parquet",
+        schema=LEDGER_SCHEMA.append(pa.field("run_date", pa.string())),
+        partitioning=LEDGER_PARTITIONING,
+    )
+    df = dataset.to_table(filter=condition).to_pandas()
+    return df.sort_values("started_at").reset_index(drop=True)
+
+
+def instrument(function: Callable = None, *, block: str = None, ledger_dir: str = None) -> Callable:
+    """
+    Record the cost of a Mage block in the run ledger.
+
+    Place it under the Mage decorator:
+
+        @transformer
+        @instrument
+        def transform(data, *args, **kwargs):
+
+    Wall time, CPU time, peak RSS, input/output rows and GCS bytes are
+    measured around every call and appended to the ledger, also when the
+    block fails. The block name defaults to the block file name.
+    """
+    if function is None:
+        return functools.partial(instrument, block=block, ledger_dir=ledger_dir)
+
+    block_name: str = block or Path(function.__code__.co_filename).stem
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        logger = kwargs.get("logger")
+        started_at = datetime.now(timezone.utc)
+        status, error = "success", None
+
+        output = None
+        try:
+            with track_resources() as stats:
+                output = function(*args, **kwargs)
+        except Exception as e:
+            status, error = "failed", repr(e)
+            raise
+        finally:
+            record: dict = {
+                "run_id": str(kwargs.get("pipeline_run_id") or kwargs.get("run_id") or PROCESS_RUN_ID),
+                "pipeline": kwargs.get("pipeline_uuid"),
+                "block": block_name,
+                "started_at": started_at,
+                "status": status,
+                "error": error,
+                **stats,
+                "rows_in": count_rows(tuple(args)),
+                "rows_out": count_rows(output),
+                "host": socket.gethostname(),
+                "pid": os.getpid(),
+            }
+            # the ledger must never fail the block itself
+            try:
+                append_to_ledger(record, ledger_dir)
+            except Exception as e:
+                if logger:
+                    logger.warning(f"Could not append {block_name} to the run ledger: {e!r}")
+
+            if logger:
+                logger.info(
+                    f"[{block_name}] {status} in {stats['seconds']:.2f}s (cpu {stats['cpu_seconds']:.2f}s), "
+                    f"peak {stats['peak_rss_mb']:,.0f} MB, rows {record['rows_in']:,} -> {record['rows_out']:,}, "
+                    f"GCS {stats['gcs_bytes_received'] / 2**20:,.1f} MiB in / {stats['gcs_bytes_sent'] / 2**20:,.1f} MiB out"
+                )
+
+        return output
+
+    return wrapper
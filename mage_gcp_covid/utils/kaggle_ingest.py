@@ -0,0 +1,113 @@
+import json
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import partial
+from os import path
+from typing import Any
+
+from google.cloud.storage import Bucket
+
+from mage_gcp_covid.utils.covid_sources import BRONZE_COVID_PREFIX, RAW_DATASETS
+from mage_gcp_covid.utils.gcs_transfer import upload_streams
+
+
+# the RAW files the pipelines read; the CONVENIENT files are not landed
+RAW_FILES: list = [path.basename(dataset["object_key"]) for dataset in RAW_DATASETS.values()]
+
+# version of the Kaggle dataset the landing zone was last filled from
+VERSION_MARKER_KEY: str = BRONZE_COVID_PREFIX + '_kaggle_version.json'
+
+
+def get_dataset_version(api: Any, dataset: str) -> dict:
+    """
+    Current version number and last-updated time of a Kaggle dataset
+    ('owner/slug'), read from the dataset listing without downloading it
+    """
+    owner, slug = dataset.split("/", 1)
+    for candidate in api.dataset_list(user=owner, search=slug):
+        if str(getattr(candidate, "ref", "")) != dataset:
+            continue
+        version = getattr(candidate, "current_version_number", None) or getattr(candidate, "currentVersionNumber", None)
+        last_updated = getattr(candidate, "last_updated", None) or getattr(candidate, "lastUpdated", None)
+        return {
+            "dataset": dataset,
+            "version": None if version is None else int(version),
+            "last_updated": None if last_updated is None else str(last_updated),
+        }
+    raise ValueError(f"Kaggle dataset {dataset} not found")
+
+
+def read_version_marker(bucket: Bucket) -> dict:
+    blob = bucket.blob(VERSION_MARKER_KEY)
+    if not blob.exists():
+        return {}
+    return json.loads(blob.download_as_bytes())
+
+
+def write_version_marker(bucket: Bucket, version: dict, files: list) -> None:
+    marker: dict = {
+        **version,
+        "files": files,
+        "landed_at": datetime.now(timezone.utc).isoformat(),
+    }
+    bucket.blob(VERSION_MARKER_KEY).upload_from_string(json.dumps(marker), content_type="application/json")
+
+
+def is_landed(bucket: Bucket, version: dict, files: list = RAW_FILES, prefix: str = BRONZE_COVID_PREFIX) -> bool:
+    """
+    True when the landing zone already holds `files` from this dataset version
+    """
+    marker: dict = read_version_marker(bucket)
+    same_version: bool = (
+        marker.get("dataset") == version["dataset"]
+        and marker.get("version") == version["version"]
+        and marker.get("last_updated") == version["last_updated"]
+    )
+    return same_version and all(bucket.blob(prefix + name).exists() for name in files)
+
+
+@contextmanager
+def open_member(archive_path: str, member: str):
+    # one ZipFile handle per stream, zip readers are not thread safe
+    with zipfile.ZipFile(archive_path) as archive, archive.open(member) as stream:
+        yield stream
+
+
+def stream_zip_members_to_gcs(
+        archive_path: str,
+        bucket: Bucket,
+        members: list = RAW_FILES,
+        prefix: str = BRONZE_COVID_PREFIX,
+        skip_unchanged: bool = True,
+        logger: Any = None
+    ) -> dict:
+    """
+    Upload selected members of a zip archive straight to GCS.
+
+    Each member is decompressed on the fly into a chunked resumable upload
+    (see `utils.gcs_transfer`), so nothing is extracted to disk and members
+    that are not needed are never read. A member whose blob already has
+    the same size and content is skipped; the member's zip CRC-32 is
+    recorded on the blob, so the next run skips it without decompressing.
+
+    Returns:
+        dict: totals and one result per member, including bytes/sec
+    """
+    with zipfile.ZipFile(archive_path) as archive:
+        infos: dict = {info.filename: info for info in archive.infolist()}
+    missing: list = [member for member in members if member not in infos]
+    if missing:
+        raise FileNotFoundError(f"{missing} not found in {archive_path}")
+
+    sources: list = [
+        {
+            "name": member,
+            "blob_name": prefix + member,
+            "size": infos[member].file_size,
+            "open": partial(open_member, archive_path, member),
+            "checksum": f"crc32:{infos[member].CRC:08x}",
+        }
+        for member in members
+    ]
+    return upload_streams(bucket, sources, skip_unchanged=skip_unchanged, content_type="text/csv", logger=logger)
@@ -0,0 +1,127 @@
+from os import environ, getpid
+from pathlib import Path
+import threading
+
+import duckdb
+from pandas import DataFrame
+
+from mage_gcp_covid.utils.covid_model import SILVER_DIM_LOCATION_KEY, SILVER_FACT_DATASET
+from mage_gcp_covid.utils.local_gcs import LOCAL_GCS_ROOT_ENV
+from mage_gcp_covid.utils.partitioned_parquet import (
+    BRONZE_WEATHER_DATASET,
+    GOLD_COVID_METRICS_DATASET,
+    SILVER_COVID_ALL_DATASET,
+    SILVER_COVID_DATASET,
+    SILVER_COVID_WEATHER_DATASET,
+)
+from mage_gcp_covid.utils.rollups import ROLLUPS, rollup_prefix
+
+
+# view name -> object key of a Hive-partitioned dataset (prefix ending in '/')
+# or of a single Parquet object
+LAKE_VIEWS: dict = {
+    "silver_covid_us": SILVER_COVID_DATASET,
+    "silver_covid_us_single": '02_silver_standardize/covid/covid_us.parquet',
+    "silver_covid_all": SILVER_COVID_ALL_DATASET,
+    "silver_fact_covid_daily": SILVER_FACT_DATASET,
+    "silver_dim_location": SILVER_DIM_LOCATION_KEY,
+    "silver_covid_weather": SILVER_COVID_WEATHER_DATASET,
+    "bronze_weather": BRONZE_WEATHER_DATASET,
+    "gold_covid_daily_metrics": GOLD_COVID_METRICS_DATASET,
+    **{f"gold_covid_{name}": rollup_prefix(name) for name in ROLLUPS},
+}
+
+# process-wide services keyed by (pid, lake root), created on first use
+_services: dict = {}
+_services_lock = threading.Lock()
+
+
+class LakeQueryService:
+    """
+    SQL over the lake's Parquet datasets with an embedded DuckDB.
+
+    Every dataset present under `<root>/<bucket>/` is exposed as a view.
+    Queries only decode the columns they select; partition filters skip
+    whole directories and the other predicates skip row groups by their
+    statistics. Parquet footers are cached across queries, so repeated
+    lookups on a warm service do not re-read file metadata.
+    """
+
+    def __init__(self, root: str, bucket_name: str = 'covid-medallion-lake', threads: int = None):
+        self.lake_dir = Path(root) / bucket_name
+        self.connection = duckdb.connect(":memory:")
+        self.connection.execute("SET parquet_metadata_cache = true")
+        if threads:
+            self.connection.execute(f"SET threads = {int(threads)}")
+        self.views: dict = {}
+        self.refresh()
+
+    def refresh(self) -> dict:
+        """
+        Create the views of datasets that appeared since the last call and
+        drop the ones that disappeared; existing views are left as they
+        are. New files of an existing dataset are picked up by the next
+        query.
+
+        Returns:
+            dict: {view name: Parquet path or glob}
+        """
+        views: dict = {}
+        for name, object_key in LAKE_VIEWS.items():
+            path = self.lake_dir / object_key
+            if object_key.endswith("/"):
+                if not path.is_dir() or next(path.rglob("*.parquet"), None) is None:
+                    continue
+                source = f"read_parquet('{path.as_posix()}/**/*.parquet', hive_partitioning = true)"
+            else:
+                if not path.is_file():
+                    continue
+                source = f"read_parquet('{path.as_posix()}')"
+            if self.views.get(name) != source:
+                self.connection.execute(f"CREATE OR REPLACE VIEW {name} AS SELECT * FROM {source}")
+            views[name] = source
+
+        for name in set(self.views) - set(views):
+            self.connection.execute(f"DROP VIEW IF EXISTS {name}")
+        self.views = views
+        return views
+
+    def query(self, sql: str, params: list = None) -> DataFrame:
+        # each call gets its own cursor, so blocks may query from several threads
+        return self.connection.cursor().execute(sql, params).df()
+
+    def explain(self, sql: str, params: list = None) -> str:
+        # physical plan, e.g. to check which filters were pushed into the scan
+        rows = self.connection.cursor().execute(f"EXPLAIN {sql}", params).fetchall()
+        return "\n".join(row[1] for row in rows)
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def get_query_service(root: str = None, bucket_name: str = 'covid-medallion-lake') -> LakeQueryService:
+    """
+    Get the shared query service over a local lake directory (GCS_LOCAL_ROOT
+    by default), so its metadata cache stays warm across blocks. A cached
+    service is refreshed, so datasets written since its creation (e.g. by
+    an earlier block of the same run) are queryable.
+    """
+    root = root or environ.get(LOCAL_GCS_ROOT_ENV)
+    if not root:
+        raise ValueError(f"No lake directory given and {LOCAL_GCS_ROOT_ENV} is not set")
+
+    key: tuple = (getpid(), str(Path(root).resolve()), bucket_name)
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = _services[key] = LakeQueryService(root, bucket_name)
+        else:
+            service.refresh()
+    return service
+
+
+def clear_query_services() -> None:
+    with _services_lock:
+        for service in _services.values():
+            service.close()
+        _services.clear()
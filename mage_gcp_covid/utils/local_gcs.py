@@ -0,0 +1,150 @@
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from mage_gcp_covid.utils.profiling import add_gcs_bytes
+
+
+# set to a directory to make `get_storage_client` hand out the local stand-in
+LOCAL_GCS_ROOT_ENV: str = "GCS_LOCAL_ROOT"
+
+
+class CountingFile:
+    """
+    File wrapper that reports the bytes read/written like GCS traffic
+    """
+
+    def __init__(self, file):
+        self.file = file
+
+    def read(self, *args) -> bytes:
+        data: bytes = self.file.read(*args)
+        add_gcs_bytes(received=len(data))
+        return data
+
+    def write(self, data) -> int:
+        add_gcs_bytes(sent=len(data))
+        return self.file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.file.close()
+
+
+class LocalBlob:
+    """
+    Filesystem stand-in for `google.cloud.storage.Blob`, covering the calls
+    the blocks make. Objects live at `<root>/<bucket>/<object key>`.
+    """
+
+    def __init__(self, bucket: "LocalBucket", name: str):
+        self.bucket = bucket
+        self.name: str = name
+
+    @property
+    def path(self) -> Path:
+        return self.bucket.path / self.name
+
+    @property
+    def size(self) -> int:
+        return self.path.stat().st_size
+
+    @property
+    def md5_hash(self) -> str:
+        md5 = hashlib.md5()
+        with open(self.path, "rb") as file:
+            for block in iter(lambda: file.read(8 << 20), b""):
+                md5.update(block)
+        return base64.b64encode(md5.digest()).decode("utf-8")
+
+    # CRC32C is only reported by GCS; callers fall back to MD5
+    crc32c = None
+
+    # custom metadata is not persisted; skip checks fall back to the content
+    metadata = None
+
+    def exists(self) -> bool:
+        return self.path.is_file()
+
+    def delete(self) -> None:
+        self.path.unlink()
+
+    def download_as_bytes(self, start: int = None, end: int = None, **kwargs) -> bytes:
+        # `end` is inclusive, as in the GCS client
+        with open(self.path, "rb") as file:
+            file.seek(start or 0)
+            data: bytes = file.read() if end is None else file.read(end - (start or 0) + 1)
+        add_gcs_bytes(received=len(data))
+        return data
+
+    def upload_from_file(self, file_obj, content_type: str = None, **kwargs) -> None:
+        # write to a temp file first so concurrent readers never see half an object
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=self.path.parent, delete=False) as tmp:
+            shutil.copyfileobj(file_obj, tmp, 8 << 20)
+        add_gcs_bytes(sent=os.path.getsize(tmp.name))
+        os.replace(tmp.name, self.path)
+
+    def upload_from_string(self, data, content_type: str = None, **kwargs) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = data.encode("utf-8") if isinstance(data, str) else data
+        self.path.write_bytes(data)
+        add_gcs_bytes(sent=len(data))
+
+    def upload_from_filename(self, filename: str, content_type: str = None, **kwargs) -> None:
+        with open(filename, "rb") as file:
+            self.upload_from_file(file)
+
+    def open(self, mode: str = "r", **kwargs):
+        if "w" in mode:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        return CountingFile(open(self.path, mode if "b" in mode else mode + "b"))
+
+
+class LocalBucket:
+
+    def __init__(self, client: "LocalClient", name: str):
+        self.client = client
+        self.name: str = name
+        self.path: Path = client.root / name
+
+    def blob(self, blob_name: str, chunk_size: int = None, **kwargs) -> LocalBlob:
+        return LocalBlob(self, blob_name)
+
+    def get_blob(self, blob_name: str, **kwargs) -> LocalBlob:
+        blob = LocalBlob(self, blob_name)
+        return blob if blob.exists() else None
+
+    def list_blobs(self, prefix: str = "", max_results: int = None, **kwargs) -> list:
+        if not self.path.exists():
+            return []
+        names: list = sorted(
+            path.relative_to(self.path).as_posix()
+            for path in self.path.rglob("*")
+            if path.is_file() and not path.name.startswith("tmp")
+        )
+        blobs: list = [LocalBlob(self, name) for name in names if name.startswith(prefix)]
+        return blobs[:max_results] if max_results else blobs
+
+
+class LocalClient:
+    """
+    Filesystem stand-in for `google.cloud.storage.Client`, used to run and
+    benchmark the pipelines without cloud access
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.project: str = "local"
+
+    def bucket(self, bucket_name: str) -> LocalBucket:
+        return LocalBucket(self, bucket_name)
@@ -0,0 +1,176 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+import openmeteo_requests
+import pandas as pd
+import requests
+from pandas import DataFrame
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+ARCHIVE_URL: str = "https://archive-api.open-meteo.com/v1/archive"
+
+# The order of variables is important to assign them correctly when decoding
+DAILY_VARIABLES: list = [
+    "weather_code",
+    "precipitation_sum",
+    "temperature_2m_mean",
+    "temperature_2m_max",
+    "temperature_2m_min",
+    "daylight_duration",
+    "snowfall_sum",
+    "rain_sum",
+    "precipitation_hours",
+    "apparent_temperature_mean",
+    "apparent_temperature_max",
+    "apparent_temperature_min",
+]
+
+# locations packed into one archive request
+BATCH_SIZE: int = 50
+MAX_WORKERS: int = 4
+REQUESTS_PER_SECOND: float = 2.0
+
+
+class RateLimiter:
+    """
+    Spaces calls at least `1 / rate` seconds apart across all threads
+    """
+
+    def __init__(self, rate: float):
+        self.interval: float = 1.0 / rate if rate else 0.0
+        self.next_call: float = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_call - now
+            self.next_call = max(now, self.next_call) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def build_session(pool_size: int = MAX_WORKERS, retries: int = 5, backoff_factor: float = 0.2):
+    """
+    Session with one pooled, retrying HTTP adapter shared by all fetch
+    threads, so connections are reused between batches. Responses are cached
+    per grid cell by `WeatherCache`, not per URL.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=[429, 500, 502, 503, 504]
+        )
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_block(response, kind: str):
+    # 'daily' -> response.Daily(), 'hourly' -> response.Hourly()
+    return response.Daily() if kind == "daily" else response.Hourly()
+
+
+def decode_responses(responses: list, variables: list, kind: str = "daily") -> tuple:
+    """
+    Decode the `kind` block of many responses into one preallocated array.
+
+    `variables` must be in the order they were requested. The first pass
+    only reads the time axis of each response to size the output; the
+    second copies every variable straight into its slice.
+
+    Returns:
+        tuple: (values, location_index, times) where values is a float32
+        array of shape (n_rows, n_variables), location_index holds the
+        position of the response each row came from and times holds the
+        UTC timestamps (datetime64[s]) of each row
+    """
+    blocks: list = [get_block(response, kind) for response in responses]
+    steps = np.array(
+        [(block.TimeEnd() - block.Time()) // block.Interval() for block in blocks],
+        dtype="int64"
+    )
+    offsets = np.concatenate([[0], np.cumsum(steps)])
+
+    values = np.empty((offsets[-1], len(variables)), dtype="float32")
+    times = np.empty(offsets[-1], dtype="int64")
+
+    for i, block in enumerate(blocks):
+        start, end = offsets[i], offsets[i + 1]
+        times[start:end] = np.arange(block.Time(), block.TimeEnd(), block.Interval())[:end - start]
+        for j in range(len(variables)):
+            values[start:end, j] = block.Variables(j).ValuesAsNumpy()
+
+    location_index = np.repeat(np.arange(len(blocks)), steps)
+    return values, location_index, times.astype("datetime64[s]")
+
+
+def decoded_to_frame(
+        decoded: tuple,
+        variables: list,
+        location_ids,
+        id_col: str = "cell_id",
+        time_col: str = "date"
+    ) -> DataFrame:
+    """
+    Long frame (id, time, variables...) over the decoded block; the value
+    columns are views of the block where pandas allows it
+    """
+    values, location_index, times = decoded
+    df = DataFrame(values, columns=variables, copy=False)
+    df.insert(0, time_col, pd.to_datetime(times, utc=True))
+    df.insert(0, id_col, np.asarray(location_ids)[location_index])
+    return df
+
+
+def fetch_weather(
+        df_coords: DataFrame,
+        params: dict,
+        url: str = ARCHIVE_URL,
+        batch_size: int = BATCH_SIZE,
+        max_workers: int = MAX_WORKERS,
+        requests_per_second: float = REQUESTS_PER_SECOND,
+        logger: Any = None
+    ) -> list:
+    """
+    Fetch weather for every row of `df_coords` (columns latitude/longitude).
+
+    Coordinates are packed `batch_size` per request; batches run on a thread
+    pool over one pooled session, throttled by a shared rate limiter.
+
+    Returns:
+        list: one response per coordinate row, in the same order
+    """
+    openmeteo = openmeteo_requests.Client(session = build_session(pool_size = max_workers))
+    limiter = RateLimiter(requests_per_second)
+
+    latitudes: list = df_coords["latitude"].tolist()
+    longitudes: list = df_coords["longitude"].tolist()
+    starts: list = list(range(0, len(df_coords), batch_size))
+
+    def fetch_batch(start: int) -> list:
+        end: int = min(start + batch_size, len(df_coords))
+        limiter.wait()
+        responses = openmeteo.weather_api(url, params = {
+            **params,
+            "latitude": latitudes[start:end],
+            "longitude": longitudes[start:end],
+        })
+        if logger:
+            logger.debug(f"Fetched locations {start} to {end}")
+        return responses
+
+    with ThreadPoolExecutor(max_workers = max_workers) as executor:
+        batches: list = list(executor.map(fetch_batch, starts))
+
+    return [response for responses in batches for response in responses]
@@ -0,0 +1,279 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+from google.cloud.storage import Bucket
+from pandas import DataFrame
+
+
+# silver COVID dataset layout
+SILVER_COVID_DATASET: str = '02_silver_standardize/covid/covid_us/'
+SILVER_PARTITION_COLS: list = ["country_region", "province_state", "year_month"]
+
+# unified US + global confirmed/deaths fact
+SILVER_COVID_ALL_DATASET: str = '02_silver_standardize/covid/covid_all/'
+SILVER_ALL_PARTITION_COLS: list = ["scope", "country_region", "year_month"]
+
+# landing layout of the daily weather per grid cell
+BRONZE_WEATHER_DATASET: str = '01_bronze_landing/weather/'
+# month partitions holding all cells, so a flush writes one object per month
+WEATHER_PARTITION_COLS: list = ["year_month"]
+WEATHER_KEY_COLS: list = ["cell_id", "date"]
+
+# weather joined onto the silver COVID rows
+SILVER_COVID_WEATHER_DATASET: str = '02_silver_standardize/covid_weather/'
+
+# derived daily COVID metrics per location
+GOLD_COVID_METRICS_DATASET: str = '03_gold_curated/covid_daily_metrics/'
+
+# state / country rollup cubes, one dataset per grain
+GOLD_COVID_ROLLUPS_PREFIX: str = '03_gold_curated/covid_rollups/'
+
+IO_WORKERS: int = 16
+
+# Hive convention for a missing partition value
+NULL_PARTITION: str = "__HIVE_DEFAULT_PARTITION__"
+
+
+def add_year_month(df: DataFrame, date_col: str = "date", name: str = "year_month") -> DataFrame:
+    """
+    Month partition key, e.g. '2020-03'; sorts like the dates it covers.
+    Only the distinct months are formatted and mapped back to the rows
+    (missing dates stay missing); `dt.strftime` per row is ~25x slower.
+    """
+    codes, months = pd.factorize(df[date_col].to_numpy(dtype="datetime64[M]"))
+    labels = pd.Categorical.from_codes(codes, categories=np.datetime_as_string(months, unit="M"))
+    df[name] = pd.Series(labels, index=df.index).astype("str")
+    return df
+
+
+def partition_dir(prefix: str, keys: dict) -> str:
+    """
+    Hive-style partition directory, e.g. `prefix/province_state=New%20York/`
+    """
+    return prefix + "".join(
+        f"{col}={NULL_PARTITION if pd.isna(value) else quote(str(value), safe='')}/"
+        for col, value in keys.items()
+    )
+
+
+def parse_partition_keys(object_key: str, prefix: str) -> dict:
+    # inverse of partition_dir for a full object key
+    parts = object_key[len(prefix):].split("/")[:-1]
+    return dict(
+        (col, None if value == NULL_PARTITION else unquote(value))
+        for col, value in (part.split("=", 1) for part in parts if "=" in part)
+    )
+
+
+def match_filter(value, condition) -> bool:
+    """
+    Filter conditions: a scalar (equality), a list/set (membership) or a
+    `(low, high)` tuple (inclusive range; either bound may be None).
+    """
+    if value is None:
+        return condition is None
+    if isinstance(condition, tuple):
+        low, high = condition
+        return (low is None or value >= low) and (high is None or value <= high)
+    if isinstance(condition, (list, set)):
+        return value in condition
+    return value == condition
+
+
+def to_arrow_filters(filters: dict) -> list:
+    # row-group filters for pyarrow; partition columns are handled by the path
+    arrow_filters: list = []
+    for col, condition in filters.items():
+        if isinstance(condition, tuple):
+            low, high = condition
+            if low is not None:
+                arrow_filters.append((col, ">=", low))
+            if high is not None:
+                arrow_filters.append((col, "<=", high))
+        elif isinstance(condition, (list, set)):
+            arrow_filters.append((col, "in", list(condition)))
+        else:
+            arrow_filters.append((col, "==", condition))
+    return arrow_filters
+
+
+def write_partitioned(
+        df: DataFrame,
+        bucket: Bucket,
+        prefix: str,
+        partition_cols: list,
+        part_name: str,
+        replace: bool = False,
+        max_workers: int = IO_WORKERS,
+        logger: Any = None
+    ) -> list:
+    """
+    Write a frame as a Hive-partitioned Parquet dataset under `prefix`.
+
+    Every partition gets one object named `part_name`, so re-running the
+    same part overwrites it instead of duplicating rows. With `replace`,
+    objects under `prefix` that were not written by this call are deleted
+    afterwards (full rewrite).
+    """
+    def upload(item) -> str:
+        keys, df_part = item
+        object_key = partition_dir(prefix, dict(zip(partition_cols, keys))) + part_name
+
+        buffer = BytesIO()
+        df_part.drop(columns=partition_cols).to_parquet(buffer, index=False)
+        buffer.seek(0)
+        bucket.blob(object_key).upload_from_file(buffer, content_type="application/octet-stream")
+        return object_key
+
+    # keep rows with missing partition values (e.g. global rows without a state)
+    groups = df.groupby(partition_cols, observed=True, sort=False, dropna=False)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        written: list = list(executor.map(upload, groups))
+
+    if logger:
+        logger.info(f"Wrote {len(df)} rows to {len(written)} partitions under {prefix}")
+
+    if replace:
+        written_keys: set = set(written)
+        stale: list = [blob for blob in bucket.list_blobs(prefix=prefix) if blob.name not in written_keys]
+        for blob in stale:
+            blob.delete()
+        if logger and stale:
+            logger.info(f"Deleted {len(stale)} stale objects under {prefix}")
+
+    return written
+
+
+def merge_partitioned(
+        df: DataFrame,
+        bucket: Bucket,
+        prefix: str,
+        partition_cols: list,
+        part_name: str,
+        key_cols: list,
+        max_workers: int = IO_WORKERS,
+        logger: Any = None
+    ) -> list:
+    """
+    Upsert a frame into a Hive-partitioned Parquet dataset.
+
+    Every partition touched by `df` is read back, merged with the new rows
+    (new rows win on `key_cols`) and rewritten as the single object
+    `part_name`; the partition's other objects are deleted afterwards. So
+    repeated or overlapping backfills never leave more than one object per
+    partition, and re-running the same backfill gives the same result.
+    """
+    def upsert(item) -> str:
+        keys, df_new = item
+        directory = partition_dir(prefix, dict(zip(partition_cols, keys)))
+        object_key = directory + part_name
+        df_new = df_new.drop(columns=partition_cols)
+
+        existing: list = [blob for blob in bucket.list_blobs(prefix=directory) if blob.name.endswith(".parquet")]
+        frames: list = [pd.read_parquet(BytesIO(blob.download_as_bytes())) for blob in existing]
+        df_part = (pd.concat(frames + [df_new], ignore_index=True)
+            .drop_duplicates(subset=key_cols, keep="last")
+            .sort_values(key_cols)
+        ) if frames else df_new.sort_values(key_cols)
+
+        buffer = BytesIO()
+        df_part.to_parquet(buffer, index=False)
+        buffer.seek(0)
+        bucket.blob(object_key).upload_from_file(buffer, content_type="application/octet-stream")
+
+        for blob in existing:
+            if blob.name != object_key:
+                blob.delete()
+        return object_key
+
+    groups = df.groupby(partition_cols, observed=True, sort=False, dropna=False)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        written: list = list(executor.map(upsert, groups))
+
+    if logger:
+        logger.info(f"Merged {len(df)} rows into {len(written)} partitions under {prefix}")
+
+    return written
+
+
+def list_partition_objects(bucket: Bucket, prefix: str, filters: dict = None) -> list:
+    """
+    List the data objects under `prefix` whose partition keys pass `filters`.
+
+    Equality filters on the leading partition columns narrow the listing
+    prefix itself; the remaining partition filters are checked on the keys
+    parsed from each object name.
+    """
+    filters = filters or {}
+
+    # narrow the listing with leading equality filters, e.g. country_region=US/
+    list_prefix: str = prefix
+    first_blob = next(iter(bucket.list_blobs(prefix=prefix, max_results=1)), None)
+    if first_blob is None:
+        return []
+    for col in parse_partition_keys(first_blob.name, prefix):
+        condition = filters.get(col)
+        if condition is None or isinstance(condition, (tuple, list, set)):
+            break
+        list_prefix = partition_dir(list_prefix, {col: condition})
+
+    objects: list = []
+    for blob in bucket.list_blobs(prefix=list_prefix):
+        if not blob.name.endswith(".parquet"):
+            continue
+        keys: dict = parse_partition_keys(blob.name, prefix)
+        if all(match_filter(value, filters[col]) for col, value in keys.items() if col in filters):
+            objects.append((blob, keys))
+
+    return objects
+
+
+def read_partitioned(
+        bucket: Bucket,
+        prefix: str,
+        filters: dict = None,
+        columns: list = None,
+        max_workers: int = IO_WORKERS
+    ) -> DataFrame:
+    """
+    Read a Hive-partitioned Parquet dataset, fetching only the objects whose
+    partitions pass `filters`.
+
+    Filters on non-partition columns and the column projection are pushed
+    down into the Parquet reader, so row groups and columns that are not
+    needed are never decoded.
+    """
+    filters = filters or {}
+    objects: list = list_partition_objects(bucket, prefix, filters)
+    if not objects:
+        return DataFrame(columns=columns)
+
+    partition_cols: set = set(objects[0][1])
+    data_filters: list = to_arrow_filters(
+        {col: condition for col, condition in filters.items() if col not in partition_cols}
+    )
+    data_columns = None if columns is None else [col for col in columns if col not in partition_cols]
+
+    def download(item) -> DataFrame:
+        blob, keys = item
+        df_part = pd.read_parquet(
+            BytesIO(blob.download_as_bytes()),
+            columns=data_columns,
+            filters=data_filters or None
+        )
+        for col, value in keys.items():
+            if columns is None or col in columns:
+                df_part[col] = value
+        return df_part
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames: list = list(executor.map(download, objects))
+
+    df = pd.concat(frames, ignore_index=True)
+    return df if columns is None else df[columns]
@@ -0,0 +1,106 @@
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+
+from pandas import DataFrame
+
+
+# RSS sampling period of `track_resources`
+SAMPLE_INTERVAL: float = 0.01
+
+_PAGE_SIZE: int = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# bytes moved to/from GCS by this process, fed by the storage clients
+_gcs_bytes: dict = {"sent": 0, "received": 0}
+_gcs_bytes_lock = threading.Lock()
+
+
+def add_gcs_bytes(sent: int = 0, received: int = 0) -> None:
+    with _gcs_bytes_lock:
+        _gcs_bytes["sent"] += sent
+        _gcs_bytes["received"] += received
+
+
+def gcs_bytes() -> dict:
+    # snapshot of the process-wide GCS byte counters
+    with _gcs_bytes_lock:
+        return dict(_gcs_bytes)
+
+
+def current_rss_bytes() -> int:
+    """
+    Resident set size of this process; falls back to the lifetime peak
+    where /proc is not available
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes(children: bool = False) -> int:
+    # lifetime peak RSS (ru_maxrss is KiB on Linux)
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    return usage.ru_maxrss * 1024
+
+
+def count_rows(output) -> int:
+    """
+    Rows produced by a block: a frame, a tuple of frames (multiple outputs)
+    or a summary dict with `rows_out`
+    """
+    if isinstance(output, DataFrame):
+        return len(output)
+    if isinstance(output, (list, tuple)):
+        return sum(count_rows(item) for item in output)
+    if isinstance(output, dict):
+        return int(output.get("rows_out", 0))
+    return 0
+
+
+@contextmanager
+def track_resources(interval: float = SAMPLE_INTERVAL):
+    """
+    Measure wall time, CPU time and peak RSS of the enclosed code.
+
+    A daemon thread samples the RSS every `interval` seconds, so the peak is
+    the one reached inside the block, not since process start. Worker
+    processes are reported through the children's lifetime peak.
+
+    Yields:
+        dict: filled on exit with seconds, cpu_seconds, peak_rss_mb,
+        rss_start_mb, children_peak_rss_mb and the GCS bytes sent and
+        received by this process
+    """
+    stats: dict = {}
+    bytes_start: dict = gcs_bytes()
+    stop = threading.Event()
+    peak: list = [current_rss_bytes()]
+    rss_start: int = peak[0]
+
+    def sample() -> None:
+        while not stop.wait(interval):
+            peak[0] = max(peak[0], current_rss_bytes())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    wall_start: float = time.perf_counter()
+    cpu_start: float = time.process_time()
+    sampler.start()
+    try:
+        yield stats
+    finally:
+        stop.set()
+        sampler.join()
+        peak[0] = max(peak[0], current_rss_bytes())
+        stats.update({
+            "seconds": time.perf_counter() - wall_start,
+            "cpu_seconds": time.process_time() - cpu_start,
+            "rss_start_mb": rss_start / 2**20,
+            "peak_rss_mb": peak[0] / 2**20,
+            "children_peak_rss_mb": peak_rss_bytes(children=True) / 2**20,
+            "gcs_bytes_sent": gcs_bytes()["sent"] - bytes_start["sent"],
+            "gcs_bytes_received": gcs_bytes()["received"] - bytes_start["received"],
+        })
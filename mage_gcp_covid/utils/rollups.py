@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from mage_gcp_covid.utils.partitioned_parquet import (
+    GOLD_COVID_ROLLUPS_PREFIX,
+    SILVER_COVID_ALL_DATASET,
+    SILVER_COVID_DATASET,
+)
+from mage_gcp_covid.utils.silver_validation import key_codes
+from mage_gcp_covid.utils.weather_join import day_numbers
+
+
+STATE_COLS: list = ["country_region", "province_state"]
+COUNTRY_COLS: list = ["country_region"]
+
+# cube name -> (group columns, period column); the order of the block outputs
+ROLLUPS: dict = {
+    "state_day": (STATE_COLS, "date"),
+    "state_week": (STATE_COLS, "week_start"),
+    "country_day": (COUNTRY_COLS, "date"),
+    "country_week": (COUNTRY_COLS, "week_start"),
+}
+
+# silver datasets the cubes can be built from, with their cumulative measures
+ROLLUP_SOURCES: dict = {
+    "covid_us": {"prefix": SILVER_COVID_DATASET, "measures": ["confirmed_cases"]},
+    "covid_all": {"prefix": SILVER_COVID_ALL_DATASET, "measures": ["confirmed_cases", "deaths"]},
+}
+
+ROLLUP_MANIFEST_KEY: str = GOLD_COVID_ROLLUPS_PREFIX + '_manifest.json'
+
+
+def rollup_prefix(name: str) -> str:
+    return f"{GOLD_COVID_ROLLUPS_PREFIX}{name}/"
+
+
+def rollup_key_cols(name: str) -> list:
+    group_cols, period_col = ROLLUPS[name]
+    return group_cols + [period_col]
+
+
+def week_start_days(days: np.ndarray) -> np.ndarray:
+    # Monday of each day's week (1970-01-01, day 0, was a Thursday)
+    return days - (days + 3) % 7
+
+
+def rollup_start_date(watermark) -> pd.Timestamp:
+    """
+    First silver date an incremental run has to read: the Monday of the
+    week after the watermark, so a week cell is always rebuilt from all
+    of its days
+    """
+    first_new_day = day_numbers([watermark + pd.Timedelta(days=1)])
+    return pd.Timestamp(week_start_days(first_new_day)[0], unit="D")
+
+
+def sum_by_day(group_ids: np.ndarray, days: np.ndarray, columns: dict) -> tuple:
+    """
+    Sum `columns` per (group, day) cell with one `bincount` per column.
+
+    Returns:
+        tuple: (group id, day, {column: sum}) of the non-empty cells,
+        ordered by group, then day
+    """
+    first_day, n_days = days.min(), days.max() - days.min() + 1
+    n_cells = (group_ids.max() + 1) * n_days
+    cells = group_ids * n_days + (days - first_day)
+
+    present = np.flatnonzero(np.bincount(cells, minlength=n_cells))
+    sums: dict = {
+        col: np.bincount(cells, weights=values, minlength=n_cells)[present]
+        for col, values in columns.items()
+    }
+    return present // n_days, present % n_days + first_day, sums
+
+
+def last_by_week(group_ids: np.ndarray, days: np.ndarray, columns: dict) -> tuple:
+    """
+    Week-end values of day cells ordered by group, then day: cumulative
+    counts of a week are the ones of its last reported day.
+
+    Returns:
+        tuple: (group id, week start day, days reported, {column: last value})
+    """
+    weeks = week_start_days(days)
+    is_last = np.ones(len(days), dtype=bool)
+    is_last[:-1] = (group_ids[1:] != group_ids[:-1]) | (weeks[1:] != weeks[:-1])
+    last = np.flatnonzero(is_last)
+
+    n_days = np.diff(last, prepend=-1)
+    values: dict = {col: column[last] for col, column in columns.items()}
+    return group_ids[last], weeks[last], n_days, values
+
+
+def cube_frame(labels: DataFrame, group_ids: np.ndarray, period_col: str, days: np.ndarray, columns: dict) -> DataFrame:
+    df = labels.take(group_ids).reset_index(drop=True)
+    df[period_col] = pd.to_datetime(days, unit="D")
+    for col, values in columns.items():
+        df[col] = values
+    return df
+
+
+def build_rollups(df: DataFrame, measures: list, date_col: str = "date") -> dict:
+    """
+    Rollup cubes of cumulative silver counts at (state, day), (state, week),
+    (country, day) and (country, week).
+
+    Only the (state, day) cube reads the fact: the rows are coded to one
+    integer cell each and summed with `bincount`. The country cube is summed
+    from the state cube and the week cubes take the week-end values of the
+    day cubes, so the fact is scanned once.
+
+    Returns:
+        dict: {cube name: DataFrame}, in the order of `ROLLUPS`
+    """
+    if df.empty:
+        return {
+            name: DataFrame(
+                columns=rollup_key_cols(name) + measures + ["n_locations"] + (["n_days"] if name.endswith("_week") else [])
+            )
+            for name in ROLLUPS
+        }
+
+    state_ids = pd.factorize(key_codes(df, STATE_COLS))[0]
+    _, state_first_row = np.unique(state_ids, return_index=True)
+    state_labels = df[STATE_COLS].take(state_first_row).reset_index(drop=True)
+
+    days = day_numbers(df[date_col])
+    columns: dict = {
+        measure: df[measure].to_numpy(dtype="float64", na_value=0.0)
+        for measure in measures
+    }
+    columns["n_locations"] = np.ones(len(df))
+
+    cubes: dict = {}
+
+    # (state, day) from the fact, (country, day) from the state cells
+    state_cells = sum_by_day(state_ids, days, columns)
+    country_of_state, country_index = pd.factorize(state_labels["country_region"], use_na_sentinel=False)
+    country_labels = DataFrame({"country_region": country_index}).astype(state_labels.dtypes[COUNTRY_COLS])
+    country_cells = sum_by_day(country_of_state[state_cells[0]], state_cells[1], state_cells[2])
+
+    for grain, labels, (group_ids, cell_days, sums) in [
+        ("state", state_labels, state_cells),
+        ("country", country_labels, country_cells),
+    ]:
+        cubes[f"{grain}_day"] = cube_frame(labels, group_ids, "date", cell_days, sums)
+
+        week_ids, weeks, n_days, last = last_by_week(group_ids, cell_days, sums)
+        cubes[f"{grain}_week"] = cube_frame(labels, week_ids, "week_start", weeks, {**last, "n_days": n_days})
+
+    for name, df_cube in cubes.items():
+        for measure in measures + ["n_locations"]:
+            df_cube[measure] = df_cube[measure].round().astype("int64")
+
+    return {name: cubes[name] for name in ROLLUPS}
@@ -0,0 +1,85 @@
+import heapq
+import os
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+# work units of a dynamic block when the pipeline sets no `shard_count`
+DEFAULT_SHARD_COUNT: int = min(os.cpu_count() or 1, 8)
+
+
+def get_shard_count(**kwargs) -> int:
+    return max(int(kwargs.get("shard_count") or DEFAULT_SHARD_COUNT), 1)
+
+
+def balance_shards(sizes: dict, shard_count: int) -> list:
+    """
+    Assign keys to at most `shard_count` shards so the shards hold about the
+    same total size (largest key first, onto the lightest shard).
+
+    Returns:
+        list: one list of keys per non-empty shard
+    """
+    shards: list = [(0, i, []) for i in range(min(shard_count, len(sizes)))]
+    for key, size in sorted(sizes.items(), key=lambda item: (-item[1], str(item[0]))):
+        total, i, keys = heapq.heappop(shards)
+        keys.append(key)
+        heapq.heappush(shards, (total + size, i, keys))
+    return [keys for _, _, keys in sorted(shards, key=lambda shard: shard[1]) if keys]
+
+
+def dynamic_output(items: list, name: str) -> list:
+    """
+    Output of a Mage dynamic block: the items, and metadata naming the
+    child block run spawned for each of them
+    """
+    return [items, [{"block_uuid": f"{name}_{i}"} for i in range(len(items))]]
+
+
+def split_by_key(df: DataFrame, key_col: str, shard_count: int) -> list:
+    # contiguous ranges of sorted keys with about the same number of keys each
+    keys = np.sort(df[key_col].unique())
+    return [df[df[key_col].isin(part)] for part in np.array_split(keys, min(shard_count, len(keys))) if len(part)]
+
+
+def balance_by_key(df: DataFrame, key_col: str, shard_count: int) -> list:
+    """
+    Split the rows into shards of about the same row count, all rows of a
+    key in one shard; rows with a null key form a key of their own.
+
+    Returns:
+        list: (keys, rows) per non-empty shard, the keys sorted with the
+        null key (None) last
+    """
+    sizes: dict = df[key_col].value_counts(dropna=False).to_dict()
+    shards: list = []
+    for keys in balance_shards(sizes, shard_count):
+        keys = sorted((None if pd.isna(key) else key for key in keys), key=lambda key: (key is None, str(key)))
+        mask = df[key_col].isin([key for key in keys if key is not None])
+        if keys[-1] is None:
+            mask |= df[key_col].isna()
+        shards.append((keys, df[mask].reset_index(drop=True)))
+    return shards
+
+
+def combine_shard_outputs(outputs: list):
+    """
+    Reduce the outputs of a dynamic block's children: frames are
+    concatenated (categories re-unified), tuples of frames are combined
+    position by position
+    """
+    first = outputs[0]
+
+    if isinstance(first, DataFrame):
+        df = pd.concat(outputs, ignore_index=True)
+        for col, dtype in first.dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype) and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("category")
+        return df
+
+    if isinstance(first, tuple):
+        return tuple(combine_shard_outputs(list(parts)) for parts in zip(*outputs))
+
+    return first if len(outputs) == 1 else outputs
@@ -0,0 +1,110 @@
+import json
+from datetime import datetime, timezone
+
+import pandas as pd
+from google.cloud.storage import Bucket
+
+from mage_gcp_covid.utils.covid_reshape import DATE_HEADER_FORMAT, get_date_cols
+
+
+SILVER_PREFIX: str = '02_silver_standardize/covid/'
+MANIFEST_KEY: str = SILVER_PREFIX + '_manifest.json'
+
+# every silver target has its own watermark, so a run of one model or
+# layout never advances another's; the wide dataset keeps the original key
+STAR_MANIFEST_KEY: str = SILVER_PREFIX + '_manifest_star.json'
+SINGLE_MANIFEST_KEY: str = SILVER_PREFIX + '_manifest_single.json'
+
+
+def silver_manifest_key(**kwargs) -> str:
+    """
+    Manifest of the silver target selected by the block variables: stream
+    runs and the 'single' layout write the one covid_us.parquet object,
+    the partitioned wide and star models their own datasets
+    """
+    if kwargs.get("silver_mode") == "stream" or kwargs.get("silver_layout") == "single":
+        return SINGLE_MANIFEST_KEY
+    if kwargs.get("silver_model") == "star":
+        return STAR_MANIFEST_KEY
+    return MANIFEST_KEY
+
+
+def read_manifest(bucket: Bucket, manifest_key: str = MANIFEST_KEY) -> dict:
+    """
+    Read the silver manifest; an empty manifest means nothing is committed yet
+    """
+    blob = bucket.blob(manifest_key)
+    if not blob.exists():
+        return {"watermark": None, "parts": []}
+
+    return json.loads(blob.download_as_bytes())
+
+
+def get_watermark(manifest: dict):
+    # last committed date, or None when silver is empty
+    watermark = manifest.get("watermark")
+    return pd.Timestamp(watermark) if watermark else None
+
+
+def commit_part(
+        bucket: Bucket,
+        manifest: dict,
+        part_key: str,
+        watermark: pd.Timestamp,
+        n_rows: int,
+        manifest_key: str = MANIFEST_KEY
+    ) -> dict:
+    """
+    Record a written silver part and advance the watermark.
+
+    Must only be called after the part object is fully uploaded; the manifest
+    write is the commit point of an incremental run.
+    """
+    parts: list = [part for part in manifest.get("parts", []) if part["key"] != part_key]
+    parts.append({"key": part_key, "rows": int(n_rows)})
+
+    manifest = {
+        "watermark": watermark.strftime("%Y-%m-%d"),
+        "parts": parts,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+    bucket.blob(manifest_key).upload_from_string(
+        json.dumps(manifest, indent=2),
+        content_type="application/json"
+    )
+    return manifest
+
+
+def is_new_date_col(col: str, watermark, date_format: str = DATE_HEADER_FORMAT) -> bool:
+    # date headers after the watermark; meta columns are always kept
+    if not get_date_cols([col]):
+        return True
+    if watermark is None:
+        return True
+    return pd.to_datetime(col, format=date_format, errors="coerce") > watermark
+
+
+def raw_columns_to_load(bucket: Bucket, **kwargs):
+    """
+    Columns of the RAW CSV a silver run needs: in incremental mode a
+    predicate keeping the meta columns and the dates after the watermark
+    of the selected silver target, otherwise None (all columns)
+    """
+    if kwargs.get("silver_mode") != "incremental":
+        return None
+
+    watermark = get_watermark(read_manifest(bucket, silver_manifest_key(**kwargs)))
+    if kwargs.get("logger"):
+        kwargs["logger"].info(f"Silver watermark: {watermark}")
+    return lambda col: is_new_date_col(col, watermark)
+
+
+def select_new_date_cols(date_cols: list, watermark, date_format: str = DATE_HEADER_FORMAT) -> list:
+    """
+    Keep only the date headers newer than the watermark
+    """
+    if watermark is None:
+        return list(date_cols)
+
+    dates = pd.to_datetime(pd.Series(date_cols, dtype="object"), format=date_format, errors="coerce")
+    return [col for col, date in zip(date_cols, dates) if date > watermark]
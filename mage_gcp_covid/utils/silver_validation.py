@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from mage_gcp_covid.utils.covid_model import LOCATION_KEY
+
+
+# logical key of a silver COVID row
+SILVER_KEY_COLS: list = [LOCATION_KEY, "date"]
+
+# count columns that must not be negative
+COUNT_COLS: list = ["confirmed_cases", "deaths"]
+
+# earliest date expected in the JHU series
+MIN_EXPECTED_DATE: pd.Timestamp = pd.Timestamp("2020-01-01")
+
+
+def column_codes(values: pd.Series) -> tuple:
+    """
+    Dense integer codes of one key column and their cardinality; nulls get
+    their own code. Categories reuse their codes, other columns are factorized.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy(dtype="int64")
+        n_codes: int = len(values.cat.categories)
+    else:
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        n_codes = len(uniques)
+    # shift the -1 null sentinel to 0
+    return codes.astype("int64") + 1, n_codes + 1
+
+
+def key_codes(df: DataFrame, key_cols: list = SILVER_KEY_COLS) -> np.ndarray:
+    """
+    One exact int64 per row identifying its key.
+
+    The per-column codes are packed in mixed radix, so only the key columns
+    are hashed (once each) instead of every column of the frame. Falls back
+    to combined 64-bit hashes when the packed key would overflow int64.
+    """
+    keys = np.zeros(len(df), dtype="int64")
+    span: int = 1
+    for col in key_cols:
+        codes, n_codes = column_codes(df[col])
+        span *= n_codes
+        if span >= 2**63:
+            return key_hashes(df, key_cols).view("int64")
+        keys = keys * n_codes + codes
+    return keys
+
+
+def key_hashes(df: DataFrame, key_cols: list = SILVER_KEY_COLS) -> np.ndarray:
+    """
+    64-bit hash of each row's key. Unlike `key_codes` it only depends on the
+    values, so hashes of separate batches can be compared.
+    """
+    return pd.util.hash_pandas_object(df[key_cols], index=False, categorize=True).to_numpy()
+
+
+def drop_duplicate_keys(df: DataFrame, key_cols: list = SILVER_KEY_COLS) -> DataFrame:
+    """
+    Keep the first row of every `key_cols` value; returns `df` itself when
+    there is nothing to drop
+    """
+    duplicated: np.ndarray = pd.Index(key_codes(df, key_cols)).duplicated(keep="first")
+    if not duplicated.any():
+        return df
+    return df.loc[~duplicated].reset_index(drop=True)
+
+
+class SilverValidator:
+    """
+    Data-quality statistics of the silver COVID output.
+
+    Every `update` makes one vectorized pass over a frame (a whole output or
+    one streamed batch) and accumulates null, negative-count and date-range
+    statistics.
+
+    Duplicate keys are counted exactly within a batch. Across batches only
+    one hash per location (the first key column) is kept, so memory is
+    bounded by the number of locations, not rows: a location's rows are
+    expected in one batch, as streamed batches hold whole RAW rows with
+    every date, so all rows of a location seen in an earlier batch count
+    as duplicates.
+    """
+
+    def __init__(
+            self,
+            key_cols: list = SILVER_KEY_COLS,
+            count_cols: list = COUNT_COLS,
+            date_col: str = "date",
+            min_date: pd.Timestamp = MIN_EXPECTED_DATE,
+            max_date: pd.Timestamp = None
+        ):
+        self.key_cols: list = key_cols
+        self.count_cols: list = count_cols
+        self.date_col: str = date_col
+        self.min_date: pd.Timestamp = min_date
+        self.max_date: pd.Timestamp = max_date or pd.Timestamp.now()
+
+        self.rows: int = 0
+        self.batches: int = 0
+        self.null_counts: dict = {}
+        self.negative_counts: dict = {}
+        self.dates_out_of_range: int = 0
+        self.first_date = None
+        self.last_date = None
+        self.duplicate_keys: int = 0
+        self._seen_locations: np.ndarray = np.array([], dtype="uint64")
+
+    def update(self, df: DataFrame) -> "SilverValidator":
+        self.rows += len(df)
+        self.batches += 1
+
+        for col, n_null in df.isna().sum().items():
+            self.null_counts[col] = self.null_counts.get(col, 0) + int(n_null)
+
+        for col in self.count_cols:
+            if col in df.columns:
+                values = df[col].to_numpy(dtype="float64", na_value=np.nan)
+                self.negative_counts[col] = self.negative_counts.get(col, 0) + int((values < 0).sum())
+
+        if self.date_col in df.columns and len(df):
+            dates = df[self.date_col]
+            first, last = dates.min(), dates.max()
+            if pd.notna(first):
+                self.first_date = first if self.first_date is None else min(self.first_date, first)
+                self.last_date = last if self.last_date is None else max(self.last_date, last)
+            self.dates_out_of_range += int(((dates < self.min_date) | (dates > self.max_date)).sum())
+
+        if all(col in df.columns for col in self.key_cols):
+            locations: np.ndarray = key_hashes(df, self.key_cols[:1])
+            seen: np.ndarray = np.isin(locations, self._seen_locations)
+            self.duplicate_keys += int(seen.sum())
+            self.duplicate_keys += int(pd.Index(key_codes(df[~seen], self.key_cols)).duplicated().sum())
+            self._seen_locations = np.union1d(self._seen_locations, locations)
+
+        return self
+
+    def summary(self) -> dict:
+        return {
+            "rows": self.rows,
+            "batches": self.batches,
+            "null_counts": self.null_counts,
+            "duplicate_keys": self.duplicate_keys,
+            "negative_counts": self.negative_counts,
+            "first_date": None if self.first_date is None else str(self.first_date),
+            "last_date": None if self.last_date is None else str(self.last_date),
+            "dates_out_of_range": self.dates_out_of_range,
+        }
+
+
+def validate_frame(df: DataFrame, **kwargs) -> dict:
+    # statistics of one complete frame; kwargs go to `SilverValidator`
+    return SilverValidator(**kwargs).update(df).summary()
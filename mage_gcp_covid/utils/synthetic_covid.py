@@ -0,0 +1,137 @@
+import zipfile
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from mage_gcp_covid.utils.covid_sources import RAW_DATASETS
+from mage_gcp_covid.utils.kaggle_ingest import RAW_FILES
+
+
+# first date column of the JHU files
+FIRST_DATE: str = "2020-01-22"
+
+US_STATES: list = [
+    "Alabama", "California", "District of Columbia", "Florida", "Illinois", "New York",
+    "Texas", "Washington", "Puerto Rico", "Diamond Princess",
+]
+COUNTRIES: list = ["Australia", "Canada", "China", "France", "Germany", "Italy", "Spain", "United Kingdom"]
+
+
+def date_headers(n_days: int) -> list:
+    # '1/22/20', '1/23/20', ... like the RAW headers
+    dates = pd.date_range(FIRST_DATE, periods=n_days, freq="D")
+    return [f"{date.month}/{date.day}/{date:%y}" for date in dates]
+
+
+def cumulative_counts(rng: np.random.Generator, n_rows: int, n_days: int, scale: float) -> np.ndarray:
+    """
+    Cumulative counts with a growing daily rate and occasional downward
+    corrections, as in the JHU data
+    """
+    rate = rng.gamma(2.0, scale, size=(n_rows, 1)) * np.linspace(0.0, 1.0, n_days)
+    daily = rng.poisson(rate)
+    corrections = rng.random((n_rows, n_days)) < 0.002
+    daily[corrections] = -rng.integers(1, 5, size=corrections.sum())
+    return np.cumsum(daily, axis=1)
+
+
+def generate_raw_us(n_counties: int, n_days: int, measure: str = "confirmed_cases", seed: int = 0) -> DataFrame:
+    """
+    Synthetic RAW_us_* wide frame with `n_counties` rows and `n_days` date columns
+    """
+    rng = np.random.default_rng(seed)
+    index = np.arange(n_counties)
+
+    states = np.array(US_STATES)[index % len(US_STATES)]
+    admin2 = np.array([f"County {i}" for i in index], dtype=object)
+    fips = (1000.0 + index).astype("float64")
+    fips[rng.random(n_counties) < 0.01] = np.nan
+
+    lat = rng.uniform(25.0, 48.0, n_counties)
+    lon = rng.uniform(-124.0, -67.0, n_counties)
+    # 'Unassigned' / 'Out of' rows carry 0,0 coordinates
+    placeholders = rng.random(n_counties) < 0.02
+    lat[placeholders], lon[placeholders] = 0.0, 0.0
+
+    df = DataFrame({
+        "UID": 84000000 + index,
+        "iso2": "US",
+        "iso3": "USA",
+        "code3": 840,
+        "FIPS": fips,
+        "Admin2": admin2,
+        "Province_State": states,
+        "Country_Region": "US",
+        "Lat": lat,
+        "Long_": lon,
+        "Combined_Key": [f"{county}, {state}, US" for county, state in zip(admin2, states)],
+    })
+    if measure == "deaths":
+        df["Population"] = rng.integers(1_000, 2_000_000, n_counties)
+
+    scale: float = 20.0 if measure == "confirmed_cases" else 0.5
+    values = DataFrame(cumulative_counts(rng, n_counties, n_days, scale), columns=date_headers(n_days))
+    return pd.concat([df, values], axis=1)
+
+
+def generate_raw_global(n_locations: int, n_days: int, measure: str = "confirmed_cases", seed: int = 0) -> DataFrame:
+    """
+    Synthetic RAW_global_* wide frame; every other location is a province.
+    Like the JHU files, (Province/State, Country/Region) is unique: country
+    level rows past the first round of COUNTRIES get a numbered country.
+    """
+    rng = np.random.default_rng(seed + 1)
+    index = np.arange(n_locations)
+
+    is_province = index % 2 == 0
+    countries = np.where(
+        is_province | (index < len(COUNTRIES)),
+        np.array(COUNTRIES)[index % len(COUNTRIES)],
+        [f"Country {i}" for i in index],
+    )
+    provinces = np.where(is_province, [f"Province {i}" for i in index], None)
+
+    df = DataFrame({
+        "Province/State": provinces,
+        "Country/Region": countries,
+        "Lat": rng.uniform(-60.0, 70.0, n_locations),
+        "Long": rng.uniform(-180.0, 180.0, n_locations),
+    })
+
+    scale: float = 50.0 if measure == "confirmed_cases" else 1.0
+    values = DataFrame(cumulative_counts(rng, n_locations, n_days, scale), columns=date_headers(n_days))
+    return pd.concat([df, values], axis=1)
+
+
+def generate_raw_datasets(n_counties: int, n_days: int, n_global: int = None, seed: int = 0) -> dict:
+    """
+    The four RAW frames keyed by file name; `n_global` defaults to a tenth
+    of the counties
+    """
+    n_global = n_global or max(n_counties // 10, 1)
+    frames: dict = {}
+    for name, dataset in RAW_DATASETS.items():
+        file_name: str = dataset["object_key"].rsplit("/", 1)[-1]
+        if dataset["scope"] == "us":
+            frames[file_name] = generate_raw_us(n_counties, n_days, dataset["measure"], seed)
+        else:
+            frames[file_name] = generate_raw_global(n_global, n_days, dataset["measure"], seed)
+    return frames
+
+
+def write_raw_archive(archive_path: str, n_counties: int, n_days: int, n_global: int = None, seed: int = 0) -> dict:
+    """
+    Write the four RAW files into a zip laid out like the Kaggle download.
+
+    Returns:
+        dict: {file name: rows}
+    """
+    frames: dict = generate_raw_datasets(n_counties, n_days, n_global, seed)
+    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for file_name in RAW_FILES:
+            buffer = StringIO()
+            frames[file_name].to_csv(buffer, index=False)
+            archive.writestr(file_name, buffer.getvalue())
+    return {file_name: len(df) for file_name, df in frames.items()}
@@ -0,0 +1,165 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+CACHE_DIR: str = ".weather_cache"
+CACHE_MAX_BYTES: int = 512 << 20
+
+# per variable, a flag column marking the dates that were fetched, so a
+# value the API returned as null is not requested again
+FETCHED_SUFFIX: str = "__fetched"
+
+
+class WeatherCache:
+    """
+    Local columnar cache of daily weather keyed by (grid cell, variable, date).
+
+    Each cell is one Parquet file with a `date` column, one column per
+    variable and one fetched flag per variable, so adding a variable or
+    extending the date range only fetches what is missing. When the cache
+    grows past `max_bytes`, the least recently used cell files are evicted.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes: int = max_bytes
+
+    def _path(self, cell_id: int) -> Path:
+        return self.cache_dir / f"cell_{int(cell_id)}.parquet"
+
+    def read_cell(self, cell_id: int) -> DataFrame:
+        path = self._path(cell_id)
+        if not path.exists():
+            return DataFrame({"date": pd.DatetimeIndex([], tz="UTC")})
+
+        # touch the file so eviction sees it as recently used
+        os.utime(path)
+        return pd.read_parquet(path)
+
+    @staticmethod
+    def _cached_dates(df_cell: DataFrame, variable: str):
+        # dates with a value, or fetched as null, for this variable
+        if variable not in df_cell.columns:
+            return df_cell["date"].iloc[:0]
+        known = df_cell[variable].notna()
+        if variable + FETCHED_SUFFIX in df_cell.columns:
+            known |= df_cell[variable + FETCHED_SUFFIX].eq(True)
+        return df_cell.loc[known, "date"]
+
+    def missing_ranges(self, cell_id: int, variables: list, start_date: str, end_date: str) -> list:
+        """
+        Contiguous date ranges in [start_date, end_date] over which the same
+        subset of `variables` is not cached for this cell
+
+        Returns:
+            list: [(start, end, (variable, ...)), ...], the variables in the
+            order of `variables`
+        """
+        dates = pd.date_range(start_date, end_date, freq="D", tz="UTC")
+        df_cell = self.read_cell(cell_id)
+
+        # (date, variable) matrix of what is still missing
+        missing = np.column_stack(
+            [~dates.isin(self._cached_dates(df_cell, variable)) for variable in variables]
+        ).reshape(len(dates), len(variables))
+
+        # split the dates missing anything into runs of consecutive days
+        # that miss the same variables
+        rows = np.flatnonzero(missing.any(axis=1))
+        if len(rows) == 0:
+            return []
+        breaks = np.flatnonzero((np.diff(rows) > 1) | (missing[rows[1:]] != missing[rows[:-1]]).any(axis=1))
+        run_starts = np.concatenate([[rows[0]], rows[breaks + 1]])
+        run_ends = np.concatenate([rows[breaks], [rows[-1]]])
+
+        return [
+            (
+                dates[start].strftime("%Y-%m-%d"),
+                dates[end].strftime("%Y-%m-%d"),
+                tuple(variable for variable, is_missing in zip(variables, missing[start]) if is_missing),
+            )
+            for start, end in zip(run_starts, run_ends)
+        ]
+
+    def put(self, df_weather: DataFrame) -> None:
+        """
+        Merge fetched rows (cell_id, date, variables...) into the cache;
+        new values win over cached ones, and every fetched (date, variable)
+        is flagged as cached even when its value is null
+        """
+        variables: list = [col for col in df_weather.columns if col not in ("cell_id", "date")]
+        fetched_cols: list = [variable + FETCHED_SUFFIX for variable in variables]
+
+        for cell_id, df_new in df_weather.groupby("cell_id", sort=False):
+            df_new = df_new.drop(columns="cell_id").assign(**dict.fromkeys(fetched_cols, True))
+            df_cell = self.read_cell(cell_id)
+
+            df_merged = (df_new.set_index("date")
+                .combine_first(df_cell.set_index("date"))
+                .reset_index()
+                .sort_values("date")
+            )
+            flag_cols: list = [col for col in df_merged.columns if col.endswith(FETCHED_SUFFIX)]
+            df_merged[flag_cols] = df_merged[flag_cols].eq(True)
+            df_merged.to_parquet(self._path(cell_id), index=False)
+
+    def get(self, cell_ids: list, variables: list, start_date: str, end_date: str) -> DataFrame:
+        """
+        Cached rows for `cell_ids` between the two dates, as a long frame
+        """
+        start = pd.Timestamp(start_date, tz="UTC")
+        end = pd.Timestamp(end_date, tz="UTC")
+
+        frames: list = []
+        for cell_id in cell_ids:
+            df_cell = self.read_cell(cell_id)
+            df_cell = df_cell[(df_cell["date"] >= start) & (df_cell["date"] <= end)]
+            if df_cell.empty:
+                continue
+            df_cell = df_cell.reindex(columns=["date"] + variables)
+            df_cell.insert(0, "cell_id", cell_id)
+            frames.append(df_cell)
+
+        if not frames:
+            return DataFrame(columns=["cell_id", "date"] + variables)
+        return pd.concat(frames, ignore_index=True)
+
+    def evict(self) -> list:
+        """
+        Delete least recently used cell files until the cache fits `max_bytes`.
+        Call it once the whole run has read what it needs: not from a shard,
+        since it could delete cells another shard is still writing or reading.
+        """
+        files: list = sorted(self.cache_dir.glob("cell_*.parquet"), key=lambda path: path.stat().st_mtime)
+        total_bytes: int = sum(path.stat().st_size for path in files)
+
+        evicted: list = []
+        for path in files:
+            if total_bytes <= self.max_bytes:
+                break
+            total_bytes -= path.stat().st_size
+            path.unlink()
+            evicted.append(path.name)
+
+        return evicted
+
+
+def group_cells_by_gaps(cache: WeatherCache, cell_ids: list, variables: list, start_date: str, end_date: str) -> dict:
+    """
+    Group cells by their missing date ranges and variables, so every group
+    can be fetched with one batched request of only those variables. Fully
+    cached cells are left out.
+
+    Returns:
+        dict: {(start, end, (variable, ...)): [cell_id, ...]}
+    """
+    requests: dict = {}
+    for cell_id in cell_ids:
+        for gap in cache.missing_ranges(cell_id, variables, start_date, end_date):
+            requests.setdefault(gap, []).append(cell_id)
+    return requests
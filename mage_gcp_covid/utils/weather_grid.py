@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+# grid spacing of the reanalysis behind the Open-Meteo archive (ERA5, 0.25°)
+GRID_RESOLUTION: float = 0.25
+
+
+def valid_coordinate_mask(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """
+    True for finite, in-range coordinates that are not the 0,0 placeholder
+    """
+    lat = np.asarray(lat, dtype="float64")
+    lon = np.asarray(lon, dtype="float64")
+    return (
+        np.isfinite(lat) & np.isfinite(lon)
+        & (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
+        & ~((lat == 0) & (lon == 0))
+    )
+
+
+def snap_to_grid(lat: np.ndarray, lon: np.ndarray, resolution: float = GRID_RESOLUTION) -> tuple:
+    """
+    Snap coordinates to the nearest grid point.
+
+    Returns:
+        tuple: (cell_id, cell_latitude, cell_longitude); the cell id is
+        row * n_cols + col on the global grid, so it is stable across runs
+    """
+    n_cols: int = int(round(360 / resolution))
+
+    row = np.rint((np.asarray(lat, dtype="float64") + 90) / resolution).astype("int64")
+    col = np.rint((np.asarray(lon, dtype="float64") + 180) / resolution).astype("int64") % n_cols
+
+    cell_id = row * n_cols + col
+    return cell_id, row * resolution - 90, col * resolution - 180
+
+
+def build_cell_index(
+        df: DataFrame,
+        key_col: str = "UID",
+        lat_col: str = "Lat",
+        lon_col: str = "Long_",
+        resolution: float = GRID_RESOLUTION
+    ) -> DataFrame:
+    """
+    Map every location key to its weather grid cell.
+
+    Invalid coordinates (missing, out of range, 0,0 placeholders) are
+    dropped. Many county centroids share a cell, so the weather of each
+    cell only has to be fetched and stored once.
+
+    Returns:
+        DataFrame: key, cell_id, latitude, longitude (cell center)
+    """
+    lat = df[lat_col].to_numpy(dtype="float64", na_value=np.nan)
+    lon = df[lon_col].to_numpy(dtype="float64", na_value=np.nan)
+    valid = valid_coordinate_mask(lat, lon)
+
+    cell_id, cell_lat, cell_lon = snap_to_grid(lat[valid], lon[valid], resolution)
+
+    return DataFrame({
+        key_col: df[key_col].to_numpy()[valid],
+        "cell_id": cell_id,
+        "latitude": cell_lat,
+        "longitude": cell_lon,
+    })
+
+
+def unique_cells(df_cell_index: DataFrame) -> DataFrame:
+    # one row per grid cell, sorted by cell id
+    return (df_cell_index[["cell_id", "latitude", "longitude"]]
+        .drop_duplicates("cell_id")
+        .sort_values("cell_id")
+        .reset_index(drop=True)
+    )
+
+
+def fan_out_to_locations(df_cells: DataFrame, df_cell_index: DataFrame, key_col: str = "UID") -> DataFrame:
+    """
+    Copy per-cell rows (e.g. daily weather) to every location in that cell.
+
+    The cell rows are sorted once; each location then takes a contiguous
+    slice found with `searchsorted`, and all slices are gathered with one
+    vectorized `take`.
+    """
+    df_cells = df_cells.sort_values("cell_id", kind="stable").reset_index(drop=True)
+    cells = df_cells["cell_id"].to_numpy()
+
+    location_cells = df_cell_index["cell_id"].to_numpy()
+    starts = np.searchsorted(cells, location_cells, side="left")
+    counts = np.searchsorted(cells, location_cells, side="right") - starts
+
+    # positions: starts[i], starts[i] + 1, ..., starts[i] + counts[i] - 1
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    positions = np.repeat(starts, counts) + offsets
+
+    df_out = df_cells.take(positions).reset_index(drop=True)
+    df_out.insert(0, key_col, np.repeat(df_cell_index[key_col].to_numpy(), counts))
+    return df_out
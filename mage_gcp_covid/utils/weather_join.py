@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from mage_gcp_covid.utils.weather_grid import build_cell_index
+
+
+def day_numbers(dates) -> np.ndarray:
+    # days since 1970-01-01 as int64; tz-aware dates are taken in UTC
+    dates = pd.Series(dates)
+    if isinstance(dates.dtype, pd.DatetimeTZDtype):
+        dates = dates.dt.tz_convert(None)
+    return dates.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]").astype("int64")
+
+
+def key_numbers(keys, sentinel: int = -1) -> np.ndarray:
+    # integer keys as int64; null keys get the sentinel, which no index holds
+    keys = pd.Series(keys)
+    is_null = keys.isna().to_numpy()
+    numbers = np.full(len(keys), sentinel, dtype="int64")
+    numbers[~is_null] = keys[~is_null].to_numpy(dtype="int64")
+    return numbers
+
+
+def lookup_cells(keys: np.ndarray, df_cell_index: DataFrame, key_col: str = "uid") -> np.ndarray:
+    """
+    Grid cell of every key through a sorted key -> cell_id index; keys
+    without a cell (invalid coordinates, null key) get -1
+    """
+    df_cell_index = df_cell_index.dropna(subset=[key_col])
+    index_keys = df_cell_index[key_col].to_numpy(dtype="int64")
+    index_cells = df_cell_index["cell_id"].to_numpy(dtype="int64")
+    order = np.argsort(index_keys, kind="stable")
+    index_keys, index_cells = index_keys[order], index_cells[order]
+
+    if len(index_keys) == 0:
+        return np.full(len(keys), -1, dtype="int64")
+    positions = np.minimum(np.searchsorted(index_keys, keys), len(index_keys) - 1)
+    return np.where(index_keys[positions] == keys, index_cells[positions], -1)
+
+
+def join_weather(
+        df_covid: DataFrame,
+        df_weather: DataFrame,
+        variables: list,
+        df_cell_index: DataFrame = None,
+        key_col: str = "uid",
+        lags: list = None,
+        tolerance_days: int = 0
+    ) -> DataFrame:
+    """
+    Add daily weather columns to (key, date) COVID rows.
+
+    Every COVID row is mapped to its grid cell; cell and day are packed into
+    one int64 key on both sides, the weather keys are sorted once and each
+    row finds its weather row with `searchsorted`. This is a sort-merge /
+    as-of join on plain integer arrays: no pandas merge, and only the
+    weather variables are gathered.
+
+    Args:
+        df_cell_index: key -> cell_id mapping; built from the COVID rows'
+            lat/long columns when not given
+        lags: add `<variable>_lag<n>` columns with the weather n days before
+        tolerance_days: use the latest weather up to this many days before
+            the row's date when the exact day is missing (as-of join)
+
+    Returns:
+        DataFrame: df_covid with a cell_id column and the weather columns
+        (NaN where no weather matched)
+    """
+    if df_cell_index is None:
+        df_locations = df_covid.drop_duplicates(key_col)
+        df_cell_index = build_cell_index(df_locations, key_col=key_col, lat_col="lat", lon_col="long")
+
+    # rows without a key get the -1 sentinel and stay unmatched
+    covid_cells = lookup_cells(key_numbers(df_covid[key_col]), df_cell_index, key_col)
+    covid_days = day_numbers(df_covid["date"])
+
+    weather_cells = df_weather["cell_id"].to_numpy(dtype="int64")
+    weather_days = day_numbers(df_weather["date"])
+
+    # pack (cell, day) into one sortable key: cell * span + day offset
+    max_lag: int = max(lags or [0]) + tolerance_days
+    day_min: int = int(min(weather_days.min(initial=0), covid_days.min(initial=0))) - max_lag
+    span: int = int(max(weather_days.max(initial=0), covid_days.max(initial=0))) - day_min + 1
+
+    # a leading sentinel key (-1, never matched) keeps every lookup in bounds
+    weather_keys = weather_cells * span + (weather_days - day_min)
+    order = np.argsort(weather_keys, kind="stable")
+    weather_keys = np.concatenate([[-1], weather_keys[order]])
+    weather_values: dict = {
+        variable: np.concatenate([
+            [np.nan], df_weather[variable].to_numpy(dtype="float32", na_value=np.nan)[order]
+        ]).astype("float32")
+        for variable in variables
+    }
+
+    def match(lag: int) -> tuple:
+        # position of the latest weather row at or before (day - lag) in the same cell
+        keys = covid_cells * span + (covid_days - lag - day_min)
+        positions = np.maximum(np.searchsorted(weather_keys, keys, side="right") - 1, 0)
+        matched_keys = weather_keys[positions]
+        matched = (
+            (covid_cells >= 0)
+            & (matched_keys // span == covid_cells)
+            & (keys - matched_keys <= tolerance_days)
+        )
+        # unmatched rows point at the sentinel, whose values are NaN
+        return np.where(matched, positions, 0)
+
+    df_out = df_covid.copy(deep=False)
+    df_out["cell_id"] = pd.arrays.IntegerArray(np.maximum(covid_cells, 0), covid_cells < 0)
+
+    for lag in [0] + list(lags or []):
+        positions = match(lag)
+        suffix: str = f"_lag{lag}" if lag else ""
+        for variable, values in weather_values.items():
+            df_out[variable + suffix] = values[positions]
+
+    return df_out
@@ -1,9 +1,10 @@
 import openmeteo_requests
 
 import requests_cache
-import pandas as pd
 from retry_requests import retry
 
+from mage_gcp_covid.utils.openmeteo import decode_responses, decoded_to_frame
+
 def get_openmeteo_api_data(url: str, params: dict) -> None:
 
     # Setup the Open-Meteo API client with cache and retry on error
@@ -22,19 +23,10 @@ def get_openmeteo_api_data(url: str, params: dict) -> None:
     print(f"Timezone difference to GMT+0 {response.UtcOffsetSeconds}")
 
     # Process hourly data. The order of variables needs to be the same as requested.
-    hourly = response.Hourly()
-    hourly_temp_2m = hourly.Variables(0).ValuesAsNumpy()
-
-    hourly_data = {"date": pd.date_range(
-	start = pd.to_datetime(hourly.Time(), unit = "s", utc = True),
-	end = pd.to_datetime(hourly.TimeEnd(), unit = "s", utc = True),
-	freq = pd.Timedelta(seconds = hourly.Interval()),
-	inclusive = "left"
-    )}
-
-    hourly_data["temperature_2m"] = hourly_temp_2m
+    variables = [params["hourly"]] if isinstance(params["hourly"], str) else list(params["hourly"])
+    decoded = decode_responses(responses, variables, kind="hourly")
 
-    hourly_dataframe = pd.DataFrame(data = hourly_data)
+    hourly_dataframe = decoded_to_frame(decoded, variables, range(len(responses)), id_col="location")
     print(hourly_dataframe)
 
 def main() -> None:
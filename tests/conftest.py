@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from mage_gcp_covid.utils.gcs import clear_storage_clients, get_bucket  # noqa: E402
+from mage_gcp_covid.utils.local_gcs import LOCAL_GCS_ROOT_ENV  # noqa: E402
+
+
+@pytest.fixture
+def make_raw_us():
+    """
+    Factory of small RAW_us_* wide frames: the JHU meta columns plus one
+    cumulative count column per day
+    """
+    def make(n_rows: int, n_days: int, seed: int = 0) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        index = np.arange(n_rows)
+        df = pd.DataFrame({
+            "UID": 84000000 + index,
+            "iso2": "US",
+            "iso3": "USA",
+            "code3": 840,
+            "FIPS": np.where(index % 7 == 0, np.nan, 1000.0 + index),
+            "Admin2": [f"County {i}" for i in index],
+            "Province_State": np.array(["Iowa", "Ohio", "Utah"])[index % 3],
+            "Country_Region": "US",
+            "Lat": rng.uniform(25.0, 48.0, n_rows),
+            "Long_": rng.uniform(-124.0, -67.0, n_rows),
+            "Combined_Key": [f"County {i}, US" for i in index],
+        })
+        dates = pd.date_range("2020-01-22", periods=n_days, freq="D")
+        counts = np.cumsum(rng.integers(0, 20, (n_rows, n_days)), axis=1)
+        values = pd.DataFrame(counts, columns=[f"{date.month}/{date.day}/{date:%y}" for date in dates])
+        return pd.concat([df, values], axis=1)
+
+    return make
+
+
+@pytest.fixture
+def local_bucket(tmp_path, monkeypatch):
+    # a bucket of the filesystem GCS stand-in, rooted in the test's tmp dir
+    monkeypatch.setenv(LOCAL_GCS_ROOT_ENV, str(tmp_path / "gcs"))
+    clear_storage_clients()
+    yield get_bucket("covid-medallion-lake")
+    clear_storage_clients()
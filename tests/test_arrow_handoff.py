@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from mage_gcp_covid.utils.arrow_handoff import (
+    ARROW_HANDOFF_ENV,
+    is_handoff,
+    read_handoff,
+    release_handoff,
+    use_arrow_handoff,
+    write_handoff,
+)
+
+
+@pytest.fixture(autouse=True)
+def handoff_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(ARROW_HANDOFF_ENV, str(tmp_path))
+    return tmp_path
+
+
+def make_frames() -> tuple:
+    df_long = pd.DataFrame({
+        "uid": pd.array(["1", "2", None], dtype="string"),
+        "date": pd.to_datetime(["2020-03-01", "2020-03-02", "2020-03-03"]),
+        "confirmed_cases": np.array([1, 2, 3], dtype="int64"),
+        "lat": np.array([41.5, np.nan, 40.0]),
+    })
+    df_locations = pd.DataFrame({"uid": pd.Categorical(["1", "2"]), "admin2": ["Polk", "Story"]})
+    return df_long, df_locations
+
+
+def test_handoff_round_trips_frames_and_tuples(handoff_dir):
+    df_long, df_locations = make_frames()
+
+    reference: dict = write_handoff((df_long, df_locations), "clean_and_standardize", pipeline_uuid="silver")
+
+    assert is_handoff(reference) and reference["rows_out"] == 5
+    assert all(Path(path).parent == handoff_dir / "silver" for path in reference["arrow_handoff"])
+    df_long_read, df_locations_read = read_handoff(reference)
+    assert_frame_equal(df_long_read, df_long)
+    assert_frame_equal(df_locations_read, df_locations)
+
+    single = read_handoff(write_handoff(df_long, "load_covid_raw"))
+    assert_frame_equal(single, df_long)
+
+
+def test_mapped_columns_are_read_only_views():
+    df_long, _ = make_frames()
+    df = read_handoff(write_handoff(df_long, "load_covid_raw"))
+    assert not df["confirmed_cases"].to_numpy().flags.writeable
+
+
+def test_released_files_are_deleted(handoff_dir):
+    df_long, _ = make_frames()
+    references: list = [write_handoff(df_long, f"shard_{i}") for i in range(3)]
+    df_kept = read_handoff(references[0])
+
+    release_handoff(references[:2])
+    release_handoff(references[2])
+
+    assert list(handoff_dir.rglob("*.arrow")) == []
+    # frames mapped before the release stay valid
+    assert_frame_equal(df_kept, df_long)
+    with pytest.raises(FileNotFoundError):
+        read_handoff(references[1])
+
+
+def test_plain_outputs_pass_through():
+    df_long, _ = make_frames()
+    assert read_handoff(df_long) is df_long
+    assert not is_handoff({"rows_out": 3})
+    release_handoff({"rows_out": 3})
+    assert use_arrow_handoff(handoff="arrow") and not use_arrow_handoff()
@@ -0,0 +1,42 @@
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from mage_gcp_covid.utils.covid_model import LOCATION_KEY, build_dim_location, build_fact_daily, join_location
+from mage_gcp_covid.utils.covid_reshape import (
+    COMPACT_DATA_TYPES,
+    META_COLS,
+    SILVER_DATA_TYPES,
+    get_date_cols,
+    melt_wide_to_long,
+)
+
+
+def test_star_model_joins_back_to_the_wide_layout(make_raw_us):
+    df_raw = make_raw_us(25, 8)
+    date_cols = get_date_cols(df_raw.columns)
+
+    df_dim = build_dim_location(df_raw, SILVER_DATA_TYPES)
+    df_fact = build_fact_daily(df_raw, date_cols, SILVER_DATA_TYPES)
+
+    assert len(df_dim) == 25 and df_dim[LOCATION_KEY].is_unique
+    assert df_fact.columns.tolist() == [LOCATION_KEY, "date", "confirmed_cases"]
+
+    df_joined = join_location(df_fact, df_dim)
+    expected = melt_wide_to_long(df_raw, META_COLS, date_cols, data_types=SILVER_DATA_TYPES)
+    assert_frame_equal(df_joined[expected.columns.tolist()], expected)
+
+
+def test_join_location_with_compact_keys_and_unknown_locations(make_raw_us):
+    df_raw = make_raw_us(10, 3)
+    date_cols = get_date_cols(df_raw.columns)
+
+    df_dim = build_dim_location(df_raw.iloc[:8], SILVER_DATA_TYPES)
+    df_fact = build_fact_daily(df_raw, date_cols, COMPACT_DATA_TYPES)
+    assert isinstance(df_fact[LOCATION_KEY].dtype, pd.CategoricalDtype)
+
+    df_joined = join_location(df_fact, df_dim, columns=["admin2", "lat"])
+
+    known = df_joined[LOCATION_KEY].astype("string").isin(df_dim[LOCATION_KEY])
+    assert known.sum() == 8 * 3
+    assert df_joined.loc[~known, ["admin2", "lat"]].isna().all().all()
+    assert (df_joined.loc[known, "admin2"].str.startswith("County")).all()
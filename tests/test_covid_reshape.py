@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from mage_gcp_covid.utils.covid_reshape import (
+    COMPACT_DATA_TYPES,
+    META_COLS,
+    SILVER_DATA_TYPES,
+    apply_dtype_profile,
+    cast_values,
+    fits_int_dtype,
+    get_date_cols,
+    melt_wide_to_long,
+    standardize_column_names,
+)
+
+
+def reference_melt(df_raw: pd.DataFrame, date_cols: list, row_block: int = None) -> pd.DataFrame:
+    # pd.melt (in chunks of `row_block` rows), then rename, cast and parse dates
+    row_block = row_block or len(df_raw)
+    df_long = pd.concat(
+        [
+            pd.melt(df_raw.iloc[start:start + row_block], id_vars=META_COLS, value_vars=date_cols,
+                    var_name="date", value_name="confirmed_cases")
+            for start in range(0, len(df_raw), row_block)
+        ],
+        ignore_index=True,
+    )
+    df_long.columns = standardize_column_names(df_long.columns)
+    df_long["date"] = pd.to_datetime(df_long["date"], format="%m/%d/%y")
+    return apply_dtype_profile(df_long, SILVER_DATA_TYPES)
+
+
+@pytest.mark.parametrize("row_block", [None, 7])
+def test_melt_wide_to_long_matches_pd_melt(make_raw_us, row_block):
+    df_raw = make_raw_us(30, 12)
+    date_cols = get_date_cols(df_raw.columns)
+
+    df_long = melt_wide_to_long(df_raw, META_COLS, date_cols, data_types=SILVER_DATA_TYPES, row_block=row_block)
+
+    expected = reference_melt(df_raw, date_cols, row_block)
+    assert_frame_equal(df_long, expected[df_long.columns.tolist()])
+    assert len(df_long) == 30 * 12
+
+
+def test_compact_profile_holds_the_standard_values(make_raw_us):
+    df_raw = make_raw_us(40, 10)
+    date_cols = get_date_cols(df_raw.columns)
+
+    df_standard = melt_wide_to_long(df_raw, META_COLS, date_cols, data_types=SILVER_DATA_TYPES)
+    df_compact = melt_wide_to_long(df_raw, META_COLS, date_cols, data_types=COMPACT_DATA_TYPES)
+
+    assert isinstance(df_compact["uid"].dtype, pd.CategoricalDtype)
+    assert df_compact["lat"].dtype == np.float32
+    # one fixed width, whatever range of counts this frame holds
+    assert df_compact["confirmed_cases"].dtype == np.int32
+    assert df_compact.memory_usage(deep=True).sum() < df_standard.memory_usage(deep=True).sum()
+
+    restored = df_compact.astype({
+        col: df_standard[col].dtype for col in df_compact.columns if col not in ["lat", "long"]
+    })
+    assert_frame_equal(restored.drop(columns=["lat", "long"]), df_standard.drop(columns=["lat", "long"]))
+    np.testing.assert_allclose(df_compact["lat"], df_standard["lat"], rtol=1e-6)
+
+
+@pytest.mark.parametrize("values, fits", [
+    ([0, 40_000], True),
+    ([-2**31, 2**31 - 1], True),
+    ([0, 2**31], False),
+    ([np.nan, 5.0], True),
+])
+def test_fits_int_dtype(values, fits):
+    assert fits_int_dtype(np.array(values), np.int32) is fits
+
+
+def test_fits_int_dtype_of_a_frame_without_dates():
+    # a (n_rows, 0) block, e.g. an incremental run with no new date columns
+    assert fits_int_dtype(np.empty((5, 0)), np.int32)
+
+
+def test_counts_out_of_the_profile_width_are_not_wrapped():
+    assert cast_values(np.array([[1, 2**31 - 1]]), "int32").dtype == np.int32
+    with pytest.raises(ValueError, match="int32"):
+        cast_values(np.array([[1, 2**31]]), "int32")
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_array_equal
+
+from mage_gcp_covid.utils.covid_reshape import META_COLS, get_date_cols, standardize_column_names
+from mage_gcp_covid.utils.covid_sources import (
+    LOCATION_COLS,
+    MEASURES,
+    SCOPE_KEY_COLS,
+    align_measures,
+    harmonize_raw_columns,
+    melt_measures,
+)
+from mage_gcp_covid.utils.synthetic_covid import generate_raw_global, generate_raw_us
+
+
+def test_global_files_are_mapped_onto_the_us_meta_layout():
+    df_global = pd.DataFrame({
+        "Province/State": ["Ontario", None],
+        "Country/Region": ["Canada", "France"],
+        "Lat": [51.2, 46.2],
+        "Long": [-85.3, 2.2],
+        "1/22/20": [0, 1],
+        "1/23/20": [2, 3],
+    })
+
+    df = harmonize_raw_columns(df_global, "global")
+
+    assert df.columns.tolist() == META_COLS + ["1/22/20", "1/23/20"]
+    assert df["Combined_Key"].tolist() == ["Ontario, Canada", "France"]
+    assert df["Long_"].tolist() == [-85.3, 2.2]
+    assert df["UID"].isna().all()
+
+
+def test_extra_us_columns_are_dropped(make_raw_us):
+    df_deaths = make_raw_us(4, 3).assign(Population=np.arange(4))
+
+    df = harmonize_raw_columns(df_deaths, "us")
+
+    assert "Population" not in df.columns
+    assert df.columns.tolist()[:len(META_COLS)] == META_COLS
+
+
+def scope_frames(scope: str, n_locations: int = 20, n_days: int = 10) -> dict:
+    generate = generate_raw_us if scope == "us" else generate_raw_global
+    return {
+        measure: harmonize_raw_columns(generate(n_locations, n_days, measure), scope)
+        for measure in MEASURES
+    }
+
+
+def reference_merge(frames: dict, scope: str) -> pd.DataFrame:
+    # melt every measure file, then outer merge them on the location key and date
+    key_cols: list = standardize_column_names(SCOPE_KEY_COLS[scope]).tolist()
+    melted: list = []
+    for measure, df in frames.items():
+        df_long = pd.melt(df, id_vars=SCOPE_KEY_COLS[scope], value_vars=get_date_cols(df.columns),
+                          var_name="date", value_name=measure)
+        df_long.columns = standardize_column_names(df_long.columns)
+        df_long["date"] = pd.to_datetime(df_long["date"], format="%m/%d/%y")
+        melted.append(df_long)
+    df_merged = melted[0].merge(melted[1], on=key_cols + ["date"], how="outer")
+    return df_merged.sort_values(key_cols + ["date"]).reset_index(drop=True)
+
+
+def melt_scope(frames: dict, scope: str) -> pd.DataFrame:
+    df_meta, date_cols, grids = align_measures(frames, SCOPE_KEY_COLS[scope])
+    return melt_measures(df_meta, date_cols, grids, scope)
+
+
+def test_melt_measures_matches_merged_melts():
+    for scope in SCOPE_KEY_COLS:
+        frames = scope_frames(scope)
+        key_cols: list = standardize_column_names(SCOPE_KEY_COLS[scope]).tolist()
+
+        df_fact = melt_scope(frames, scope)
+        expected = reference_merge(frames, scope)
+        df_fact = df_fact.sort_values(key_cols + ["date"]).reset_index(drop=True)
+
+        assert df_fact.columns.tolist() == LOCATION_COLS + ["date"] + MEASURES
+        assert (df_fact["scope"] == scope).all()
+        assert len(df_fact) == len(expected) == 20 * 10
+        for measure in MEASURES:
+            assert_array_equal(df_fact[measure].to_numpy(dtype="float64", na_value=np.nan),
+                               expected[measure].to_numpy(dtype="float64"))
+
+
+def test_align_measures_ignores_coordinate_mismatches():
+    frames = scope_frames("us", n_locations=5, n_days=4)
+    df_deaths = frames["deaths"]
+    # the deaths file rounds one location's coordinates, misses another's
+    # and drops the last location and day
+    df_deaths.loc[0, "Lat"] = round(df_deaths.loc[0, "Lat"], 2)
+    df_deaths.loc[1, "Lat"] = np.nan
+    frames["deaths"] = df_deaths.iloc[:-1].drop(columns=get_date_cols(df_deaths.columns)[-1])
+
+    df_fact = melt_scope(frames, "us")
+
+    assert len(df_fact) == 5 * 4
+    assert df_fact["uid"].nunique() == 5
+    assert df_fact["confirmed_cases"].notna().all()
+    # 4 days of the dropped location, 1 dropped day of the 4 others
+    assert df_fact["deaths"].isna().sum() == 4 + 4
+    assert df_fact.loc[df_fact["uid"] == df_deaths.loc[1, "UID"], "lat"].notna().all()
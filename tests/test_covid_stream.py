@@ -0,0 +1,32 @@
+import io
+
+import pandas as pd
+import pyarrow.parquet as pq
+from pandas.testing import assert_frame_equal
+
+from mage_gcp_covid.utils.covid_reshape import META_COLS, SILVER_DATA_TYPES, get_date_cols, melt_wide_to_long
+from mage_gcp_covid.utils.covid_stream import stream_raw_to_parquet
+
+
+def test_streamed_batches_match_batch_melt(make_raw_us):
+    csv_bytes: bytes = make_raw_us(200, 15).to_csv(index=False).encode("utf-8")
+    sink = io.BytesIO()
+
+    # a small block size splits the CSV into several record batches
+    summary = stream_raw_to_parquet(io.BytesIO(csv_bytes), sink, block_size=8 << 10)
+
+    df_raw = pd.read_csv(io.BytesIO(csv_bytes))
+    expected = melt_wide_to_long(df_raw, META_COLS, get_date_cols(df_raw.columns), data_types=SILVER_DATA_TYPES)
+
+    sink.seek(0)
+    df_streamed = pq.read_table(sink).to_pandas()
+
+    assert summary["batches"] > 1
+    assert summary["rows_in"] == 200
+    assert summary["rows_out"] == len(expected)
+    # rows come out batch by batch, so compare in (uid, date) order
+    key_cols: list = ["uid", "date"]
+    assert_frame_equal(
+        df_streamed.sort_values(key_cols).reset_index(drop=True),
+        expected.sort_values(key_cols).reset_index(drop=True),
+    )
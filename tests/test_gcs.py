@@ -0,0 +1,28 @@
+import pytest
+
+from mage_gcp_covid.utils.gcs import load_csv_arrow
+
+
+OBJECT_KEY: str = "01_bronze_landing/covid/RAW_us_deaths.csv"
+
+
+@pytest.fixture
+def raw_csv(local_bucket):
+    local_bucket.blob(OBJECT_KEY).upload_from_string("UID,Province_State,1/22/20,1/23/20\n1,Iowa,0,2\n2,,1,3\n")
+    return local_bucket
+
+
+@pytest.mark.parametrize("columns, expected", [
+    (None, ["UID", "Province_State", "1/22/20", "1/23/20"]),
+    (["UID", "1/23/20"], ["UID", "1/23/20"]),
+    (lambda col: col.startswith("1/"), ["1/22/20", "1/23/20"]),
+])
+def test_only_the_selected_columns_are_read(raw_csv, columns, expected):
+    df = load_csv_arrow(raw_csv.name, OBJECT_KEY, columns=columns)
+    assert df.columns.tolist() == expected
+    assert len(df) == 2
+
+
+@pytest.mark.parametrize("columns", [[], lambda col: col.startswith("2/")])
+def test_an_empty_selection_reads_no_columns(raw_csv, columns):
+    assert load_csv_arrow(raw_csv.name, OBJECT_KEY, columns=columns).empty
@@ -0,0 +1,38 @@
+import io
+from contextlib import contextmanager
+
+from mage_gcp_covid.utils.gcs_transfer import upload_streams
+
+
+def byte_source(name: str, data: bytes) -> dict:
+    @contextmanager
+    def open_stream():
+        yield io.BytesIO(data)
+
+    return {"name": name, "blob_name": f"raw/{name}", "size": len(data), "open": open_stream}
+
+
+def test_unchanged_sources_are_skipped(local_bucket):
+    sources: list = [byte_source(f"file_{i}.csv", f"a,b\n{i},{i}\n".encode()) for i in range(3)]
+
+    first = upload_streams(local_bucket, sources)
+    assert (first["uploaded"], first["skipped"], first["failed"]) == (3, 0, 0)
+    assert local_bucket.blob("raw/file_1.csv").download_as_bytes() == b"a,b\n1,1\n"
+
+    # same size, different content: only the changed source is uploaded again
+    sources[1] = byte_source("file_1.csv", b"a,b\n9,9\n")
+    second = upload_streams(local_bucket, sources)
+    assert (second["uploaded"], second["skipped"], second["failed"]) == (1, 2, 0)
+    assert [file["status"] for file in second["files"]] == ["skipped", "uploaded", "skipped"]
+    assert local_bucket.blob("raw/file_1.csv").download_as_bytes() == b"a,b\n9,9\n"
+
+
+def test_failed_sources_are_reported(local_bucket):
+    def broken():
+        raise OSError("member is corrupt")
+
+    source: dict = {"name": "bad.csv", "blob_name": "raw/bad.csv", "size": 3, "open": broken}
+    summary = upload_streams(local_bucket, [source])
+
+    assert summary["failed"] == 1
+    assert "member is corrupt" in summary["files"][0]["error"]
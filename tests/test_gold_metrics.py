@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose
+
+from mage_gcp_covid.utils.gold_metrics import build_daily_metrics
+
+
+def make_silver(seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2020-03-01", periods=40, freq="D")
+    n_locations: int = 6
+
+    cases = np.cumsum(rng.integers(0, 50, (n_locations, len(dates))), axis=1).astype("float64")
+    # downward corrections and missing reports
+    cases[rng.random(cases.shape) < 0.05] -= 200
+    cases[rng.random(cases.shape) < 0.03] = np.nan
+
+    df = pd.DataFrame({
+        "uid": np.repeat(84000000 + np.arange(n_locations), len(dates)),
+        "province_state": np.repeat([f"State {i}" for i in range(n_locations)], len(dates)),
+        "date": np.tile(dates, n_locations),
+        "confirmed_cases": cases.ravel(),
+    })
+    # silver rows arrive in no particular order
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def reference_metrics(df: pd.DataFrame, measure: str, windows: list, growth_period: int) -> pd.DataFrame:
+    df = df.sort_values(["uid", "date"]).reset_index(drop=True)
+    groups = df.groupby("uid", sort=False)[measure]
+
+    out = pd.DataFrame({"uid": df["uid"], "date": df["date"]})
+    first_of_location = ~df["uid"].duplicated()
+
+    out[f"new_{measure}"] = groups.diff().where(~first_of_location, df[measure])
+
+    # cap every value with the smallest one reported after it; NaN stays NaN
+    reversed_min = (
+        df.iloc[::-1].groupby("uid", sort=False)[measure]
+        .transform(lambda values: values.fillna(np.inf).cummin())
+        .iloc[::-1]
+        .replace(np.inf, np.nan)
+    )
+    repaired = reversed_min.where(df[measure].notna()).clip(lower=0.0)
+    out[f"{measure}_repaired"] = repaired
+
+    new_repaired = repaired.groupby(df["uid"], sort=False).diff().where(~first_of_location, repaired)
+    out[f"new_{measure}_repaired"] = new_repaired
+
+    for window in windows:
+        out[f"new_{measure}_{window}d_avg"] = (
+            new_repaired.groupby(df["uid"], sort=False).rolling(window).mean().reset_index(level=0, drop=True)
+        )
+
+    average = out[f"new_{measure}_{windows[0]}d_avg"]
+    rate = average / average.groupby(df["uid"], sort=False).shift(growth_period) - 1.0
+    out[f"new_{measure}_growth"] = rate.where(np.isfinite(rate))
+    return out
+
+
+def test_build_daily_metrics_matches_groupby():
+    df = make_silver()
+
+    df_gold = build_daily_metrics(df, ["confirmed_cases"], windows=[7, 14], growth_period=7)
+    expected = reference_metrics(df, "confirmed_cases", [7, 14], 7)
+
+    assert df_gold["uid"].tolist() == expected["uid"].tolist()
+    assert (df_gold["date"] == expected["date"]).all()
+    assert "province_state" in df_gold.columns
+    for col in expected.columns.drop(["uid", "date"]):
+        assert_allclose(df_gold[col].to_numpy(dtype="float64"), expected[col].to_numpy(dtype="float64"),
+                        rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=col)
+
+
+def test_repaired_counts_never_decrease():
+    df_gold = build_daily_metrics(make_silver(1), ["confirmed_cases"])
+    new_repaired = df_gold["new_confirmed_cases_repaired"].dropna()
+    assert (new_repaired >= 0).all()
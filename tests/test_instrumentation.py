@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+from mage_gcp_covid.utils.instrumentation import LEDGER_COLUMNS, instrument, read_ledger
+from mage_gcp_covid.utils.profiling import add_gcs_bytes, count_rows
+
+
+def test_block_costs_are_appended_to_the_ledger(tmp_path):
+    @instrument(block="melt", ledger_dir=str(tmp_path))
+    def transform(df, *args, **kwargs):
+        add_gcs_bytes(received=1000)
+        return pd.concat([df, df], ignore_index=True)
+
+    df = pd.DataFrame({"uid": ["1", "2", "3"]})
+    for _ in range(2):
+        df_out = transform(df, pipeline_uuid="bronze_to_silver", pipeline_run_id=42)
+
+    assert len(df_out) == 6
+    df_ledger = read_ledger(str(tmp_path))
+    assert df_ledger.columns.tolist()[:len(LEDGER_COLUMNS)] == LEDGER_COLUMNS
+    assert len(df_ledger) == 2
+    assert df_ledger["block"].tolist() == ["melt", "melt"]
+    assert df_ledger["run_id"].tolist() == ["42", "42"]
+    assert df_ledger["status"].tolist() == ["success", "success"]
+    assert df_ledger["rows_in"].tolist() == [3, 3] and df_ledger["rows_out"].tolist() == [6, 6]
+    assert (df_ledger["gcs_bytes_received"] >= 1000).all()
+    assert (df_ledger["seconds"] >= 0).all()
+
+
+def test_read_ledger_filters_by_block_and_pipeline(tmp_path):
+    for pipeline, block in [("ingest", "load"), ("ingest", "export"), ("silver", "load")]:
+        instrument(lambda *args, **kwargs: None, block=block, ledger_dir=str(tmp_path))(pipeline_uuid=pipeline)
+
+    assert len(read_ledger(str(tmp_path), block="load")) == 2
+    assert read_ledger(str(tmp_path), block="load", pipeline="silver")["pipeline"].tolist() == ["silver"]
+    assert read_ledger(str(tmp_path / "missing")).empty
+
+
+def test_failed_blocks_are_recorded_and_raise(tmp_path):
+    @instrument(block="export", ledger_dir=str(tmp_path))
+    def export(df, *args, **kwargs):
+        raise RuntimeError("bucket not found")
+
+    with pytest.raises(RuntimeError):
+        export(pd.DataFrame({"uid": ["1"]}))
+
+    record = read_ledger(str(tmp_path)).iloc[0]
+    assert record["status"] == "failed"
+    assert "bucket not found" in record["error"]
+    assert record["rows_in"] == 1 and record["rows_out"] == 0
+
+
+def test_count_rows_of_block_outputs():
+    df = pd.DataFrame({"uid": ["1", "2"]})
+    assert count_rows(df) == 2
+    assert count_rows((df, df)) == 4
+    assert count_rows({"rows_out": 7}) == 7
+    assert count_rows(None) == 0
+
+
+def test_successful_and_failed_records_read_back_together(tmp_path):
+    # `error` is null in a successful record and a string in a failed one
+    @instrument(block="load", ledger_dir=str(tmp_path))
+    def load(fail: bool = False, **kwargs):
+        if fail:
+            raise ValueError("no such file")
+        return pd.DataFrame({"uid": ["1"]})
+
+    load()
+    with pytest.raises(ValueError):
+        load(fail=True)
+
+    df_ledger = read_ledger(str(tmp_path), block="load")
+    assert df_ledger["status"].tolist() == ["success", "failed"]
+    assert df_ledger["error"].isna().tolist() == [True, False]
+    assert str(df_ledger["started_at"].dt.tz) == "UTC"
@@ -0,0 +1,81 @@
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+from mage_gcp_covid.utils.covid_sources import BRONZE_COVID_PREFIX
+from mage_gcp_covid.utils.kaggle_ingest import (
+    RAW_FILES,
+    get_dataset_version,
+    is_landed,
+    stream_zip_members_to_gcs,
+    write_version_marker,
+)
+
+
+class DatasetListing:
+    # `KaggleApi.dataset_list` over a fixed set of datasets
+    def __init__(self, datasets: list):
+        self.datasets = datasets
+
+    def dataset_list(self, user: str = None, search: str = None) -> list:
+        return [dataset for dataset in self.datasets if search in str(dataset.ref)]
+
+
+def test_dataset_version_is_read_from_the_listing():
+    api = DatasetListing([
+        SimpleNamespace(ref="owner/covid-19-jhu-extended", current_version_number=3, last_updated="2023-01-02"),
+        SimpleNamespace(ref="owner/covid-19-jhu", current_version_number=12, last_updated="2023-03-10"),
+    ])
+
+    assert get_dataset_version(api, "owner/covid-19-jhu") == {
+        "dataset": "owner/covid-19-jhu",
+        "version": 12,
+        "last_updated": "2023-03-10",
+    }
+    with pytest.raises(ValueError):
+        get_dataset_version(api, "owner/other")
+
+
+@pytest.fixture
+def archive(tmp_path) -> str:
+    # a dataset archive with the RAW files and one file the pipelines skip
+    archive_path = tmp_path / "covid.zip"
+    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for i, name in enumerate(RAW_FILES):
+            zf.writestr(name, f"UID,1/22/20\n{i},{i}\n" * 100)
+        zf.writestr("CONVENIENT_us_confirmed_cases.csv", "not landed")
+    return str(archive_path)
+
+
+def test_members_are_landed_once(local_bucket, archive):
+    first = stream_zip_members_to_gcs(archive, local_bucket)
+    assert (first["uploaded"], first["skipped"], first["failed"]) == (len(RAW_FILES), 0, 0)
+    assert sorted(blob.name for blob in local_bucket.list_blobs(prefix=BRONZE_COVID_PREFIX)) == sorted(
+        BRONZE_COVID_PREFIX + name for name in RAW_FILES
+    )
+    with zipfile.ZipFile(archive) as zf:
+        assert local_bucket.blob(BRONZE_COVID_PREFIX + RAW_FILES[0]).download_as_bytes() == zf.read(RAW_FILES[0])
+
+    # the recorded zip CRC skips unchanged members on the next run
+    second = stream_zip_members_to_gcs(archive, local_bucket)
+    assert (second["uploaded"], second["skipped"]) == (0, len(RAW_FILES))
+
+
+def test_missing_members_fail_before_uploading(local_bucket, archive):
+    with pytest.raises(FileNotFoundError):
+        stream_zip_members_to_gcs(archive, local_bucket, members=RAW_FILES + ["RAW_missing.csv"])
+    assert local_bucket.list_blobs(prefix=BRONZE_COVID_PREFIX) == []
+
+
+def test_a_version_is_landed_once_all_files_are_there(local_bucket, archive):
+    version: dict = {"dataset": "owner/covid-19-jhu", "version": 12, "last_updated": "2023-03-10"}
+    assert not is_landed(local_bucket, version)
+
+    stream_zip_members_to_gcs(archive, local_bucket)
+    write_version_marker(local_bucket, version, RAW_FILES)
+    assert is_landed(local_bucket, version)
+    assert not is_landed(local_bucket, {**version, "version": 13})
+
+    local_bucket.blob(BRONZE_COVID_PREFIX + RAW_FILES[0]).delete()
+    assert not is_landed(local_bucket, version)
@@ -0,0 +1,75 @@
+import shutil
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from mage_gcp_covid.utils.lake_query import LakeQueryService, clear_query_services, get_query_service
+from mage_gcp_covid.utils.partitioned_parquet import (
+    SILVER_COVID_DATASET,
+    SILVER_PARTITION_COLS,
+    add_year_month,
+    write_partitioned,
+)
+
+
+def write_silver(bucket) -> pd.DataFrame:
+    dates = pd.date_range("2020-03-20", periods=20, freq="D")
+    df = add_year_month(pd.DataFrame({
+        "uid": np.repeat(["1", "2", "3"], len(dates)),
+        "country_region": "US",
+        "province_state": np.repeat(["Iowa", "Iowa", "Ohio"], len(dates)),
+        "date": np.tile(dates, 3),
+        "confirmed_cases": np.arange(3 * len(dates)),
+    }))
+    write_partitioned(df, bucket, SILVER_COVID_DATASET, SILVER_PARTITION_COLS, "part-0.parquet")
+    return df
+
+
+@pytest.fixture
+def lake(local_bucket):
+    service = LakeQueryService(local_bucket.client.root)
+    yield service
+    service.close()
+
+
+def test_datasets_are_queryable_as_views(local_bucket, lake):
+    assert "silver_covid_us" not in lake.views
+    df = write_silver(local_bucket)
+
+    assert "silver_covid_us" in lake.refresh()
+    df_result = lake.query(
+        "SELECT uid, sum(confirmed_cases) AS total FROM silver_covid_us "
+        "WHERE province_state = ? AND year_month = ? GROUP BY uid ORDER BY uid",
+        ["Iowa", "2020-04"],
+    )
+
+    expected = (df[(df["province_state"] == "Iowa") & (df["year_month"] == "2020-04")]
+        .groupby("uid")["confirmed_cases"].sum())
+    assert df_result["uid"].tolist() == expected.index.tolist()
+    assert df_result["total"].tolist() == expected.tolist()
+
+
+def test_removed_datasets_are_dropped_on_refresh(local_bucket, lake):
+    write_silver(local_bucket)
+    lake.refresh()
+
+    shutil.rmtree(lake.lake_dir / SILVER_COVID_DATASET)
+
+    assert "silver_covid_us" not in lake.refresh()
+    with pytest.raises(duckdb.CatalogException):
+        lake.query("SELECT * FROM silver_covid_us")
+
+
+def test_shared_service_sees_datasets_written_after_it_was_created(local_bucket):
+    try:
+        service = get_query_service()
+        assert "silver_covid_us" not in service.views
+
+        df = write_silver(local_bucket)
+
+        assert get_query_service() is service
+        assert service.query("SELECT count(*) AS n FROM silver_covid_us")["n"].iloc[0] == len(df)
+    finally:
+        clear_query_services()
@@ -0,0 +1,32 @@
+import io
+
+from mage_gcp_covid.utils.gcs import get_storage_client
+from mage_gcp_covid.utils.local_gcs import LocalClient
+
+
+def test_local_client_is_used_when_the_root_is_set(local_bucket):
+    assert isinstance(get_storage_client("dev"), LocalClient)
+    assert get_storage_client("dev") is get_storage_client("dev")
+
+
+def test_blobs_behave_like_gcs_objects(local_bucket):
+    blob = local_bucket.blob("01_bronze_landing/covid/RAW_us_deaths.csv")
+    assert not blob.exists()
+    assert local_bucket.get_blob(blob.name) is None
+
+    blob.upload_from_string("UID,1/22/20\n1,0\n")
+    blob.bucket.blob("01_bronze_landing/covid/other.csv").upload_from_file(io.BytesIO(b"a"))
+
+    assert blob.exists() and blob.size == 16
+    assert blob.download_as_bytes() == b"UID,1/22/20\n1,0\n"
+    # `end` is inclusive, as in the GCS client
+    assert blob.download_as_bytes(start=4, end=10) == b"1/22/20"
+    with blob.open("r") as stream:
+        assert stream.read(3) == b"UID"
+
+    assert [b.name for b in local_bucket.list_blobs(prefix="01_bronze_landing/covid/RAW")] == [blob.name]
+    assert len(local_bucket.list_blobs(prefix="01_bronze_landing/", max_results=1)) == 1
+
+    blob.delete()
+    assert [b.name for b in local_bucket.list_blobs()] == ["01_bronze_landing/covid/other.csv"]
+
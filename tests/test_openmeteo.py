@@ -0,0 +1,101 @@
+import time
+
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_array_equal
+
+from mage_gcp_covid.utils.openmeteo import RateLimiter, decode_responses, decoded_to_frame
+
+
+DAY: int = 86_400
+
+
+class Variable:
+
+    def __init__(self, values: np.ndarray):
+        self.values = values
+
+    def ValuesAsNumpy(self) -> np.ndarray:
+        return self.values
+
+
+class Block:
+    """
+    The parts of an Open-Meteo `VariablesWithTime` block the decoder reads
+    """
+
+    def __init__(self, start: int, values: np.ndarray):
+        self.start = start
+        self.values = values
+
+    def Time(self) -> int:
+        return self.start
+
+    def TimeEnd(self) -> int:
+        return self.start + self.values.shape[0] * DAY
+
+    def Interval(self) -> int:
+        return DAY
+
+    def Variables(self, index: int) -> Variable:
+        return Variable(self.values[:, index])
+
+
+class Response:
+
+    def __init__(self, block: Block):
+        self.block = block
+
+    def Daily(self) -> Block:
+        return self.block
+
+
+def make_responses(variables: list) -> list:
+    rng = np.random.default_rng(0)
+    start = int(pd.Timestamp("2020-03-01", tz="UTC").timestamp())
+    # locations with different date ranges
+    return [
+        Response(Block(start + offset * DAY, rng.normal(size=(n_days, len(variables))).astype("float32")))
+        for offset, n_days in [(0, 5), (2, 3), (0, 0), (1, 7)]
+    ]
+
+
+def reference_frame(responses: list, variables: list, cell_ids: list) -> pd.DataFrame:
+    # one frame per response, the way the Open-Meteo examples decode them
+    frames: list = []
+    for cell_id, response in zip(cell_ids, responses):
+        daily = response.Daily()
+        data: dict = {
+            "cell_id": cell_id,
+            "date": pd.to_datetime(range(daily.Time(), daily.TimeEnd(), daily.Interval()), unit="s", utc=True),
+        }
+        for j, variable in enumerate(variables):
+            data[variable] = daily.Variables(j).ValuesAsNumpy()
+        frames.append(pd.DataFrame(data))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_decoded_block_matches_per_response_frames():
+    variables: list = ["temperature_2m_mean", "precipitation_sum", "rain_sum"]
+    responses = make_responses(variables)
+    cell_ids: list = [11, 12, 13, 14]
+
+    values, location_index, times = decode_responses(responses, variables)
+    df = decoded_to_frame((values, location_index, times), variables, cell_ids)
+
+    assert values.shape == (5 + 3 + 0 + 7, len(variables))
+    assert_array_equal(location_index, np.repeat([0, 1, 2, 3], [5, 3, 0, 7]))
+
+    expected = reference_frame(responses, variables, cell_ids)
+    assert df["cell_id"].tolist() == expected["cell_id"].tolist()
+    assert df["date"].tolist() == expected["date"].tolist()
+    assert_array_equal(df[variables].to_numpy(), expected[variables].to_numpy())
+
+
+def test_rate_limiter_spaces_calls():
+    limiter = RateLimiter(rate=100.0)
+    started = time.monotonic()
+    for _ in range(6):
+        limiter.wait()
+    # the first call goes through, the next five wait 10 ms each
+    assert time.monotonic() - started >= 5 * 0.01 - 1e-3
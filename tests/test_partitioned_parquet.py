@@ -0,0 +1,154 @@
+import logging
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from mage_gcp_covid.utils.partitioned_parquet import (
+    WEATHER_KEY_COLS,
+    WEATHER_PARTITION_COLS,
+    add_year_month,
+    match_filter,
+    merge_partitioned,
+    parse_partition_keys,
+    partition_dir,
+    read_partitioned,
+    to_arrow_filters,
+    write_partitioned,
+)
+
+
+PREFIX: str = "02_silver_standardize/covid/covid_us/"
+PARTITION_COLS: list = ["country_region", "province_state", "year_month"]
+
+
+def make_silver(n_days: int = 70) -> pd.DataFrame:
+    dates = pd.date_range("2020-02-20", periods=n_days, freq="D")
+    states = ["Iowa", "Ohio", None]
+    df = pd.DataFrame({
+        "country_region": "US",
+        "province_state": np.repeat(states, n_days),
+        "uid": np.repeat(["1", "2", "3"], n_days),
+        "date": np.tile(dates, len(states)),
+        "confirmed_cases": np.arange(n_days * len(states)),
+    })
+    return add_year_month(df)
+
+
+def test_partition_keys_round_trip_through_the_object_key():
+    keys: dict = {"country_region": "US", "province_state": "New York/Brooklyn", "year_month": "2020-03"}
+    object_key: str = partition_dir(PREFIX, keys) + "part-0.parquet"
+
+    assert object_key == (
+        PREFIX + "country_region=US/province_state=New%20York%2FBrooklyn/year_month=2020-03/part-0.parquet"
+    )
+    assert parse_partition_keys(object_key, PREFIX) == keys
+
+
+def test_match_filter_conditions():
+    assert match_filter("2020-03", "2020-03")
+    assert not match_filter("2020-03", "2020-04")
+    assert match_filter("Iowa", ["Iowa", "Ohio"])
+    assert match_filter("2020-03", ("2020-02", None))
+    assert not match_filter("2020-03", ("2020-04", "2020-06"))
+    assert match_filter("2020-03", (None, "2020-03"))
+
+
+def test_non_partition_filters_become_arrow_filters():
+    assert to_arrow_filters({"date": ("2020-03-01", None), "uid": ["1", "2"], "fips": "1001"}) == [
+        ("date", ">=", "2020-03-01"),
+        ("uid", "in", ["1", "2"]),
+        ("fips", "==", "1001"),
+    ]
+
+
+def test_add_year_month_matches_strftime():
+    df = pd.DataFrame({"date": pd.to_datetime(["2020-03-31", "2021-12-01", None, "2020-03-01"])})
+
+    add_year_month(df)
+
+    assert_frame_equal(df[["year_month"]], df["date"].dt.strftime("%Y-%m").rename("year_month").to_frame())
+
+
+def test_partitioned_round_trip_with_filters(local_bucket):
+    df = make_silver()
+    written: list = write_partitioned(df, local_bucket, PREFIX, PARTITION_COLS, "part-0.parquet")
+    assert len(written) == 3 * 3
+
+    df_read = read_partitioned(local_bucket, PREFIX)
+    assert len(df_read) == len(df)
+
+    # partition filters prune objects, the date range is pushed into the reader
+    df_march = read_partitioned(
+        local_bucket,
+        PREFIX,
+        filters={"province_state": ["Iowa", "Ohio"], "year_month": "2020-03", "date": (pd.Timestamp("2020-03-10"), None)},
+        columns=["uid", "date", "confirmed_cases", "year_month"],
+    )
+    expected = df[
+        df["province_state"].isin(["Iowa", "Ohio"]) & (df["year_month"] == "2020-03") & (df["date"] >= "2020-03-10")
+    ][["uid", "date", "confirmed_cases", "year_month"]]
+    assert_frame_equal(
+        df_march.sort_values(["uid", "date"]).reset_index(drop=True),
+        expected.sort_values(["uid", "date"]).reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_replace_deletes_stale_objects(local_bucket):
+    df = make_silver()
+    write_partitioned(df, local_bucket, PREFIX, PARTITION_COLS, "part-0.parquet")
+
+    # a rewrite of the Iowa rows only leaves Iowa objects behind
+    written = write_partitioned(df[df["province_state"] == "Iowa"], local_bucket, PREFIX, PARTITION_COLS,
+                                "part-1.parquet", replace=True)
+
+    assert sorted(blob.name for blob in local_bucket.list_blobs(prefix=PREFIX)) == sorted(written)
+    assert read_partitioned(local_bucket, PREFIX)["province_state"].unique().tolist() == ["Iowa"]
+
+
+def test_merge_upserts_into_one_object_per_partition(local_bucket):
+    prefix: str = "01_bronze_landing/weather/"
+    dates = pd.date_range("2020-03-25", periods=14, freq="D")
+    df = add_year_month(pd.DataFrame({
+        "cell_id": np.repeat([7, 8], len(dates)),
+        "date": np.tile(dates, 2),
+        "temperature_2m_mean": np.arange(2 * len(dates), dtype="float32"),
+    }))
+
+    merge_partitioned(df.iloc[:20], local_bucket, prefix, WEATHER_PARTITION_COLS, "part-0.parquet", WEATHER_KEY_COLS)
+    # an overlapping backfill with revised values, written under another name
+    df_revised = df.iloc[10:].assign(temperature_2m_mean=lambda d: d["temperature_2m_mean"] + 100)
+    merge_partitioned(df_revised, local_bucket, prefix, WEATHER_PARTITION_COLS, "part-0.parquet", WEATHER_KEY_COLS)
+
+    assert sorted(blob.name for blob in local_bucket.list_blobs(prefix=prefix)) == [
+        prefix + "year_month=2020-03/part-0.parquet",
+        prefix + "year_month=2020-04/part-0.parquet",
+    ]
+    df_read = read_partitioned(local_bucket, prefix).sort_values(WEATHER_KEY_COLS).reset_index(drop=True)
+    expected = pd.concat([df.iloc[:10], df_revised]).sort_values(WEATHER_KEY_COLS).reset_index(drop=True)
+    assert df_read["temperature_2m_mean"].tolist() == expected["temperature_2m_mean"].tolist()
+
+
+def test_weather_export_writes_each_month_once_for_all_shards(local_bucket, tmp_path):
+    # the exporter gets the reduced outputs of the cell shards, which all
+    # cover the same months
+    from bench.benchmark_pipelines import load_block
+
+    exporter = load_block({"type": "data_exporter", "uuid": "export_weather_to_landing_zone"})["block"]
+    prefix: str = "01_bronze_landing/weather/"
+    dates = pd.date_range("2020-03-25", periods=14, freq="D")
+    shards: list = [
+        pd.DataFrame({"cell_id": cell_id, "date": dates, "temperature_2m_mean": np.float32(cell_id)})
+        for cell_id in (7, 8, 9)
+    ]
+
+    exporter(shards, logger=logging.getLogger(__name__), weather_cache_dir=str(tmp_path / "weather_cache"))
+
+    assert sorted(blob.name for blob in local_bucket.list_blobs(prefix=prefix)) == [
+        prefix + "year_month=2020-03/part-0.parquet",
+        prefix + "year_month=2020-04/part-0.parquet",
+    ]
+    df = read_partitioned(local_bucket, prefix)
+    assert sorted(df["cell_id"].unique().tolist()) == [7, 8, 9]
+    assert len(df) == 3 * len(dates)
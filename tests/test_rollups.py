@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from mage_gcp_covid.utils.rollups import ROLLUPS, build_rollups, rollup_key_cols
+
+
+MEASURES: list = ["confirmed_cases", "deaths"]
+
+
+def make_fact(seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2020-03-04", periods=17, freq="D")
+    locations = pd.DataFrame({
+        "country_region": ["US"] * 4 + ["Canada"] * 2 + ["France"],
+        "province_state": ["Iowa", "Iowa", "Ohio", "Utah", "Ontario", "Quebec", None],
+    })
+    df = locations.loc[np.repeat(locations.index, len(dates))].reset_index(drop=True)
+    df["date"] = np.tile(dates, len(locations))
+    df["confirmed_cases"] = rng.integers(0, 1000, len(df))
+    df["deaths"] = pd.array(rng.integers(0, 10, len(df)), dtype="Int64")
+    df.loc[rng.random(len(df)) < 0.1, "deaths"] = pd.NA
+    # drop some rows so days and weeks have gaps
+    return df[rng.random(len(df)) > 0.15].reset_index(drop=True)
+
+
+def reference_rollups(df: pd.DataFrame) -> dict:
+    df = df.assign(
+        week_start=df["date"] - pd.to_timedelta(df["date"].dt.dayofweek, unit="D"),
+        n_locations=1,
+        **{measure: df[measure].astype("float64").fillna(0.0) for measure in MEASURES},
+    )
+    sums: list = MEASURES + ["n_locations"]
+    cubes: dict = {}
+    for grain, group_cols in [("state", ["country_region", "province_state"]), ("country", ["country_region"])]:
+        df_day = df.groupby(group_cols + ["date"], dropna=False, sort=False)[sums].sum().reset_index()
+        df_day["week_start"] = df_day["date"] - pd.to_timedelta(df_day["date"].dt.dayofweek, unit="D")
+        df_week = (
+            df_day.sort_values("date")
+            .groupby(group_cols + ["week_start"], dropna=False, sort=False)
+            .agg(**{col: (col, "last") for col in sums}, n_days=("date", "size"))
+            .reset_index()
+        )
+        cubes[f"{grain}_day"] = df_day.drop(columns="week_start")
+        cubes[f"{grain}_week"] = df_week
+    return cubes
+
+
+def normalize(df: pd.DataFrame, name: str) -> pd.DataFrame:
+    df = df.astype({col: "int64" for col in df.columns if col in MEASURES + ["n_locations", "n_days"]})
+    df = df.astype({col: "object" for col in ["country_region", "province_state"] if col in df.columns})
+    df["period"] = df.pop(ROLLUPS[name][1]).astype("datetime64[ns]")
+    return df.sort_values(rollup_key_cols(name)[:-1] + ["period"], na_position="first").reset_index(drop=True)
+
+
+def test_build_rollups_matches_groupby():
+    df = make_fact()
+
+    cubes = build_rollups(df, MEASURES)
+    expected = reference_rollups(df)
+
+    assert list(cubes) == list(ROLLUPS)
+    for name, df_cube in cubes.items():
+        actual = normalize(df_cube, name)
+        assert_frame_equal(actual, normalize(expected[name], name)[actual.columns.tolist()])
+
+
+def test_build_rollups_empty_fact():
+    cubes = build_rollups(make_fact().iloc[:0], MEASURES)
+    assert all(df_cube.empty for df_cube in cubes.values())
+    assert cubes["state_week"].columns.tolist() == rollup_key_cols("state_week") + MEASURES + ["n_locations", "n_days"]
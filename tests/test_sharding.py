@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from mage_gcp_covid.utils.sharding import (
+    balance_by_key,
+    balance_shards,
+    combine_shard_outputs,
+    dynamic_output,
+    get_shard_count,
+    split_by_key,
+)
+
+
+def test_shards_are_balanced_by_size():
+    sizes: dict = {"California": 58, "Texas": 254, "Iowa": 99, "Ohio": 88, "Utah": 29, "Guam": 1}
+
+    shards: list = balance_shards(sizes, 3)
+
+    assert sorted(key for shard in shards for key in shard) == sorted(sizes)
+    totals: list = [sum(sizes[key] for key in shard) for shard in shards]
+    assert totals[0] == 254 and max(totals[1:]) - min(totals[1:]) <= 29
+    # fewer keys than shards gives one shard per key
+    assert balance_shards({"Iowa": 1, "Ohio": 2}, 8) == [["Ohio"], ["Iowa"]]
+
+
+@pytest.mark.parametrize("dtype", [object, "string[pyarrow]"])
+def test_rows_without_a_key_get_a_shard(dtype):
+    df = pd.DataFrame({
+        "Province_State": pd.Series(["Iowa", None, "Ohio", "Iowa", None, "Utah", None], dtype=dtype),
+        "value": np.arange(7),
+    })
+
+    shards: list = balance_by_key(df, "Province_State", 2)
+
+    assert sorted(pd.concat([rows for _, rows in shards])["value"].tolist()) == list(range(7))
+    by_key: dict = {key: rows for keys, rows in shards for key in keys}
+    assert sorted(by_key, key=lambda key: (key is None, key)) == ["Iowa", "Ohio", "Utah", None]
+    df_null = by_key[None]
+    assert df_null.loc[df_null["Province_State"].isna(), "value"].tolist() == [1, 4, 6]
+    # the null key sorts last within its shard
+    assert all(None not in keys[:-1] for keys, _ in shards)
+
+
+def test_shard_count_comes_from_the_pipeline_variables():
+    assert get_shard_count(shard_count="4") == 4
+    assert get_shard_count(shard_count=0) >= 1
+
+
+def test_dynamic_output_names_one_child_per_item():
+    items, metadata = dynamic_output([{"states": ["Iowa"]}, {"states": ["Ohio"]}], "load_covid_raw")
+    assert len(items) == 2
+    assert metadata == [{"block_uuid": "load_covid_raw_0"}, {"block_uuid": "load_covid_raw_1"}]
+
+
+def test_split_by_key_partitions_the_rows():
+    df = pd.DataFrame({"cell_id": np.repeat([5, 3, 9, 1, 7], 4), "value": np.arange(20)})
+
+    parts: list = split_by_key(df, "cell_id", 2)
+
+    assert len(parts) == 2
+    assert sorted(pd.concat(parts)["value"].tolist()) == list(range(20))
+    assert set(parts[0]["cell_id"]).isdisjoint(parts[1]["cell_id"])
+
+
+def test_combined_outputs_equal_the_unsharded_output():
+    df = pd.DataFrame({
+        "uid": pd.Categorical(["1", "2", "3", "4"]),
+        "confirmed_cases": [1, 2, 3, 4],
+    })
+    # each shard's categories only hold its own labels
+    shards: list = [df.iloc[:2].assign(uid=lambda d: d["uid"].astype(str).astype("category")),
+                    df.iloc[2:].assign(uid=lambda d: d["uid"].astype(str).astype("category"))]
+
+    df_combined = combine_shard_outputs(shards)
+    assert isinstance(df_combined["uid"].dtype, pd.CategoricalDtype)
+    assert_frame_equal(df_combined.astype({"uid": str}), df.astype({"uid": str}))
+
+    combined = combine_shard_outputs([(shard, shard.head(1)) for shard in shards])
+    assert isinstance(combined, tuple) and len(combined[0]) == 4 and len(combined[1]) == 2
+
+
+@pytest.mark.parametrize("outputs, expected", [([{"rows_out": 3}], {"rows_out": 3}), ([1, 2], [1, 2])])
+def test_other_outputs_are_passed_through(outputs, expected):
+    assert combine_shard_outputs(outputs) == expected
@@ -0,0 +1,66 @@
+import pandas as pd
+
+from mage_gcp_covid.utils.silver_manifest import (
+    MANIFEST_KEY,
+    SINGLE_MANIFEST_KEY,
+    STAR_MANIFEST_KEY,
+    commit_part,
+    get_watermark,
+    is_new_date_col,
+    raw_columns_to_load,
+    read_manifest,
+    select_new_date_cols,
+    silver_manifest_key,
+)
+
+
+DATE_COLS: list = ["3/30/20", "3/31/20", "4/1/20", "4/2/20"]
+
+
+def test_empty_manifest_has_no_watermark():
+    assert get_watermark({"watermark": None, "parts": []}) is None
+    assert get_watermark({"watermark": "2020-03-31", "parts": []}) == pd.Timestamp("2020-03-31")
+
+
+def test_only_dates_after_the_watermark_are_new():
+    watermark = pd.Timestamp("2020-03-31")
+
+    assert select_new_date_cols(DATE_COLS, watermark) == ["4/1/20", "4/2/20"]
+    assert select_new_date_cols(DATE_COLS, None) == DATE_COLS
+    # meta columns are always kept
+    assert [col for col in ["UID", "Lat"] + DATE_COLS if is_new_date_col(col, watermark)] == [
+        "UID", "Lat", "4/1/20", "4/2/20"
+    ]
+
+
+def test_silver_targets_keep_their_own_manifest():
+    assert silver_manifest_key() == MANIFEST_KEY
+    assert silver_manifest_key(silver_model="star") == STAR_MANIFEST_KEY
+    assert silver_manifest_key(silver_layout="single") == SINGLE_MANIFEST_KEY
+    assert silver_manifest_key(silver_mode="stream", silver_model="star") == SINGLE_MANIFEST_KEY
+
+
+def test_commit_advances_only_its_manifest(local_bucket):
+    assert read_manifest(local_bucket) == {"watermark": None, "parts": []}
+
+    manifest = commit_part(local_bucket, read_manifest(local_bucket), "part-a.parquet", pd.Timestamp("2020-03-31"), 10)
+    # re-committing a part replaces its entry
+    commit_part(local_bucket, manifest, "part-a.parquet", pd.Timestamp("2020-04-02"), 12)
+
+    manifest = read_manifest(local_bucket)
+    assert get_watermark(manifest) == pd.Timestamp("2020-04-02")
+    assert manifest["parts"] == [{"key": "part-a.parquet", "rows": 12}]
+    assert get_watermark(read_manifest(local_bucket, STAR_MANIFEST_KEY)) is None
+
+
+def test_incremental_run_loads_only_dates_after_the_watermark(local_bucket):
+    assert raw_columns_to_load(local_bucket, silver_mode="full") is None
+
+    commit_part(local_bucket, read_manifest(local_bucket), "part-a.parquet", pd.Timestamp("2020-03-31"), 10)
+
+    keep = raw_columns_to_load(local_bucket, silver_mode="incremental")
+    assert [col for col in ["UID", "Lat"] + DATE_COLS if keep(col)] == ["UID", "Lat", "4/1/20", "4/2/20"]
+
+    # the star model's watermark is separate and still empty
+    keep_star = raw_columns_to_load(local_bucket, silver_mode="incremental", silver_model="star")
+    assert all(keep_star(col) for col in DATE_COLS)
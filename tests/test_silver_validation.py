@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from mage_gcp_covid.utils.silver_validation import (
+    SilverValidator,
+    drop_duplicate_keys,
+    key_codes,
+    validate_frame,
+)
+
+
+def make_silver(seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2020-03-01", periods=10, freq="D")
+    df = pd.DataFrame({
+        "uid": np.repeat([f"8400{i}" for i in range(8)], len(dates)),
+        "date": np.tile(dates, 8),
+        "province_state": np.repeat(["Iowa", "Ohio", None, "Utah"] * 2, len(dates)),
+        "confirmed_cases": rng.integers(-2, 100, 8 * len(dates)),
+    })
+    # repeated rows, a missing uid and a date out of range
+    df = pd.concat([df, df.iloc[[3, 17, 17]]], ignore_index=True)
+    df.loc[5, "uid"] = None
+    df.loc[6, "date"] = pd.Timestamp("2019-06-01")
+    return df.astype({"uid": "string", "province_state": "category"})
+
+
+def test_key_codes_identify_equal_keys():
+    df = make_silver()
+    codes = key_codes(df, ["uid", "date"])
+    assert (pd.Index(codes).duplicated() == df.duplicated(["uid", "date"]).to_numpy()).all()
+
+    codes = key_codes(df, ["province_state"])
+    assert (pd.Index(codes).duplicated() == df.duplicated(["province_state"]).to_numpy()).all()
+
+
+def test_drop_duplicate_keys_keeps_the_first_row():
+    df = make_silver()
+
+    assert_frame_equal(drop_duplicate_keys(df), df.drop_duplicates(["uid", "date"]).reset_index(drop=True))
+    df_unique = drop_duplicate_keys(df)
+    assert drop_duplicate_keys(df_unique) is df_unique
+
+
+def test_validator_statistics_match_pandas():
+    df = make_silver()
+
+    summary: dict = validate_frame(df, max_date=pd.Timestamp("2021-01-01"))
+
+    assert summary["rows"] == len(df)
+    assert summary["duplicate_keys"] == int(df.duplicated(["uid", "date"]).sum()) == 3
+    assert summary["null_counts"] == df.isna().sum().to_dict()
+    assert summary["negative_counts"] == {"confirmed_cases": int((df["confirmed_cases"] < 0).sum())}
+    assert summary["dates_out_of_range"] == 1
+    assert summary["first_date"] == "2019-06-01 00:00:00"
+    assert summary["last_date"] == "2020-03-10 00:00:00"
+
+
+def test_batches_add_up_to_the_whole_frame():
+    df = make_silver()
+    max_date = pd.Timestamp("2021-01-01")
+
+    # batches of whole locations, as streamed; the last one repeats rows
+    # of locations from the first batch
+    bounds: list = [0, 30, 60, 80, len(df)]
+    validator = SilverValidator(max_date=max_date)
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        validator.update(df.iloc[start:end])
+
+    summary: dict = validator.summary()
+    assert summary["batches"] == len(bounds) - 1
+    assert {key: value for key, value in summary.items() if key != "batches"} == {
+        key: value for key, value in validate_frame(df, max_date=max_date).items() if key != "batches"
+    }
+
+
+def test_validator_keeps_one_hash_per_location():
+    df = make_silver()
+
+    validator = SilverValidator()
+    for start in range(0, 80, 10):
+        validator.update(df.iloc[start:start + 10])
+
+    assert len(validator._seen_locations) == df["uid"].iloc[:80].nunique(dropna=False)
+    assert validator.duplicate_keys == 0
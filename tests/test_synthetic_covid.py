@@ -0,0 +1,32 @@
+import zipfile
+
+import pandas as pd
+
+from mage_gcp_covid.utils.covid_reshape import META_COLS, get_date_cols
+from mage_gcp_covid.utils.synthetic_covid import generate_raw_datasets, write_raw_archive
+
+
+def test_synthetic_raw_files_have_the_jhu_layout(tmp_path):
+    frames: dict = generate_raw_datasets(n_counties=30, n_days=12, n_global=6)
+
+    assert sorted(frames) == sorted(["RAW_us_confirmed_cases.csv", "RAW_us_deaths.csv",
+                                     "RAW_global_confirmed_cases.csv", "RAW_global_deaths.csv"])
+    df_us = frames["RAW_us_confirmed_cases.csv"]
+    assert set(META_COLS) <= set(df_us.columns)
+    assert len(df_us) == 30 and len(get_date_cols(df_us.columns)) == 12
+    # counts are cumulative
+    assert (df_us[get_date_cols(df_us.columns)].diff(axis=1).iloc[:, 1:] >= 0).all().all()
+    assert len(frames["RAW_global_deaths.csv"]) == 6
+
+    rows: dict = write_raw_archive(str(tmp_path / "covid.zip"), n_counties=30, n_days=12, n_global=6)
+    with zipfile.ZipFile(tmp_path / "covid.zip") as archive:
+        df = pd.read_csv(archive.open("RAW_us_deaths.csv"))
+    assert rows["RAW_us_deaths.csv"] == len(df) == 30
+
+
+def test_synthetic_locations_are_unique():
+    frames: dict = generate_raw_datasets(n_counties=50, n_days=3, n_global=40)
+
+    assert frames["RAW_us_confirmed_cases.csv"]["UID"].is_unique
+    df_global = frames["RAW_global_confirmed_cases.csv"]
+    assert not df_global.duplicated(["Province/State", "Country/Region"]).any()
@@ -0,0 +1,102 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from mage_gcp_covid.utils.weather_cache import WeatherCache, group_cells_by_gaps
+
+
+VARIABLES: list = ["temperature_2m_mean", "precipitation_sum"]
+
+
+def weather_rows(cell_id: int, start: str, end: str, variables: list = VARIABLES, value: float = 1.0) -> pd.DataFrame:
+    dates = pd.date_range(start, end, freq="D", tz="UTC")
+    df = pd.DataFrame({"cell_id": cell_id, "date": dates})
+    for variable in variables:
+        df[variable] = np.full(len(dates), value, dtype="float32")
+    return df
+
+
+def test_missing_ranges_are_the_uncached_runs_of_days(tmp_path):
+    cache = WeatherCache(tmp_path)
+    variables: tuple = tuple(VARIABLES)
+    assert cache.missing_ranges(7, VARIABLES, "2020-03-01", "2020-03-10") == [("2020-03-01", "2020-03-10", variables)]
+
+    cache.put(pd.concat([weather_rows(7, "2020-03-03", "2020-03-04"), weather_rows(7, "2020-03-07", "2020-03-08")]))
+
+    assert cache.missing_ranges(7, VARIABLES, "2020-03-01", "2020-03-10") == [
+        ("2020-03-01", "2020-03-02", variables),
+        ("2020-03-05", "2020-03-06", variables),
+        ("2020-03-09", "2020-03-10", variables),
+    ]
+    assert cache.missing_ranges(7, VARIABLES, "2020-03-03", "2020-03-04") == []
+
+
+def test_missing_ranges_name_only_the_missing_variables(tmp_path):
+    cache = WeatherCache(tmp_path)
+    cache.put(weather_rows(7, "2020-03-01", "2020-03-06", variables=VARIABLES[:1]))
+    cache.put(weather_rows(7, "2020-03-04", "2020-03-08", variables=VARIABLES[1:]))
+
+    assert cache.missing_ranges(7, VARIABLES, "2020-03-01", "2020-03-10") == [
+        ("2020-03-01", "2020-03-03", ("precipitation_sum",)),
+        ("2020-03-07", "2020-03-08", ("temperature_2m_mean",)),
+        ("2020-03-09", "2020-03-10", tuple(VARIABLES)),
+    ]
+
+
+def test_values_fetched_as_null_are_not_fetched_again(tmp_path):
+    cache = WeatherCache(tmp_path)
+    cache.put(weather_rows(7, "2020-03-01", "2020-03-05", value=np.nan))
+
+    assert cache.missing_ranges(7, VARIABLES, "2020-03-01", "2020-03-05") == []
+    assert cache.get([7], VARIABLES, "2020-03-01", "2020-03-05")["precipitation_sum"].isna().all()
+
+    # a later fetch of the other variable keeps the marker of the first
+    cache.put(weather_rows(7, "2020-03-06", "2020-03-06", variables=VARIABLES[:1]))
+    assert cache.missing_ranges(7, VARIABLES, "2020-03-01", "2020-03-06") == [
+        ("2020-03-06", "2020-03-06", ("precipitation_sum",)),
+    ]
+
+
+def test_cells_with_the_same_gaps_are_fetched_together(tmp_path):
+    cache = WeatherCache(tmp_path)
+    cache.put(pd.concat([weather_rows(1, "2020-03-01", "2020-03-05"), weather_rows(2, "2020-03-01", "2020-03-05")]))
+    cache.put(weather_rows(4, "2020-03-01", "2020-03-07", variables=VARIABLES[:1]))
+
+    gaps: dict = group_cells_by_gaps(cache, [1, 2, 3, 4], VARIABLES, "2020-03-01", "2020-03-07")
+
+    assert gaps == {
+        ("2020-03-06", "2020-03-07", tuple(VARIABLES)): [1, 2],
+        ("2020-03-01", "2020-03-07", tuple(VARIABLES)): [3],
+        ("2020-03-01", "2020-03-07", ("precipitation_sum",)): [4],
+    }
+
+
+def test_put_keeps_cached_rows_and_new_values_win(tmp_path):
+    cache = WeatherCache(tmp_path)
+    cache.put(weather_rows(7, "2020-03-01", "2020-03-04", value=1.0))
+    cache.put(weather_rows(7, "2020-03-03", "2020-03-06", value=2.0))
+
+    df = cache.get([7, 8], VARIABLES, "2020-03-02", "2020-03-05")
+
+    assert df["cell_id"].unique().tolist() == [7]
+    assert df["date"].dt.strftime("%m-%d").tolist() == ["03-02", "03-03", "03-04", "03-05"]
+    assert df["temperature_2m_mean"].tolist() == [1.0, 2.0, 2.0, 2.0]
+
+
+def test_evict_drops_the_least_recently_used_cells(tmp_path):
+    cache = WeatherCache(tmp_path)
+    for cell_id in [1, 2, 3]:
+        cache.put(weather_rows(cell_id, "2020-01-01", "2020-12-31"))
+    sizes: dict = {path.name: path.stat().st_size for path in tmp_path.glob("cell_*.parquet")}
+
+    # cell 1 is the oldest file, cell 2 was read last
+    for age, cell_id in [(300, 1), (200, 3), (100, 2)]:
+        path = tmp_path / f"cell_{cell_id}.parquet"
+        os.utime(path, (path.stat().st_atime - age, path.stat().st_mtime - age))
+    cache.read_cell(2)
+
+    cache.max_bytes = sizes["cell_2.parquet"] + sizes["cell_3.parquet"]
+    assert cache.evict() == ["cell_1.parquet"]
+    assert cache.evict() == []
+    assert sorted(path.name for path in tmp_path.glob("cell_*.parquet")) == ["cell_2.parquet", "cell_3.parquet"]
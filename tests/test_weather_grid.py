@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from mage_gcp_covid.utils.weather_grid import (
+    build_cell_index,
+    fan_out_to_locations,
+    snap_to_grid,
+    unique_cells,
+    valid_coordinate_mask,
+)
+
+
+def make_locations() -> pd.DataFrame:
+    return pd.DataFrame({
+        "UID": [1, 2, 3, 4, 5, 6],
+        "Lat": [41.60, 41.62, 40.00, 0.0, np.nan, 95.0],
+        "Long_": [-93.60, -93.59, -83.00, 0.0, -80.0, 10.0],
+    })
+
+
+def test_invalid_coordinates_are_masked():
+    df = make_locations()
+    assert valid_coordinate_mask(df["Lat"], df["Long_"]).tolist() == [True, True, True, False, False, False]
+
+
+def test_snap_to_grid_picks_the_nearest_point():
+    cell_id, cell_lat, cell_lon = snap_to_grid(np.array([41.60, -89.9, 10.0]), np.array([-93.60, 179.9, -180.0]))
+
+    assert cell_lat.tolist() == [41.5, -90.0, 10.0]
+    # 179.9 rounds onto the antimeridian, which wraps to -180
+    assert cell_lon.tolist() == [-93.5, -180.0, -180.0]
+    assert len(set(cell_id.tolist())) == 3
+    assert cell_id.tolist() == snap_to_grid(cell_lat, cell_lon)[0].tolist()
+
+
+def test_nearby_locations_share_a_cell():
+    df_cell_index = build_cell_index(make_locations())
+
+    assert df_cell_index["UID"].tolist() == [1, 2, 3]
+    assert df_cell_index["cell_id"].iloc[0] == df_cell_index["cell_id"].iloc[1]
+    assert len(unique_cells(df_cell_index)) == 2
+
+
+def test_fan_out_matches_a_merge_on_the_cell():
+    df_cell_index = build_cell_index(make_locations())
+    cells = unique_cells(df_cell_index)["cell_id"].to_numpy()
+    dates = pd.date_range("2020-03-01", periods=4, freq="D")
+    # weather rows in no particular order
+    df_cells = pd.DataFrame({
+        "cell_id": np.repeat(cells, len(dates)),
+        "date": np.tile(dates, len(cells)),
+        "temperature_2m_mean": np.arange(len(cells) * len(dates), dtype="float32"),
+    }).sample(frac=1.0, random_state=0)
+    # a location whose cell has no weather gets no rows
+    df_cell_index = pd.concat(
+        [df_cell_index, pd.DataFrame({"UID": [7], "cell_id": [999], "latitude": [0.0], "longitude": [0.0]})],
+        ignore_index=True,
+    )
+
+    df_out = fan_out_to_locations(df_cells, df_cell_index)
+
+    expected = df_cell_index[["UID", "cell_id"]].merge(df_cells, on="cell_id")
+    key_cols: list = ["UID", "date"]
+    assert_frame_equal(
+        df_out.sort_values(key_cols).reset_index(drop=True),
+        expected.sort_values(key_cols).reset_index(drop=True),
+    )
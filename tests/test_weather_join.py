@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_array_equal
+
+from mage_gcp_covid.utils.weather_join import join_weather
+
+
+VARIABLES: list = ["temperature_2m_mean", "precipitation_sum"]
+
+
+def make_frames(seed: int = 0) -> tuple:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2020-03-01", periods=20, freq="D")
+
+    # uid 5 has no cell (invalid coordinates)
+    df_cell_index = pd.DataFrame({"uid": np.arange(5), "cell_id": [10, 10, 11, 12, 13]})
+    df_covid = pd.DataFrame({
+        "uid": np.repeat(np.arange(6), len(dates)),
+        "date": np.tile(dates, 6),
+    })
+
+    # weather with gaps, so tolerance and lags have something to bridge
+    df_weather = pd.DataFrame({
+        "cell_id": np.repeat([10, 11, 12, 13], len(dates)),
+        "date": np.tile(dates, 4),
+    })
+    df_weather = df_weather[rng.random(len(df_weather)) > 0.3].reset_index(drop=True)
+    for variable in VARIABLES:
+        df_weather[variable] = rng.normal(10.0, 5.0, len(df_weather)).astype("float32")
+
+    return df_covid, df_weather, df_cell_index
+
+
+def reference_join(df_covid, df_weather, df_cell_index, lag: int, tolerance_days: int) -> pd.DataFrame:
+    # merge_asof on the cell, looking back up to `tolerance_days` from (date - lag)
+    df_left = df_covid.merge(df_cell_index, on="uid", how="left")
+    df_left["date_lag"] = df_left["date"] - pd.Timedelta(days=lag)
+    df_left["row"] = np.arange(len(df_left))
+    df_left = df_left.dropna(subset=["cell_id"]).astype({"cell_id": "int64"})
+
+    df_joined = pd.merge_asof(
+        df_left.sort_values("date_lag"),
+        df_weather.rename(columns={"date": "date_lag"}).sort_values("date_lag"),
+        on="date_lag",
+        by="cell_id",
+        tolerance=pd.Timedelta(days=tolerance_days),
+        direction="backward",
+    )
+    return df_joined.set_index("row").reindex(np.arange(len(df_covid)))
+
+
+@pytest.mark.parametrize("tolerance_days", [0, 2])
+def test_join_weather_matches_merge_asof(tolerance_days):
+    df_covid, df_weather, df_cell_index = make_frames()
+
+    df_out = join_weather(df_covid, df_weather, VARIABLES, df_cell_index, lags=[1, 7], tolerance_days=tolerance_days)
+
+    for lag in [0, 1, 7]:
+        expected = reference_join(df_covid, df_weather, df_cell_index, lag, tolerance_days)
+        suffix: str = f"_lag{lag}" if lag else ""
+        for variable in VARIABLES:
+            assert_array_equal(df_out[variable + suffix].to_numpy(), expected[variable].to_numpy(dtype="float32"))
+
+    assert df_out["cell_id"].isna().sum() == 20
+
+
+def test_rows_without_a_uid_stay_unmatched():
+    df_covid, df_weather, df_cell_index = make_frames()
+    df_covid["uid"] = df_covid["uid"].astype("Int64").mask(df_covid["uid"] == 0)
+    # a null key in the index matches nothing either
+    df_cell_index = pd.concat([df_cell_index, pd.DataFrame({"uid": [None], "cell_id": [11]})], ignore_index=True)
+
+    df_out = join_weather(df_covid, df_weather, VARIABLES, df_cell_index)
+
+    no_uid = df_covid["uid"].isna().to_numpy()
+    assert df_out.loc[no_uid, "cell_id"].isna().all()
+    assert df_out.loc[no_uid, VARIABLES].isna().all().all()
+    assert df_out.loc[~no_uid, "cell_id"].notna().sum() == 80